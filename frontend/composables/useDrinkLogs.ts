@@ -35,6 +35,8 @@ export interface DrinkLog {
   user_id: string
   status: 'pending' | 'complete' | 'deleting'
   image_url?: string
+  display_url?: string
+  thumbnail_url?: string
   brand_text: string
   brand_source: 'ai' | 'manual' | 'matched'
   serving_style?: string
@@ -20,7 +20,7 @@ export const useSuggestWhiskeys = () => {
     loading.value = true
     error.value = null
     try {
-      const data = await api.request<SuggestResponse>('/api/whiskeys/search', {
+      const data = await api.request<SuggestResponse>('/api/whiskeys/suggest', {
         auth: 'none',
         query: { q: query.trim(), limit: 10 },
       })
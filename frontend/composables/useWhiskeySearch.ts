@@ -56,7 +56,7 @@ export const useWhiskeySearch = () => {
     isSearching.value = true
     searchError.value = ''
     try {
-      const data = await api.request<SearchApiResponse>('/api/whiskeys/search', {
+      const data = await api.request<SearchApiResponse>('/api/whiskeys/suggest', {
         auth: 'none',
         query: { q: query.trim(), limit },
       })
@@ -7,17 +7,16 @@ vi.mock('~/composables/useApi', () => ({ useApi: () => ({ request }) }))
 describe('useWhiskeySearch', () => {
   beforeEach(() => request.mockReset())
 
-  it('searches the public name endpoint without a trailing slash', async () => {
+  it('asks the typeahead suggest endpoint without a trailing slash', async () => {
     request.mockResolvedValue({
       whiskeys: [{ id: 'w1', name: '山崎', distillery: '山崎蒸溜所' }],
       count: 1,
-      next_token: 'next',
     })
     const search = useWhiskeySearch()
 
     await search.performIncrementalSearch(' 山崎 ', 10)
 
-    expect(request).toHaveBeenCalledWith('/api/whiskeys/search', {
+    expect(request).toHaveBeenCalledWith('/api/whiskeys/suggest', {
       auth: 'none',
       query: { q: '山崎', limit: 10 },
     })
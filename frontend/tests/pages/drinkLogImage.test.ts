@@ -44,4 +44,18 @@ describe('DrinkLogImage', () => {
     expect(getLog).toHaveBeenCalledTimes(1)
     expect(wrapper.text()).toContain('画像を表示できません')
   })
+
+  it('uses the requested rendition and falls back to the full image', () => {
+    const withRenditions = { ...original, thumbnail_url: 'https://signed.test/thumb' }
+
+    const thumbnail = mount(DrinkLogImage, {
+      props: { log: withRenditions, alt: '記録写真', variant: 'thumbnail' },
+    })
+    const display = mount(DrinkLogImage, {
+      props: { log: withRenditions, alt: '記録写真', variant: 'display' },
+    })
+
+    expect(thumbnail.get('img').attributes('src')).toBe('https://signed.test/thumb')
+    expect(display.get('img').attributes('src')).toBe(original.image_url)
+  })
 })
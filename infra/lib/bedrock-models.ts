@@ -13,6 +13,9 @@ export type DirectBedrockModel = {
 
 export type BedrockModel = ProfileBedrockModel | DirectBedrockModel;
 
+// converse_stream (BEDROCK_STREAMING) is authorized by InvokeModelWithResponseStream.
+const INVOKE_ACTIONS = ['bedrock:InvokeModel', 'bedrock:InvokeModelWithResponseStream'];
+
 export function bedrockModelAllowlist(models: readonly BedrockModel[]): string[] {
   return models.map((model) => model.type === 'profile'
     ? model.profileArn.split('/').at(-1)!
@@ -20,7 +23,7 @@ export function bedrockModelAllowlist(models: readonly BedrockModel[]): string[]
 }
 
 /**
- * Build exact InvokeModel permissions for inference profiles and direct models.
+ * Build exact InvokeModel (and streaming) permissions for inference profiles and direct models.
  * Profile destinations are usable only when Bedrock reports an approved profile ARN.
  */
 export function bedrockInvokeStatements(models: readonly BedrockModel[]): iam.PolicyStatement[] {
@@ -30,11 +33,11 @@ export function bedrockInvokeStatements(models: readonly BedrockModel[]): iam.Po
 
   if (profiles.length > 0) {
     statements.push(new iam.PolicyStatement({
-      actions: ['bedrock:InvokeModel'],
+      actions: INVOKE_ACTIONS,
       resources: profiles.map((model) => model.profileArn),
     }));
     statements.push(new iam.PolicyStatement({
-      actions: ['bedrock:InvokeModel'],
+      actions: INVOKE_ACTIONS,
       resources: profiles.flatMap((model) => model.destinationArns),
       conditions: {
         StringEquals: {
@@ -46,7 +49,7 @@ export function bedrockInvokeStatements(models: readonly BedrockModel[]): iam.Po
 
   if (directModels.length > 0) {
     statements.push(new iam.PolicyStatement({
-      actions: ['bedrock:InvokeModel'],
+      actions: INVOKE_ACTIONS,
       resources: directModels.map((model) => model.modelArn),
     }));
   }
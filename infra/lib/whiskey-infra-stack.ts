@@ -33,7 +33,10 @@ const API_TIMEOUT = cdk.Duration.seconds(29);
 const SCAN_COUNTER_PREFIX = 'scan-counter/*';
 const DRINKLOG_COUNTER_PREFIX = 'drinklog-counter#*';
 const DRINKLOG_QUOTA_PREFIX = 'drinklog-quota#*';
+const DRINKLOG_STATS_PREFIX = 'drinklog-stats#*';
 const AI_RESULT_PREFIX = 'ai-result:*';
+const CATALOG_VERSION_PREFIX = 'catalog-version#*';
+const ANALYSIS_CACHE_PREFIX = 'analysis-cache#*';
 const BUNDLING_COMMAND = "if [ -f requirements.txt ]; then pip install -r requirements.txt -t /asset-output; fi && cp -au . /asset-output && find /asset-output -name __pycache__ -type d -exec rm -rf {} +";
 
 function parseExtraOrigins(value: unknown): string[] {
@@ -105,7 +108,16 @@ export class WhiskeyInfraStack extends cdk.Stack {
     const imagesBucket = new s3.Bucket(this, 'WhiskeyImagesBucket', {
       ...bucketDefaults,
       bucketName: `whiskey-images-${environment}-${this.account}`,
-      lifecycleRules: [{ prefix: 'tmp/', expiration: cdk.Duration.days(2) }],
+      lifecycleRules: [
+        { prefix: 'tmp/', expiration: cdk.Duration.days(2) },
+        // エクスポートはダウンロード URL (15 分) の間だけ使う一時ファイル。中断した
+        // マルチパートアップロードもここで片付ける。
+        {
+          prefix: 'exports/',
+          expiration: cdk.Duration.days(1),
+          abortIncompleteMultipartUploadAfter: cdk.Duration.days(1),
+        },
+      ],
       // Paid, best-effort request metrics expose PostRequests/BytesUploaded for tmp and
       // GetRequests/BytesDownloaded for logs; AppState counters enforce the cost ceilings.
       metrics: [
@@ -187,6 +199,19 @@ export class WhiskeyInfraStack extends cdk.Stack {
       billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
       removalPolicy,
     });
+    // 集計カウンタ (drinklog-stats#user#{id}#{counter}) は 1 カウンタ 1 アイテムに分け、
+    // 1 アイテムの 400KB 上限で作成・編集・削除のトランザクションが止まらないようにする。
+    // stats_owner はカウンタ項目にのみ書かれるスパース GSI で、利用者ごとに Query で列挙する。
+    // 既存環境では、この GSI と集計を書く drink-logs をデプロイした後に
+    // scripts/backfill_timeline_filter_keys.py → scripts/backfill_drink_log_stats.py の順で実行し、
+    // 既存レコードを数える (旧形式の brand#<正規化した brand_text> も付け替わる)。
+    appStateTable.addGlobalSecondaryIndex({
+      indexName: 'StatsOwnerIndex',
+      partitionKey: { name: 'stats_owner', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'pk', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.INCLUDE,
+      nonKeyAttributes: ['count'],
+    });
     const drinkLogsTable = new dynamodb.Table(this, 'DrinkLogsTable', {
       tableName: tableNames.drinkLogs,
       partitionKey: { name: 'id', type: dynamodb.AttributeType.STRING },
@@ -198,6 +223,30 @@ export class WhiskeyInfraStack extends cdk.Stack {
       partitionKey: { name: 'user_id', type: dynamodb.AttributeType.STRING },
       sortKey: { name: 'datetime', type: dynamodb.AttributeType.STRING },
     });
+    // 店舗 (place_id) / 銘柄 (brand_key) の完全一致フィルタ用スパース GSI。
+    // キーは "<user_id>#<値>" で、完了済みレコードにのみ書かれる。
+    // DynamoDB は 1 回のテーブル更新で GSI を 1 つしか作成できないため、既存環境では
+    // 1 つずつデプロイし、その後 scripts/backfill_timeline_filter_keys.py で既存レコードを埋める。
+    drinkLogsTable.addGlobalSecondaryIndex({
+      indexName: 'UserPlaceDatetimeIndex',
+      partitionKey: { name: 'user_place_key', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'datetime', type: dynamodb.AttributeType.STRING },
+    });
+    drinkLogsTable.addGlobalSecondaryIndex({
+      indexName: 'UserBrandDatetimeIndex',
+      partitionKey: { name: 'user_brand_key', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'datetime', type: dynamodb.AttributeType.STRING },
+    });
+    // リコンサイラ用スパース GSI。reconcile_state (pending / deleting / tmp) は処理対象に
+    // なり得る間だけ書かれるため、日次処理のコストは総件数ではなく滞留件数に比例する。
+    // 候補は強い整合性の読み取りで再確認するので、射影はキーのみ。
+    // 既存環境ではデプロイ後に scripts/backfill_reconcile_state.py で既存レコードを埋める。
+    drinkLogsTable.addGlobalSecondaryIndex({
+      indexName: 'ReconcileStateIndex',
+      partitionKey: { name: 'reconcile_state', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'updated_at', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.KEYS_ONLY,
+    });
 
     const placesSecret = secretsmanager.Secret.fromSecretNameV2(
       this,
@@ -352,9 +401,10 @@ export class WhiskeyInfraStack extends cdk.Stack {
     const appStatePrefixStatement = (
       actions: string[],
       prefixes: string | string[],
+      resources: string[] = [appStateTable.tableArn],
     ): iam.PolicyStatement => new iam.PolicyStatement({
       actions,
-      resources: [appStateTable.tableArn],
+      resources,
       conditions: {
         'ForAllValues:StringLike': {
           'dynamodb:LeadingKeys': Array.isArray(prefixes) ? prefixes : [prefixes],
@@ -365,6 +415,8 @@ export class WhiskeyInfraStack extends cdk.Stack {
 
     listRole.addToPolicy(appStatePrefixStatement(['dynamodb:UpdateItem'], SCAN_COUNTER_PREFIX));
     searchRole.addToPolicy(appStatePrefixStatement(['dynamodb:UpdateItem'], SCAN_COUNTER_PREFIX));
+    // 検索インデックス (同梱成果物を含む) の鮮度はカタログバージョン行の GetItem 1 回で確認する。
+    searchRole.addToPolicy(appStatePrefixStatement(['dynamodb:GetItem'], CATALOG_VERSION_PREFIX));
 
     drinkLogsTable.grantReadWriteData(drinkLogsRole);
     whiskeySearchTable.grantReadData(drinkLogsRole);
@@ -372,6 +424,11 @@ export class WhiskeyInfraStack extends cdk.Stack {
       actions: ['s3:GetObject', 's3:PutObject', 's3:DeleteObject'],
       resources: [imagesBucket.arnForObjects('tmp/*'), imagesBucket.arnForObjects('logs/*')],
     }));
+    // NDJSON エクスポートを exports/{user}/ にマルチパートで書き、署名付き GET で渡す。
+    drinkLogsRole.addToPolicy(new iam.PolicyStatement({
+      actions: ['s3:GetObject', 's3:PutObject', 's3:AbortMultipartUpload'],
+      resources: [imagesBucket.arnForObjects('exports/*')],
+    }));
     // create の削除確認（_object_absent）が head_object で 404 を得るには ListBucket が
     // 必要。無いと存在しないオブジェクトへの HeadObject が 403（存在秘匿）になり、
     // 404 前提の不在判定が誤って例外→500 になる。プレフィックスで tmp/logs に限定。
@@ -388,12 +445,32 @@ export class WhiskeyInfraStack extends cdk.Stack {
       ['dynamodb:GetItem', 'dynamodb:UpdateItem', 'dynamodb:DeleteItem'],
       AI_RESULT_PREFIX,
     ));
+    // 利用者ごとの集計カウンタは作成・編集・削除のトランザクションで更新し、
+    // GET /drink-logs/stats が StatsOwnerIndex の Query で読む (GSI のパーティションキーも
+    // drinklog-stats#user#{id} なので同じ LeadingKeys 条件で絞れる)。
+    drinkLogsRole.addToPolicy(appStatePrefixStatement(['dynamodb:UpdateItem'], DRINKLOG_STATS_PREFIX));
+    drinkLogsRole.addToPolicy(appStatePrefixStatement(
+      ['dynamodb:Query'],
+      DRINKLOG_STATS_PREFIX,
+      [`${appStateTable.tableArn}/index/StatsOwnerIndex`],
+    ));
 
     whiskeySearchTable.grantReadData(drinkLogAnalyzeRole);
     drinkLogAnalyzeRole.addToPolicy(new iam.PolicyStatement({
       actions: ['s3:GetObject'],
       resources: [imagesBucket.arnForObjects('tmp/*')],
     }));
+    // 正規化済み JPEG を tmp/{user}/{uuid}.analyzed.jpg に、縮小版を .analyzed.{display,thumbnail}.jpg
+    // に保存し、create がサーバー側コピーで logs/ へ昇格する。アップロード本体は上書きできない
+    // ようサフィックスで限定する。
+    drinkLogAnalyzeRole.addToPolicy(new iam.PolicyStatement({
+      actions: ['s3:PutObject'],
+      resources: [
+        imagesBucket.arnForObjects('tmp/*.analyzed.jpg'),
+        imagesBucket.arnForObjects('tmp/*.analyzed.display.jpg'),
+        imagesBucket.arnForObjects('tmp/*.analyzed.thumbnail.jpg'),
+      ],
+    }));
     drinkLogAnalyzeRole.addToPolicy(appStatePrefixStatement(
       ['dynamodb:GetItem', 'dynamodb:UpdateItem'],
       DRINKLOG_COUNTER_PREFIX,
@@ -405,6 +482,16 @@ export class WhiskeyInfraStack extends cdk.Stack {
       ['dynamodb:PutItem'],
       AI_RESULT_PREFIX,
     ));
+    // マスタースナップショットの再検証はカタログバージョン行の GetItem 1回で済ませる。
+    drinkLogAnalyzeRole.addToPolicy(appStatePrefixStatement(
+      ['dynamodb:GetItem'],
+      CATALOG_VERSION_PREFIX,
+    ));
+    // 同一画像（正規化後 JPEG のハッシュ）の解析結果キャッシュ。ヒット時は Bedrock を呼ばない。
+    drinkLogAnalyzeRole.addToPolicy(appStatePrefixStatement(
+      ['dynamodb:GetItem', 'dynamodb:PutItem'],
+      ANALYSIS_CACHE_PREFIX,
+    ));
 
     drinkLogPlacesRole.addToPolicy(new iam.PolicyStatement({
       actions: ['dynamodb:BatchGetItem'],
@@ -428,7 +515,7 @@ export class WhiskeyInfraStack extends cdk.Stack {
     }));
     drinkLogReconcilerRole.addToPolicy(appStatePrefixStatement(
       ['dynamodb:UpdateItem'],
-      DRINKLOG_QUOTA_PREFIX,
+      [DRINKLOG_QUOTA_PREFIX, DRINKLOG_STATS_PREFIX],
     ));
 
     const bedrockModels: readonly BedrockModel[] = [
@@ -547,6 +634,7 @@ export class WhiskeyInfraStack extends cdk.Stack {
         PUBLIC_SCAN_MAX_PAGES: '5',
         PUBLIC_SCAN_PAGE_SIZE: '250',
         PUBLIC_SCAN_DAILY_LIMIT: '10000',
+        SEARCH_INDEX_TTL_SECONDS: '900',
         ALLOWED_ORIGINS: allowedOrigins.join(','),
         ENVIRONMENT: environment,
       },
@@ -571,6 +659,7 @@ export class WhiskeyInfraStack extends cdk.Stack {
         UPLOAD_GLOBAL_DAILY_LIMIT: '100',
         CREATE_USER_DAILY_LIMIT: '30',
         CREATE_GLOBAL_DAILY_LIMIT: '100',
+        EXPORT_USER_DAILY_LIMIT: '5',
         STORAGE_USER_LIMIT: '2000',
         STORAGE_GLOBAL_LIMIT: '20000',
         IMAGE_MAX_BYTES: '1572864',
@@ -595,6 +684,10 @@ export class WhiskeyInfraStack extends cdk.Stack {
         WHISKEY_SEARCH_TABLE: whiskeySearchTable.tableName,
         BEDROCK_MODEL_ID: 'jp.amazon.nova-2-lite-v1:0',
         BEDROCK_MODEL_ALLOWLIST: bedrockModelAllowlist(bedrockModels).join(','),
+        // Nova の回答が空・不正・最上位 confidence 0.6 未満のときだけ Haiku に再判定させる。
+        // 再判定も 1 回分として全体カウンタを消費するため、月次上限はそのまま効く。
+        BEDROCK_ESCALATION_MODEL_ID: 'jp.anthropic.claude-haiku-4-5-20251001-v1:0',
+        BEDROCK_ESCALATION_CONFIDENCE: '0.6',
         ANALYZE_USER_DAILY_LIMIT: '20',
         ANALYZE_GLOBAL_DAILY_LIMIT: '50',
         // Sonnet 4.6 の東京単価は Pricing API 未掲載のため確定できない。
@@ -726,6 +819,7 @@ export class WhiskeyInfraStack extends cdk.Stack {
           '/api/drink-logs/places/resolve/POST': { throttlingRateLimit: 2, throttlingBurstLimit: 5 },
           '/api/drink-logs/POST': { throttlingRateLimit: 2, throttlingBurstLimit: 5 },
           '/api/drink-logs/GET': { throttlingRateLimit: 5, throttlingBurstLimit: 10 },
+          '/api/drink-logs/export/POST': { throttlingRateLimit: 1, throttlingBurstLimit: 2 },
           '/api/drink-logs/{id}/GET': { throttlingRateLimit: 5, throttlingBurstLimit: 10 },
           '/api/drink-logs/{id}/PUT': { throttlingRateLimit: 2, throttlingBurstLimit: 5 },
           '/api/drink-logs/{id}/DELETE': { throttlingRateLimit: 2, throttlingBurstLimit: 5 },
@@ -797,6 +891,8 @@ export class WhiskeyInfraStack extends cdk.Stack {
     const drinkLogsResource = apiResource.addResource('drink-logs');
     drinkLogsResource.addMethod('POST', integration(drinkLogsLambda), authenticated);
     drinkLogsResource.addMethod('GET', integration(drinkLogsLambda), authenticated);
+    drinkLogsResource.addResource('stats').addMethod('GET', integration(drinkLogsLambda), authenticated);
+    drinkLogsResource.addResource('export').addMethod('POST', integration(drinkLogsLambda), authenticated);
     drinkLogsResource.addResource('upload-url').addMethod(
       'POST',
       integration(drinkLogsLambda),
@@ -163,13 +163,19 @@ describe('stateful resource lifecycle and storage security', () => {
     }
   });
 
-  test('images bucket expires only tmp objects and enables the two filtered request metrics', () => {
+  test('images bucket expires only tmp and export objects and enables the two filtered request metrics', () => {
     const { json } = createAppStack('dev');
     const images = resourcesOf(json, 'AWS::S3::Bucket')
       .find(([, bucket]) => bucket.Properties?.BucketName === `whiskey-images-dev-${DEV_ACCOUNT}`)![1];
     expect(images.Properties?.VersioningConfiguration).toBeUndefined();
     expect(images.Properties?.LifecycleConfiguration.Rules).toEqual([
       expect.objectContaining({ Prefix: 'tmp/', ExpirationInDays: 2, Status: 'Enabled' }),
+      expect.objectContaining({
+        Prefix: 'exports/',
+        ExpirationInDays: 1,
+        AbortIncompleteMultipartUpload: { DaysAfterInitiation: 1 },
+        Status: 'Enabled',
+      }),
     ]);
     expect(images.Properties?.MetricsConfigurations).toEqual([
       { Id: 'tmp', Prefix: 'tmp/' },
@@ -198,6 +204,8 @@ describe('API Gateway authentication, CORS, and defenses', () => {
     'POST /api/drink-logs/places/resolve',
     'POST /api/drink-logs',
     'GET /api/drink-logs',
+    'GET /api/drink-logs/stats',
+    'POST /api/drink-logs/export',
     'GET /api/drink-logs/{id}',
     'PUT /api/drink-logs/{id}',
     'DELETE /api/drink-logs/{id}',
@@ -233,6 +241,8 @@ describe('API Gateway authentication, CORS, and defenses', () => {
       'POST /api/drink-logs/places/resolve': 'drink-log-places-dev',
       'POST /api/drink-logs': 'drink-logs-dev',
       'GET /api/drink-logs': 'drink-logs-dev',
+      'GET /api/drink-logs/stats': 'drink-logs-dev',
+      'POST /api/drink-logs/export': 'drink-logs-dev',
       'GET /api/drink-logs/{id}': 'drink-logs-dev',
       'PUT /api/drink-logs/{id}': 'drink-logs-dev',
       'DELETE /api/drink-logs/{id}': 'drink-logs-dev',
@@ -374,10 +384,15 @@ describe('least-privilege Lambda roles', () => {
       'ForAllValues:StringLike': { 'dynamodb:LeadingKeys': ['scan-counter/*'] },
       Null: { 'dynamodb:LeadingKeys': 'false' },
     });
+    const searchCatalog = search.find((statement) => actions(statement).includes('dynamodb:GetItem')
+      && statement.Condition?.['ForAllValues:StringLike']?.['dynamodb:LeadingKeys']);
+    expect(actions(searchCatalog!)).toEqual(['dynamodb:GetItem']);
+    expect(searchCatalog!.Condition['ForAllValues:StringLike']['dynamodb:LeadingKeys'])
+      .toEqual(['catalog-version#*']);
     expect(search.some((statement) =>
       actions(statement).some((action) => ['dynamodb:PutItem', 'dynamodb:DeleteItem'].includes(action))
       || (statement.Condition?.['ForAllValues:StringLike']?.['dynamodb:LeadingKeys'] || [])
-        .some((key: string) => !key.startsWith('scan-counter/'))))
+        .some((key: string) => !key.startsWith('scan-counter/') && key !== 'catalog-version#*')))
       .toBe(false);
 
     expect(JSON.stringify(resourcesOf(json, 'AWS::IAM::Policy'))).not.toContain('TransactWriteItems');
@@ -400,16 +415,29 @@ describe('least-privilege Lambda roles', () => {
         .flatMap((statement) => statement.Condition['ForAllValues:StringLike']['dynamodb:LeadingKeys']);
 
     expect(appStatePatterns(policies.logs, 'dynamodb:UpdateItem')).toEqual(expect.arrayContaining([
-      'drinklog-counter#*', 'drinklog-quota#*', 'ai-result:*',
+      'drinklog-counter#*', 'drinklog-quota#*', 'ai-result:*', 'drinklog-stats#*',
     ]));
     expect(appStatePatterns(policies.logs, 'dynamodb:GetItem')).toEqual(['ai-result:*']);
+    const statsQuery = policies.logs.filter((statement) => actions(statement).includes('dynamodb:Query')
+      && statement.Condition?.['ForAllValues:StringLike']);
+    expect(statsQuery).toHaveLength(1);
+    expect(actions(statsQuery[0])).toEqual(['dynamodb:Query']);
+    expect(statsQuery[0].Condition['ForAllValues:StringLike']['dynamodb:LeadingKeys'])
+      .toEqual(['drinklog-stats#*']);
+    expect(JSON.stringify(statsQuery[0].Resource)).toContain('/index/StatsOwnerIndex');
     expect(appStatePatterns(policies.logs, 'dynamodb:DeleteItem')).toEqual(['ai-result:*']);
     expect(appStatePatterns(policies.analyze, 'dynamodb:UpdateItem')).toEqual(['drinklog-counter#*']);
     // analyze は解析結果キャッシュを put_item で保存するため ai-result:* は PutItem。
-    expect(appStatePatterns(policies.analyze, 'dynamodb:PutItem')).toEqual(['ai-result:*']);
-    expect(appStatePatterns(policies.analyze, 'dynamodb:GetItem')).toEqual(['drinklog-counter#*']);
+    expect(appStatePatterns(policies.analyze, 'dynamodb:PutItem')).toEqual([
+      'ai-result:*', 'analysis-cache#*',
+    ]);
+    expect(appStatePatterns(policies.analyze, 'dynamodb:GetItem')).toEqual([
+      'drinklog-counter#*', 'catalog-version#*', 'analysis-cache#*',
+    ]);
     expect(appStatePatterns(policies.places, 'dynamodb:UpdateItem')).toEqual(['drinklog-counter#*']);
-    expect(appStatePatterns(policies.reconciler, 'dynamodb:UpdateItem')).toEqual(['drinklog-quota#*']);
+    expect(appStatePatterns(policies.reconciler, 'dynamodb:UpdateItem')).toEqual([
+      'drinklog-quota#*', 'drinklog-stats#*',
+    ]);
 
     for (const policy of Object.values(policies)) {
       for (const statement of policy.filter((candidate) => candidate.Condition?.['ForAllValues:StringLike'])) {
@@ -435,6 +463,31 @@ describe('least-privilege Lambda roles', () => {
     expect(reconciler.some((statement) => actions(statement).includes('s3:PutObject'))).toBe(false);
   });
 
+  test('only drink-logs can write exports', () => {
+    const json = createAppStack('dev').json;
+    const exportStatements = (role: string) => rolePolicy(json, role)
+      .filter((statement) => JSON.stringify(statement.Resource).includes('/exports/*'));
+    expect(exportStatements('drink-logs-role-dev')).toHaveLength(1);
+    expect(actions(exportStatements('drink-logs-role-dev')[0])).toEqual([
+      's3:GetObject', 's3:PutObject', 's3:AbortMultipartUpload',
+    ]);
+    for (const role of ['drink-log-analyze-role-dev', 'drink-log-reconciler-role-dev']) {
+      expect(exportStatements(role)).toHaveLength(0);
+    }
+  });
+
+  test('analyze can store only its normalized image and renditions beside the upload', () => {
+    const json = createAppStack('dev').json;
+    const analyze = rolePolicy(json, 'drink-log-analyze-role-dev');
+    const analyzePut = analyze.filter((statement) => actions(statement).includes('s3:PutObject'));
+    expect(analyzePut).toHaveLength(1);
+    const resources = JSON.stringify(analyzePut[0].Resource);
+    for (const suffix of ['analyzed.jpg', 'analyzed.display.jpg', 'analyzed.thumbnail.jpg']) {
+      expect(resources).toContain(`/tmp/*.${suffix}`);
+    }
+    expect(resources).not.toContain('/tmp/*"');
+  });
+
   test('Bedrock permissions match all three approved profiles and destinations without discovery access', () => {
     const json = createAppStack('dev').json;
     const analyze = rolePolicy(json, 'drink-log-analyze-role-dev');
@@ -453,6 +506,9 @@ describe('least-privilege Lambda roles', () => {
       'arn:aws:bedrock:ap-northeast-3::foundation-model/anthropic.claude-sonnet-4-6',
     ];
     expect(bedrock).toHaveLength(2);
+    for (const statement of bedrock) {
+      expect(actions(statement)).toEqual(['bedrock:InvokeModel', 'bedrock:InvokeModelWithResponseStream']);
+    }
     expect(bedrock[0].Resource).toEqual(profileArns);
     expect(bedrock[1].Resource).toEqual(destinationArns);
     expect(bedrock[1].Condition).toEqual({
@@ -469,7 +525,7 @@ describe('least-privilege Lambda roles', () => {
       .map((statement) => statement.toStatementJson());
     expect(statements).toEqual([{
       Effect: 'Allow',
-      Action: 'bedrock:InvokeModel',
+      Action: ['bedrock:InvokeModel', 'bedrock:InvokeModelWithResponseStream'],
       Resource: directArn,
     }]);
     expect(JSON.stringify(statements)).not.toContain('inference-profile');
@@ -504,7 +560,7 @@ describe('tables, logs, and removed infrastructure', () => {
     template.resourceCountIs('AWS::Route53::HostedZone', 0);
   });
 
-  test('DrinkLogs uses the user datetime GSI and intentionally has no TTL', () => {
+  test('DrinkLogs uses the user datetime GSIs, the reconcile GSI, and intentionally has no TTL', () => {
     const { json } = createAppStack('dev');
     const table = resourcesOf(json, 'AWS::DynamoDB::Table')
       .find(([, resource]) => resource.Properties?.TableName === 'DrinkLogs-dev')![1];
@@ -517,11 +573,47 @@ describe('tables, logs, and removed infrastructure', () => {
           { AttributeName: 'user_id', KeyType: 'HASH' },
           { AttributeName: 'datetime', KeyType: 'RANGE' },
         ],
+      }), expect.objectContaining({
+        IndexName: 'UserPlaceDatetimeIndex',
+        KeySchema: [
+          { AttributeName: 'user_place_key', KeyType: 'HASH' },
+          { AttributeName: 'datetime', KeyType: 'RANGE' },
+        ],
+      }), expect.objectContaining({
+        IndexName: 'UserBrandDatetimeIndex',
+        KeySchema: [
+          { AttributeName: 'user_brand_key', KeyType: 'HASH' },
+          { AttributeName: 'datetime', KeyType: 'RANGE' },
+        ],
+      }), expect.objectContaining({
+        IndexName: 'ReconcileStateIndex',
+        KeySchema: [
+          { AttributeName: 'reconcile_state', KeyType: 'HASH' },
+          { AttributeName: 'updated_at', KeyType: 'RANGE' },
+        ],
+        Projection: { ProjectionType: 'KEYS_ONLY' },
       })],
     }));
     expect(table.Properties?.TimeToLiveSpecification).toBeUndefined();
   });
 
+  test('AppState lists each user\'s stats counter items through a sparse GSI', () => {
+    const { json } = createAppStack('dev');
+    const table = resourcesOf(json, 'AWS::DynamoDB::Table')
+      .find(([, resource]) => resource.Properties?.TableName === 'AppState-dev')![1];
+    expect(table.Properties).toEqual(expect.objectContaining({
+      KeySchema: [{ AttributeName: 'pk', KeyType: 'HASH' }],
+      GlobalSecondaryIndexes: [expect.objectContaining({
+        IndexName: 'StatsOwnerIndex',
+        KeySchema: [
+          { AttributeName: 'stats_owner', KeyType: 'HASH' },
+          { AttributeName: 'pk', KeyType: 'RANGE' },
+        ],
+        Projection: { ProjectionType: 'INCLUDE', NonKeyAttributes: ['count'] },
+      })],
+    }));
+  });
+
   test('every function uses its dedicated /whiskey/{env}/ log group', () => {
     const { template } = createAppStack('dev');
     for (const name of [
@@ -560,6 +652,7 @@ describe('Lambda bundling and shared layer', () => {
     expect(search.Properties?.Environment.Variables).toEqual(expect.objectContaining({
       PUBLIC_SCAN_MAX_PAGES: '5',
       PUBLIC_SCAN_PAGE_SIZE: '250',
+      SEARCH_INDEX_TTL_SECONDS: '900',
     }));
     expect(search.Properties?.Environment.Variables.REVIEWS_TABLE).toBeUndefined();
     expect(resourcesOf(json, 'AWS::Lambda::LayerVersion')).toHaveLength(1);
@@ -596,6 +689,7 @@ describe('Lambda bundling and shared layer', () => {
       UPLOAD_GLOBAL_DAILY_LIMIT: '100',
       CREATE_USER_DAILY_LIMIT: '30',
       CREATE_GLOBAL_DAILY_LIMIT: '100',
+      EXPORT_USER_DAILY_LIMIT: '5',
       STORAGE_USER_LIMIT: '2000',
       STORAGE_GLOBAL_LIMIT: '20000',
       IMAGE_MAX_BYTES: '1572864',
@@ -605,6 +699,8 @@ describe('Lambda bundling and shared layer', () => {
     expect(analyzeEnv).toEqual(expect.objectContaining({
       BEDROCK_MODEL_ID: 'jp.amazon.nova-2-lite-v1:0',
       BEDROCK_MODEL_ALLOWLIST: 'jp.amazon.nova-2-lite-v1:0,jp.anthropic.claude-haiku-4-5-20251001-v1:0,jp.anthropic.claude-sonnet-4-6',
+      BEDROCK_ESCALATION_MODEL_ID: 'jp.anthropic.claude-haiku-4-5-20251001-v1:0',
+      BEDROCK_ESCALATION_CONFIDENCE: '0.6',
       ANALYZE_USER_DAILY_LIMIT: '20',
       ANALYZE_GLOBAL_DAILY_LIMIT: '50',
       // Sonnet 4.6 の単価が確定するまでの暫定値。docs/COST_MATRIX.md 参照。
@@ -615,6 +711,9 @@ describe('Lambda bundling and shared layer', () => {
     // relationship, not just the values.
     expect(String(analyzeEnv?.BEDROCK_MODEL_ALLOWLIST).split(','))
       .toContain(analyzeEnv?.BEDROCK_MODEL_ID);
+    expect(String(analyzeEnv?.BEDROCK_MODEL_ALLOWLIST).split(','))
+      .toContain(analyzeEnv?.BEDROCK_ESCALATION_MODEL_ID);
+    expect(analyzeEnv?.BEDROCK_ESCALATION_MODEL_ID).not.toBe(analyzeEnv?.BEDROCK_MODEL_ID);
     const placesEnv = lambdaByName(json, 'drink-log-places-dev').Properties?.Environment.Variables;
     expect(placesEnv).toEqual(expect.objectContaining({
       PLACES_USER_DAILY_LIMIT: '30',
@@ -0,0 +1,42 @@
+"""Catalog version marker stored in AppState.
+
+The whiskey catalog only changes when an operator script writes to the
+WhiskeySearch table. Those scripts bump a per-table counter so Lambdas holding
+an in-memory copy of the catalog can revalidate it with one get_item instead
+of rescanning the table.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+CATALOG_VERSION_PREFIX = "catalog-version#"
+
+
+def catalog_version_key(table_name: str) -> str:
+    return f"{CATALOG_VERSION_PREFIX}{table_name}"
+
+
+def bump_catalog_version(app_state_table: Any, table_name: str, now: datetime | None = None) -> int:
+    """Atomically increment the marker for table_name and return the new version."""
+    updated_at = (now or datetime.now(timezone.utc)).isoformat().replace("+00:00", "Z")
+    response = app_state_table.update_item(
+        Key={"pk": catalog_version_key(table_name)},
+        UpdateExpression="ADD #version :one SET updated_at = :updated_at",
+        ExpressionAttributeNames={"#version": "version"},
+        ExpressionAttributeValues={":one": 1, ":updated_at": updated_at},
+        ReturnValues="UPDATED_NEW",
+    )
+    return int(response["Attributes"]["version"])
+
+
+def read_catalog_version(app_state_table: Any, table_name: str) -> int | None:
+    """Return the current marker, or None when no script has bumped it yet."""
+    response = app_state_table.get_item(
+        Key={"pk": catalog_version_key(table_name)},
+        ProjectionExpression="#version",
+        ExpressionAttributeNames={"#version": "version"},
+    )
+    version = (response.get("Item") or {}).get("version")
+    return int(version) if version is not None else None
@@ -1,6 +1,8 @@
 """Consistently configured boto3 client and resource factories."""
 
+import bisect
 import os
+import threading
 from typing import Any
 
 import boto3
@@ -12,6 +14,14 @@ BASE_CONFIG = Config(
     read_timeout=10,
     retries={"mode": "standard", "total_max_attempts": 2},
 )
+MAX_BEDROCK_READ_TIMEOUT_SECONDS = 60
+# Few, coarse buckets keep a container to a handful of clients and connection
+# pools. A timeout is rounded down, so a call never outlives its deadline but
+# may give up earlier than it had to.
+BEDROCK_READ_TIMEOUT_BUCKETS = (1, 2, 5, 10, 15, 30, MAX_BEDROCK_READ_TIMEOUT_SECONDS)
+
+_BEDROCK_CLIENTS: dict[int, Any] = {}
+_BEDROCK_CLIENTS_LOCK = threading.Lock()
 
 
 def _endpoint_url(service_name: str) -> str | None:
@@ -55,3 +65,33 @@ def get_dynamodb_resource():
 
 def get_s3_client():
     return get_boto3_client("s3")
+
+
+def bedrock_timeout_bucket(read_timeout: float) -> int:
+    """Round a read timeout down to the nearest bucket so callers share clients."""
+    index = bisect.bisect_right(BEDROCK_READ_TIMEOUT_BUCKETS, read_timeout)
+    return BEDROCK_READ_TIMEOUT_BUCKETS[max(0, index - 1)]
+
+
+def get_bedrock_runtime_client(read_timeout: float):
+    """Return a cached bedrock-runtime client that never waits longer than read_timeout.
+
+    Clients are kept per timeout bucket for the life of the container, so warm
+    invocations reuse the loaded service model and open connections. Retries
+    are disabled; callers decide whether to try again within their budget.
+    """
+    bucket = bedrock_timeout_bucket(read_timeout)
+    # The default boto3 session is not thread-safe, and batch analysis asks
+    # for clients from worker threads.
+    with _BEDROCK_CLIENTS_LOCK:
+        client = _BEDROCK_CLIENTS.get(bucket)
+        if client is None:
+            kwargs = _kwargs("bedrock-runtime")
+            kwargs["config"] = Config(
+                connect_timeout=min(2, bucket),
+                read_timeout=bucket,
+                retries={"mode": "standard", "total_max_attempts": 1},
+            )
+            client = boto3.client("bedrock-runtime", **kwargs)
+            _BEDROCK_CLIENTS[bucket] = client
+        return client
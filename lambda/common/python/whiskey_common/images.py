@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from io import BytesIO
 
 from PIL import Image, ImageOps, UnidentifiedImageError
@@ -11,7 +13,18 @@ MAX_IMAGE_PIXELS = 20_000_000
 MAX_IMAGE_SIDE = 8_000
 TARGET_LONG_SIDE = 1_600
 JPEG_QUALITIES = (90, 85, 80, 75, 70, 65, 60, 55, 50, 45, 40, 35)
+# Typical JPEG size at each JPEG_QUALITIES step relative to the first, measured
+# on phone photos. Only used to predict where the quality search starts.
+RELATIVE_JPEG_SIZES = (1.0, 0.8, 0.67, 0.58, 0.52, 0.46, 0.42, 0.38, 0.36, 0.33, 0.3, 0.28)
+# Upper estimate for an optimized top-quality photo. Uploads below it go straight
+# to a final encode, so the common case still costs a single encode.
+PREDICTED_BYTES_PER_PIXEL = 0.5
+# Typical final (optimized, progressive) size relative to a baseline encode.
+FINAL_SIZE_RATIO = 0.9
 MIN_LONG_SIDE = 64
+# Smaller renditions of the normalized image, largest first.
+IMAGE_RENDITIONS = {"display": 960, "thumbnail": 320}
+RENDITION_QUALITY = 80
 
 
 class ImageNormalizationError(ValueError):
@@ -30,6 +43,16 @@ class ImageEncodeError(ImageNormalizationError):
     """Raised when an image cannot be encoded within the byte budget."""
 
 
+@dataclass(frozen=True)
+class EncodedJpeg:
+    """A budget-fitting JPEG and the work spent finding it."""
+
+    data: bytes
+    quality: int
+    size: tuple[int, int]
+    encode_attempts: int
+
+
 def sniff_format(raw: bytes) -> str | None:
     """Return the supported format identified by magic bytes, if any."""
     if raw.startswith(b"\xff\xd8\xff"):
@@ -62,42 +85,162 @@ def _flatten_to_rgb(image: Image.Image) -> Image.Image:
     return image.copy()
 
 
-def _resize_long_side(image: Image.Image, long_side: int) -> Image.Image:
-    current = max(image.size)
-    if current <= long_side:
-        return image
-    scale = long_side / current
-    size = (
+def _scaled_size(image: Image.Image, long_side: int) -> tuple[int, int]:
+    scale = long_side / max(image.size)
+    return (
         max(1, round(image.width * scale)),
         max(1, round(image.height * scale)),
     )
-    resized = image.resize(size, Image.Resampling.LANCZOS)
+
+
+def _resize_long_side(image: Image.Image, long_side: int) -> Image.Image:
+    if max(image.size) <= long_side:
+        return image
+    resized = image.resize(_scaled_size(image, long_side), Image.Resampling.LANCZOS)
     image.close()
     return resized
 
 
-def _encode_jpeg(image: Image.Image, quality: int) -> bytes:
+def _encode_jpeg(image: Image.Image, quality: int, *, final: bool = True) -> bytes:
     output = BytesIO()
+    # Huffman optimization and progressive scans are the slow part of an
+    # encode, so search probes skip them.
+    options = {"optimize": True, "progressive": True} if final else {}
     try:
         # Deliberately omit exif and icc_profile. This strips GPS and all other
         # metadata instead of copying privacy-sensitive source fields.
-        image.save(
-            output,
-            format="JPEG",
-            quality=quality,
-            optimize=True,
-            progressive=True,
-        )
+        image.save(output, format="JPEG", quality=quality, **options)
     except (OSError, ValueError) as exc:
         raise ImageEncodeError("Unable to encode normalized JPEG") from exc
     return output.getvalue()
 
 
-def normalize_image(raw: bytes, *, max_bytes: int) -> bytes:
+def _predicted_quality_index(
+    top_size: float,
+    max_bytes: int,
+    lowest: int = 0,
+    highest: int = len(JPEG_QUALITIES),
+) -> int:
+    for index in range(lowest, highest):
+        if top_size * RELATIVE_JPEG_SIZES[index] <= max_bytes:
+            return index
+    return highest - 1
+
+
+def _search_quality(
+    image: Image.Image,
+    max_bytes: int,
+    top_size: float | None,
+    encode: Callable[..., bytes],
+) -> tuple[tuple[int, bytes] | None, float]:
+    """Return the best fitting (quality index, final JPEG) and the measured top size.
+
+    Without an estimate of the top-quality size, a baseline probe measures it.
+    The first final encode uses the quality predicted from that size. Remaining
+    steps are bisected with baseline probes scaled by the final/baseline size
+    ratio of the most recent final encode. Only final encodes are trusted to
+    fit, so the byte budget is never exceeded.
+    """
+    probes: dict[int, int] = {}
+    if top_size is None:
+        probes[0] = len(encode(image, 0, final=False))
+        top_size = probes[0] * FINAL_SIZE_RATIO
+    lowest, highest = 0, len(JPEG_QUALITIES)
+    start = _predicted_quality_index(top_size, max_bytes)
+    final = encode(image, start, final=True)
+    top_size = len(final) / RELATIVE_JPEG_SIZES[start]
+    best = None
+    if len(final) <= max_bytes:
+        best, highest = (start, final), start
+    else:
+        lowest = start + 1
+    if lowest >= highest:
+        return best, top_size
+
+    if start not in probes:
+        probes[start] = len(encode(image, start, final=False))
+    ratio = len(final) / probes[start]
+    while lowest < highest:
+        lower, upper = lowest, highest
+        index = _predicted_quality_index(top_size, max_bytes, lower, upper)
+        while lower < upper:
+            if index not in probes:
+                probes[index] = len(encode(image, index, final=False))
+            if probes[index] * ratio <= max_bytes:
+                upper = index
+            else:
+                lower = index + 1
+            index = (lower + upper) // 2
+        if lower == highest:
+            if best is not None:
+                return best, top_size
+            # Nothing is predicted to fit; confirm the lowest quality before
+            # giving up on this size.
+            lower = highest - 1
+        final = encode(image, lower, final=True)
+        ratio = len(final) / probes[lower]
+        if len(final) <= max_bytes:
+            best, highest = (lower, final), lower
+        else:
+            lowest = lower + 1
+    return best, top_size
+
+
+def encode_within_budget(image: Image.Image, *, max_bytes: int) -> EncodedJpeg:
+    """Encode an RGB image as the highest JPEG_QUALITIES step that fits max_bytes.
+
+    The starting quality is predicted from the pixel count and then from the
+    first encode size, and qualities are searched instead of swept. When even
+    the lowest quality does not fit, the image shrinks by 0.8 and the search
+    repeats. The caller keeps ownership of ``image``.
+    """
+    if max_bytes <= 0:
+        raise ImageEncodeError("Image byte budget must be positive")
+
+    attempts = 0
+
+    def encode(target: Image.Image, index: int, *, final: bool) -> bytes:
+        nonlocal attempts
+        attempts += 1
+        return _encode_jpeg(target, JPEG_QUALITIES[index], final=final)
+
+    current = image
+    top_size: float | None = current.width * current.height * PREDICTED_BYTES_PER_PIXEL
+    if top_size > max_bytes:
+        top_size = None
+    try:
+        while True:
+            found, top_size = _search_quality(current, max_bytes, top_size, encode)
+            if found is not None:
+                index, encoded = found
+                return EncodedJpeg(encoded, JPEG_QUALITIES[index], current.size, attempts)
+
+            current_long_side = max(current.size)
+            if current_long_side <= MIN_LONG_SIDE:
+                raise ImageEncodeError("Unable to encode image within byte budget")
+            next_long_side = max(MIN_LONG_SIDE, int(current_long_side * 0.8))
+            if next_long_side >= current_long_side:
+                raise ImageEncodeError("Unable to encode image within byte budget")
+            previous = current
+            current = previous.resize(
+                _scaled_size(previous, next_long_side), Image.Resampling.LANCZOS
+            )
+            # Size scales roughly with area, so the next round starts from the
+            # measured size instead of the pixel-count guess.
+            top_size *= (current.width * current.height) / (previous.width * previous.height)
+            if previous is not image:
+                previous.close()
+    finally:
+        if current is not image:
+            current.close()
+
+
+def normalize_image_with_stats(raw: bytes, *, max_bytes: int) -> EncodedJpeg:
     """Decode, orient, flatten, resize, and encode an image as metadata-free JPEG.
 
     Header dimensions are checked before ``load()`` so oversized compressed
-    images are rejected without expanding their pixel buffers.
+    images are rejected without expanding their pixel buffers. Large JPEGs are
+    decoded at a reduced DCT scale that still covers ``TARGET_LONG_SIDE``.
     """
     if not isinstance(raw, bytes) or not raw:
         raise ImageDecodeError("Image body is empty")
@@ -108,6 +251,10 @@ def normalize_image(raw: bytes, *, max_bytes: int) -> bytes:
         with Image.open(BytesIO(raw)) as source:
             width, height = source.size
             _check_dimensions(width, height)
+            if source.format == "JPEG" and max(width, height) > TARGET_LONG_SIDE:
+                # libjpeg picks the smallest 1/2, 1/4 or 1/8 scale that is at
+                # least this size, so LANCZOS still does the final downscale.
+                source.draft("RGB", _scaled_size(source, TARGET_LONG_SIDE))
             source.load()
             oriented = ImageOps.exif_transpose(source)
             oriented.load()
@@ -121,18 +268,46 @@ def normalize_image(raw: bytes, *, max_bytes: int) -> bytes:
 
     image = _resize_long_side(image, TARGET_LONG_SIDE)
     try:
-        while True:
-            for quality in JPEG_QUALITIES:
-                encoded = _encode_jpeg(image, quality)
-                if len(encoded) <= max_bytes:
-                    return encoded
+        return encode_within_budget(image, max_bytes=max_bytes)
+    finally:
+        image.close()
 
-            current_long_side = max(image.size)
-            if current_long_side <= MIN_LONG_SIDE:
-                raise ImageEncodeError("Unable to encode image within byte budget")
-            next_long_side = max(MIN_LONG_SIDE, int(current_long_side * 0.8))
-            if next_long_side >= current_long_side:
-                raise ImageEncodeError("Unable to encode image within byte budget")
-            image = _resize_long_side(image, next_long_side)
+
+def normalize_image(raw: bytes, *, max_bytes: int) -> bytes:
+    """Return only the bytes of normalize_image_with_stats()."""
+    return normalize_image_with_stats(raw, max_bytes=max_bytes).data
+
+
+def render_renditions(
+    normalized: bytes,
+    long_sides: Mapping[str, int] = IMAGE_RENDITIONS,
+) -> dict[str, bytes]:
+    """Downscale a normalize_image() result into smaller JPEG renditions.
+
+    The input is already oriented, flattened, and metadata-free, so only the
+    resize and encode are repeated. Each rendition is resized from the next
+    larger one, and the JPEG decoder skips detail the largest one cannot use.
+    """
+    ordered = sorted(long_sides.items(), key=lambda entry: entry[1], reverse=True)
+    if not ordered:
+        return {}
+    try:
+        with Image.open(BytesIO(normalized)) as source:
+            _check_dimensions(*source.size)
+            largest = ordered[0][1]
+            if max(source.size) > largest:
+                source.draft("RGB", _scaled_size(source, largest))
+            image = _flatten_to_rgb(source)
+    except ImageNormalizationError:
+        raise
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as exc:
+        raise ImageDecodeError("Unable to decode image") from exc
+
+    renditions: dict[str, bytes] = {}
+    try:
+        for name, long_side in ordered:
+            image = _resize_long_side(image, long_side)
+            renditions[name] = _encode_jpeg(image, RENDITION_QUALITY)
     finally:
         image.close()
+    return renditions
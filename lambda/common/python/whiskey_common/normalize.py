@@ -1,18 +1,27 @@
 """Text normalization shared by whiskey search implementations."""
 
 import unicodedata
+from functools import lru_cache
+
+
+NORMALIZE_CACHE_SIZE = 16384
+# Katakana ァ..ヶ shift to the matching Hiragana code point.
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
 
 
 def normalize_text(text: str) -> str:
     """Normalize case, width, whitespace, and Katakana for Japanese search."""
     if not text:
         return ""
+    # NFKC leaves ASCII unchanged and ASCII has no Katakana to shift.
+    if text.isascii():
+        return "".join(text.lower().split())
 
     normalized = unicodedata.normalize("NFKC", text).lower()
-    normalized = "".join(normalized.split())
-    return "".join(
-        chr(ord(character) - 0x60)
-        if "\u30a1" <= character <= "\u30f6"
-        else character
-        for character in normalized
-    )
+    return "".join(normalized.split()).translate(_KATAKANA_TO_HIRAGANA)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def cached_normalize_text(text: str) -> str:
+    """Memoized normalize_text for per-request inputs that repeat across calls."""
+    return normalize_text(text)
@@ -0,0 +1,377 @@
+"""In-memory character n-gram index and relevance ranking over whiskey names."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import json
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+from .normalize import cached_normalize_text, normalize_text
+
+
+NGRAM_SIZES = (2, 3)
+SEARCH_FIELDS = ("name", "name_ja", "name_en", "normalized_name")
+TOKEN_FIELDS = ("name", "name_ja", "name_en")
+ALIAS_FIELD = "brand_aliases"
+DOCUMENT_FIELDS = (
+    "id",
+    "brand_aliases",
+    "name",
+    "name_ja",
+    "name_en",
+    "normalized_name",
+    "distillery",
+    "distillery_ja",
+    "distillery_en",
+    "region",
+    "type",
+    "confidence",
+    "source",
+    "created_at",
+    "updated_at",
+)
+ARTIFACT_FORMAT_VERSION = 2
+# Match tiers, best first. A candidate has passed the substring check, so
+# SUBSTRING is the floor for any non-empty query.
+SCORE_EXACT = 6
+SCORE_ALIAS_EXACT = 5
+SCORE_PREFIX = 4
+SCORE_ALIAS_PREFIX = 3
+SCORE_TOKEN = 2
+SCORE_SUBSTRING = 1
+TOKEN_SPLIT_RE = re.compile(r"[\s|/・,]+")
+# normalize_text removes every whitespace character, so a normalized query can
+# never contain this separator or match across two joined names.
+KEY_SEPARATOR = "\n"
+
+
+def _ngrams(text: str, size: int) -> set[str]:
+    return {text[offset : offset + size] for offset in range(len(text) - size + 1)}
+
+
+def search_keys(item: Mapping[str, Any]) -> tuple[str, ...]:
+    """Return the distinct normalized names a record can be found by."""
+    return tuple(
+        dict.fromkeys(
+            normalized
+            for field in SEARCH_FIELDS
+            if isinstance(value := item.get(field), str)
+            if (normalized := normalize_text(value))
+        )
+    )
+
+
+def alias_keys(item: Mapping[str, Any]) -> tuple[str, ...]:
+    """Return the distinct normalized brand aliases of a record."""
+    aliases = item.get(ALIAS_FIELD)
+    if not isinstance(aliases, (list, tuple)):
+        return ()
+    return tuple(
+        dict.fromkeys(
+            normalized
+            for alias in aliases
+            if isinstance(alias, str)
+            if (normalized := normalize_text(alias))
+        )
+    )
+
+
+def token_keys(item: Mapping[str, Any]) -> tuple[str, ...]:
+    """Return the normalized words of a record's display names."""
+    return tuple(
+        dict.fromkeys(
+            normalized
+            for field in TOKEN_FIELDS
+            if isinstance(value := item.get(field), str)
+            for token in TOKEN_SPLIT_RE.split(value)
+            if (normalized := normalize_text(token))
+        )
+    )
+
+
+def document_terms(item: Mapping[str, Any]) -> tuple[tuple[str, ...], ...]:
+    """Return the (names, aliases, tokens) a record is matched and scored by."""
+    return search_keys(item), alias_keys(item), token_keys(item)
+
+
+def score_terms(normalized_query: str, terms: Sequence[Sequence[str]]) -> int:
+    """Score a matching record by its best match tier for the query."""
+    if not normalized_query:
+        return 0
+    names, aliases, tokens = terms
+    if normalized_query in names:
+        return SCORE_EXACT
+    if normalized_query in aliases:
+        return SCORE_ALIAS_EXACT
+    if any(name.startswith(normalized_query) for name in names):
+        return SCORE_PREFIX
+    if any(alias.startswith(normalized_query) for alias in aliases):
+        return SCORE_ALIAS_PREFIX
+    if any(token.startswith(normalized_query) for token in tokens):
+        return SCORE_TOKEN
+    return SCORE_SUBSTRING
+
+
+def rank_documents(query: str, documents: Iterable[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+    """Order an already-filtered page by relevance, then display name and id."""
+    normalized_query = cached_normalize_text(query)
+    return sorted(
+        documents,
+        key=lambda document: (
+            -score_terms(normalized_query, document_terms(document)),
+            *sort_key(document),
+        ),
+    )
+
+
+def sort_key(document: Mapping[str, Any]) -> tuple[str, str]:
+    """Return the stable result order: display name, then id."""
+    return str(document.get("name") or ""), str(document.get("id") or "")
+
+
+class SearchIndex:
+    """Immutable inverted index answering normalized substring queries.
+
+    Documents are stored in (name, id) order, so posting lists of document
+    positions are already sorted. Matches are ranked by score_terms and only
+    the requested page is kept in a bounded heap. Sorted arrays of normalized
+    names and aliases answer prefix (typeahead) queries by bisection.
+    """
+
+    __slots__ = (
+        "documents",
+        "terms",
+        "keys",
+        "postings",
+        "sort_keys",
+        "name_prefixes",
+        "alias_prefixes",
+    )
+
+    def __init__(
+        self,
+        documents: Sequence[dict[str, Any]],
+        terms: Sequence[Sequence[Sequence[str]]],
+        postings: Mapping[str, array],
+    ):
+        self.documents = tuple(documents)
+        self.terms = tuple(tuple(tuple(group) for group in entry) for entry in terms)
+        self.keys = tuple(
+            KEY_SEPARATOR.join((*names, *aliases)) for names, aliases, _ in self.terms
+        )
+        self.postings = dict(postings)
+        self.sort_keys = tuple(sort_key(document) for document in self.documents)
+        self.name_prefixes = self._prefix_array(names for names, _, _ in self.terms)
+        self.alias_prefixes = self._prefix_array(aliases for _, aliases, _ in self.terms)
+
+    @staticmethod
+    def _prefix_array(forms: Iterable[Sequence[str]]) -> tuple[tuple[str, ...], array]:
+        entries = sorted(
+            (form, position) for position, group in enumerate(forms) for form in set(group)
+        )
+        return tuple(form for form, _ in entries), array("I", (position for _, position in entries))
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def build(cls, items: Iterable[Mapping[str, Any]]) -> "SearchIndex":
+        """Index records by every bigram and trigram of their names and aliases."""
+        unique: dict[str, Mapping[str, Any]] = {}
+        for item in items:
+            item_id = item.get("id")
+            if isinstance(item_id, str) and item_id:
+                unique[item_id] = item
+        documents = sorted((dict(item) for item in unique.values()), key=sort_key)
+        terms = []
+        postings: dict[str, array] = {}
+        for position, document in enumerate(documents):
+            entry = document_terms(document)
+            terms.append(entry)
+            grams = set()
+            for name in (*entry[0], *entry[1]):
+                for size in NGRAM_SIZES:
+                    grams |= _ngrams(name, size)
+            for gram in grams:
+                postings.setdefault(gram, array("I")).append(position)
+        return cls(documents, terms, postings)
+
+    def _candidate_positions(self, normalized_query: str) -> Iterable[int]:
+        size = max((size for size in NGRAM_SIZES if size <= len(normalized_query)), default=0)
+        if not size:
+            return range(len(self.documents))
+        lists = sorted(
+            (self.postings.get(gram, array("I")) for gram in _ngrams(normalized_query, size)),
+            key=len,
+        )
+        if not lists[0]:
+            return ()
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return ()
+        return sorted(candidates)
+
+    def _matches(self, normalized_query: str) -> list[int]:
+        if not normalized_query:
+            return list(range(len(self.documents)))
+        return [
+            position
+            for position in self._candidate_positions(normalized_query)
+            if normalized_query in self.keys[position]
+        ]
+
+    def _ranked(
+        self,
+        normalized_query: str,
+        positions: Iterable[int],
+    ) -> Iterator[tuple[int, str, str, int]]:
+        # Ascending order is best first: negated score, then name and id.
+        for position in positions:
+            yield (
+                -score_terms(normalized_query, self.terms[position]),
+                *self.sort_keys[position],
+                position,
+            )
+
+    def matches(self, query: str) -> list[int]:
+        """Return positions of every document whose names or aliases contain the query."""
+        return self._matches(cached_normalize_text(query))
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        after: Sequence[Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], list[Any] | None]:
+        """Return one ranked page and the [score, name, id] to resume after."""
+        normalized_query = cached_normalize_text(query)
+        ranked = self._ranked(normalized_query, self._matches(normalized_query))
+        if after:
+            bound = (-after[0], after[1], after[2])
+            ranked = (entry for entry in ranked if entry[:3] > bound)
+        top = heapq.nsmallest(limit + 1, ranked)
+        page = [self.documents[entry[3]] for entry in top[:limit]]
+        if len(top) <= limit:
+            return page, None
+        last = top[limit - 1]
+        return page, [-last[0], last[1], last[2]]
+
+    def suggest(self, query: str, *, limit: int) -> list[dict[str, Any]]:
+        """Return the best records with a name or alias starting with the query.
+
+        Positions are in (name, id) order, so within each score tier the best
+        records are simply the smallest positions in the bisected range. Any
+        slots left are filled with the remaining substring matches in search
+        order, so typeahead still finds "12年" inside "山崎 12年".
+        """
+        normalized_query = cached_normalize_text(query)
+        if not normalized_query:
+            return []
+        upper = normalized_query + "\U0010ffff"
+        ranked: list[int] = []
+        seen: set[int] = set()
+        # Tiers in score_terms order: exact name, exact alias, name prefix, alias prefix.
+        for exact in (True, False):
+            for keys, positions in (self.name_prefixes, self.alias_prefixes):
+                start = bisect_left(keys, normalized_query)
+                end = bisect_right(keys, normalized_query) if exact else bisect_left(keys, upper)
+                candidates = set(positions[start:end]) - seen
+                for position in heapq.nsmallest(limit - len(ranked), candidates):
+                    ranked.append(position)
+                    seen.add(position)
+                if len(ranked) >= limit:
+                    return [self.documents[position] for position in ranked]
+        remaining = (
+            entry
+            for entry in self._ranked(normalized_query, self._matches(normalized_query))
+            if entry[3] not in seen
+        )
+        ranked.extend(entry[3] for entry in heapq.nsmallest(limit - len(ranked), remaining))
+        return [self.documents[position] for position in ranked]
+
+
+def _posting_bytes(posting: array) -> bytes:
+    if sys.byteorder != "little":
+        posting = array("I", posting)
+        posting.byteswap()
+    return posting.tobytes()
+
+
+def _posting_from_bytes(data: bytes) -> array:
+    posting = array("I")
+    posting.frombytes(data)
+    if sys.byteorder != "little":
+        posting.byteswap()
+    return posting
+
+
+def dump_artifact(index: SearchIndex, **metadata: Any) -> bytes:
+    """Serialize an index as a JSON header line followed by a hashed payload.
+
+    Postings are stored as little-endian uint32 arrays so loading them is a
+    byte copy rather than a JSON list walk.
+    """
+    payload = json.dumps(
+        {
+            "documents": index.documents,
+            "terms": index.terms,
+            "postings": {
+                gram: base64.b64encode(_posting_bytes(posting)).decode("ascii")
+                for gram, posting in sorted(index.postings.items())
+            },
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header = {
+        **metadata,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "item_count": len(index),
+        "content_hash": hashlib.sha256(payload).hexdigest(),
+    }
+    return json.dumps(header, ensure_ascii=False, sort_keys=True).encode("utf-8") + b"\n" + payload
+
+
+def read_artifact_header(data: bytes) -> dict[str, Any]:
+    """Return the artifact header without decoding the payload."""
+    header_bytes, separator, _ = data.partition(b"\n")
+    if not separator:
+        raise ValueError("search index artifact has no header")
+    header = json.loads(header_bytes)
+    if not isinstance(header, dict):
+        raise ValueError("search index artifact header must be an object")
+    if header.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"unsupported search index format_version: {header.get('format_version')!r}"
+        )
+    return header
+
+
+def load_artifact(data: bytes) -> tuple[SearchIndex, dict[str, Any]]:
+    """Verify and decode an artifact written by dump_artifact."""
+    header = read_artifact_header(data)
+    payload = data.partition(b"\n")[2]
+    if hashlib.sha256(payload).hexdigest() != header.get("content_hash"):
+        raise ValueError("search index artifact content_hash mismatch")
+    document = json.loads(payload)
+    index = SearchIndex(
+        document["documents"],
+        document["terms"],
+        {
+            gram: _posting_from_bytes(base64.b64decode(encoded))
+            for gram, encoded in document["postings"].items()
+        },
+    )
+    if len(index) != header.get("item_count") or len(index.terms) != len(index):
+        raise ValueError("search index artifact item_count mismatch")
+    return index, header
@@ -2,28 +2,35 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
+import sys
 import threading
 import time
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from typing import Any, Mapping
 
-import boto3
-from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 try:
-    from whiskey_common.clients import get_dynamodb_resource, get_s3_client
-    from whiskey_common.images import ImageNormalizationError, normalize_image, sniff_format
+    from whiskey_common.catalog_version import read_catalog_version
+    from whiskey_common.clients import get_bedrock_runtime_client, get_dynamodb_resource, get_s3_client
+    from whiskey_common.images import (
+        ImageNormalizationError,
+        normalize_image_with_stats,
+        render_renditions,
+        sniff_format,
+    )
     from whiskey_common.jwt_utils import extract_user_id_from_event
     from whiskey_common.logger import extract_correlation_id, get_logger
-    from whiskey_common.normalize import normalize_text
+    from whiskey_common.normalize import cached_normalize_text, normalize_text
     from whiskey_common.responses import create_response
     from whiskey_common.transactions import transact_write_with_retry
 except ModuleNotFoundError as exc:
@@ -32,11 +39,17 @@ except ModuleNotFoundError as exc:
     import sys
 
     sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "common" / "python"))
-    from whiskey_common.clients import get_dynamodb_resource, get_s3_client
-    from whiskey_common.images import ImageNormalizationError, normalize_image, sniff_format
+    from whiskey_common.catalog_version import read_catalog_version
+    from whiskey_common.clients import get_bedrock_runtime_client, get_dynamodb_resource, get_s3_client
+    from whiskey_common.images import (
+        ImageNormalizationError,
+        normalize_image_with_stats,
+        render_renditions,
+        sniff_format,
+    )
     from whiskey_common.jwt_utils import extract_user_id_from_event
     from whiskey_common.logger import extract_correlation_id, get_logger
-    from whiskey_common.normalize import normalize_text
+    from whiskey_common.normalize import cached_normalize_text, normalize_text
     from whiskey_common.responses import create_response
     from whiskey_common.transactions import transact_write_with_retry
 
@@ -45,14 +58,23 @@ SERVING_STYLES = {"NEAT", "ROCKS", "WATER", "SODA", "COCKTAIL"}
 SERVING_STYLE_ALIASES = {"HIGHBALL": "SODA", "SODA": "SODA"}
 UUID_TEXT = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-5][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}"
 UPLOAD_KEY_RE = re.compile(rf"^tmp/([^/]+)/({UUID_TEXT})\.(jpg|jpeg|png|webp)$")
+# Normalized JPEG kept next to the upload so create can copy it instead of
+# decoding the upload again, with its renditions beside it as
+# {uuid}.analyzed.{name}.jpg. The suffixes never match UPLOAD_KEY_RE.
+ANALYZED_IMAGE_KEY = "tmp/{user_id}/{upload_uuid}.analyzed.jpg"
 MAX_CANDIDATES = 5
+MAX_BATCH_SIZE = 5
 MASTER_SNAPSHOT_TTL_SECONDS = 300
-MASTER_SNAPSHOT_MAX_PAGES = 20
-MASTER_SNAPSHOT_MAX_ITEMS = 5000
+MASTER_SNAPSHOT_MAX_PAGES = 40
+MASTER_SNAPSHOT_MAX_ITEMS = 50_000
+MASTER_SNAPSHOT_SEGMENTS = 4
 ANALYSIS_TTL_SECONDS = 30 * 60
+ANALYSIS_CACHE_PREFIX = "analysis-cache#"
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
 HANDLER_BUDGET_MS = 24_000
 INVOKE_SAFETY_MS = 4_000
 MIN_INVOKE_BUDGET_MS = 2_000
+DEFAULT_ESCALATION_CONFIDENCE = Decimal("0.6")
 PROMPT = (
     "この写真に写っているウイスキーと飲み方を判定してください。"
     "日本で一般に流通している正式な日本語表記で答えてください。"
@@ -71,9 +93,13 @@ PROMPT = (
     '"glass_type":""}. '
     "confidence は0以上1以下にしてください。Markdownや説明は含めないでください。"
 )
+# Part of every analysis-cache key, so editing the prompt starts a fresh cache.
+PROMPT_VERSION = hashlib.sha256(PROMPT.encode("utf-8")).hexdigest()[:12]
 
 _MASTER_CACHE_LOCK = threading.Lock()
 _MASTER_CACHE: dict[str, Any] | None = None
+# One background build at a time; concurrent requests share the cache lock.
+_MASTER_SNAPSHOT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="master-snapshot")
 
 _BRAND_PREFIX_RE = re.compile(r"^the\s+", re.IGNORECASE)
 _BRAND_SUFFIX_RE = re.compile(
@@ -96,7 +122,7 @@ def _normalized_brand_name_variants(name: str) -> tuple[str, ...]:
         dict.fromkeys(
             normalized
             for variant in variants
-            if (normalized := normalize_text(variant))
+            if (normalized := cached_normalize_text(variant))
         )
     )
 
@@ -200,7 +226,34 @@ def _load_brand_catalog() -> tuple[dict[str, Any], ...]:
     )
 
 
+def _name_index(
+    records: Iterable[Mapping[str, Any]],
+    key_field: str,
+) -> dict[str, dict[str, Mapping[str, Any]]]:
+    """Map each normalized name to the records owning it, keyed by record id."""
+    index: dict[str, dict[str, Mapping[str, Any]]] = {}
+    for record in records:
+        record_key = record.get(key_field)
+        if not isinstance(record_key, str) or not record_key:
+            continue
+        for normalized_name in record.get("_normalized_names", ()):
+            index.setdefault(normalized_name, {})[record_key] = record
+    return index
+
+
+def _indexed_match(
+    index: Mapping[str, Mapping[str, Mapping[str, Any]]],
+    normalized_names: Iterable[str],
+) -> Mapping[str, Any] | None:
+    """Return the owner when the names identify exactly one record."""
+    owners: dict[str, Mapping[str, Any]] = {}
+    for normalized_name in normalized_names:
+        owners.update(index.get(normalized_name, {}))
+    return next(iter(owners.values())) if len(owners) == 1 else None
+
+
 BRAND_CATALOG = _load_brand_catalog()
+BRAND_NAME_INDEX = _name_index(BRAND_CATALOG, "brand_key")
 
 
 class ValidationError(ValueError):
@@ -242,19 +295,48 @@ def _validate_runtime_config() -> str:
     ):
         raise RuntimeError("MOCK_AI and MOCK_PLACES are permitted only in local")
     model_id = os.environ.get("BEDROCK_MODEL_ID", "")
-    allowlist = {
+    if not model_id or model_id not in _model_allowlist():
+        raise RuntimeError("BEDROCK_MODEL_ID is not in BEDROCK_MODEL_ALLOWLIST")
+    if model_id.startswith("global."):
+        raise RuntimeError("Global Bedrock inference profiles are not permitted")
+    return model_id
+
+
+def _model_allowlist() -> set[str]:
+    return {
         value.strip()
         for value in os.environ.get("BEDROCK_MODEL_ALLOWLIST", "").split(",")
         if value.strip()
     }
-    if not model_id or model_id not in allowlist:
-        raise RuntimeError("BEDROCK_MODEL_ID is not in BEDROCK_MODEL_ALLOWLIST")
-    if model_id.startswith("global."):
+
+
+def _escalation_config(model_id: str) -> tuple[str | None, Decimal]:
+    """Return the optional stronger model and the top confidence below which it is used."""
+    raw_confidence = os.environ.get("BEDROCK_ESCALATION_CONFIDENCE", "").strip()
+    try:
+        confidence = (
+            _decimal_confidence(Decimal(raw_confidence))
+            if raw_confidence
+            else DEFAULT_ESCALATION_CONFIDENCE
+        )
+    except InvalidOperation:
+        confidence = None
+    if confidence is None:
+        raise RuntimeError("BEDROCK_ESCALATION_CONFIDENCE must be between 0 and 1")
+    escalation_model_id = os.environ.get("BEDROCK_ESCALATION_MODEL_ID", "").strip()
+    if not escalation_model_id:
+        return None, confidence
+    if escalation_model_id == model_id or escalation_model_id not in _model_allowlist():
+        raise RuntimeError(
+            "BEDROCK_ESCALATION_MODEL_ID must be another model in BEDROCK_MODEL_ALLOWLIST"
+        )
+    if escalation_model_id.startswith("global."):
         raise RuntimeError("Global Bedrock inference profiles are not permitted")
-    return model_id
+    return escalation_model_id, confidence
 
 
-def _parse_input(event: Mapping[str, Any]) -> str:
+def _parse_input(event: Mapping[str, Any]) -> tuple[list[str], bool]:
+    """Return the requested upload keys and whether the batch form was used."""
     raw = event.get("body")
     if not isinstance(raw, str):
         raise ValidationError({"body": "A JSON object is required"})
@@ -264,6 +346,26 @@ def _parse_input(event: Mapping[str, Any]) -> str:
         raise ValidationError({"body": "Malformed JSON"}) from exc
     if not isinstance(body, dict):
         raise ValidationError({"body": "A JSON object is required"})
+    if "s3_keys" in body:
+        if set(body) != {"s3_keys"}:
+            raise ValidationError(
+                {name: "Field is not accepted" for name in sorted(set(body) - {"s3_keys"})}
+            )
+        s3_keys = body["s3_keys"]
+        if not isinstance(s3_keys, list) or not 1 <= len(s3_keys) <= MAX_BATCH_SIZE:
+            raise ValidationError(
+                {"s3_keys": f"Must list 1 to {MAX_BATCH_SIZE} temporary upload keys"}
+            )
+        matches = [
+            UPLOAD_KEY_RE.fullmatch(s3_key) if isinstance(s3_key, str) else None
+            for s3_key in s3_keys
+        ]
+        if not all(matches):
+            raise ValidationError({"s3_keys": "Must be supported temporary upload keys"})
+        # Keys differing only by extension share one analysis record.
+        if len({match.group(2).lower() for match in matches}) != len(s3_keys):
+            raise ValidationError({"s3_keys": "Each upload may be listed only once"})
+        return list(s3_keys), True
     if set(body) != {"s3_key"}:
         fields = {name: "Field is not accepted" for name in sorted(set(body) - {"s3_key"})}
         if "s3_key" not in body:
@@ -272,7 +374,7 @@ def _parse_input(event: Mapping[str, Any]) -> str:
     s3_key = body.get("s3_key")
     if not isinstance(s3_key, str) or not UPLOAD_KEY_RE.fullmatch(s3_key):
         raise ValidationError({"s3_key": "Must be a supported temporary upload key"})
-    return s3_key
+    return [s3_key], False
 
 
 def _upload_identity(s3_key: str, user_id: str) -> str:
@@ -292,19 +394,92 @@ def _read_body(response: Mapping[str, Any]) -> bytes:
             close()
 
 
-def _counter_update(table_name: str, key: str, limit: int, ttl: int, now: str) -> dict[str, Any]:
+def _persist_normalized_image(
+    s3: Any,
+    *,
+    bucket_name: str,
+    user_id: str,
+    upload_uuid: str,
+    source_etag: str,
+    source_format: str,
+    image: bytes,
+    logger: Any = None,
+) -> str | None:
+    """Store the normalized JPEG for create, bound to the analyzed upload.
+
+    Failure only costs create a second normalization, so it never fails the
+    analysis.
+    """
+    key = ANALYZED_IMAGE_KEY.format(user_id=user_id, upload_uuid=upload_uuid)
+    try:
+        s3.put_object(
+            Bucket=bucket_name,
+            Key=key,
+            Body=image,
+            ContentType="image/jpeg",
+            CacheControl="private, no-store",
+            Metadata={"source-etag": source_etag, "source-format": source_format},
+        )
+    except (BotoCoreError, ClientError) as exc:
+        if logger is not None:
+            logger.warning("Normalized image was not stored", error_type=type(exc).__name__)
+        return None
+    return key
+
+
+def _persist_renditions(
+    s3: Any,
+    upload: Mapping[str, Any],
+    *,
+    bucket_name: str,
+    user_id: str,
+    logger: Any = None,
+) -> None:
+    """Store the renditions create copies beside its full image.
+
+    They are rendered from the in-memory JPEG in their own pooled task, so the
+    work overlaps the model call instead of delaying the full image's store.
+    A failure leaves create's record with only the full image.
+    """
+    key = ANALYZED_IMAGE_KEY.format(user_id=user_id, upload_uuid=upload["upload_uuid"])
+    metadata = {"source-etag": upload["etag"], "source-format": upload["source_format"]}
+    try:
+        for name, body in render_renditions(upload["image"]).items():
+            s3.put_object(
+                Bucket=bucket_name,
+                Key=f"{key.removesuffix('.jpg')}.{name}.jpg",
+                Body=body,
+                ContentType="image/jpeg",
+                CacheControl="private, no-store",
+                Metadata=metadata,
+            )
+    except (ImageNormalizationError, BotoCoreError, ClientError) as exc:
+        if logger is not None:
+            logger.warning("Image renditions were not stored", error_type=type(exc).__name__)
+
+
+def _counter_update(
+    table_name: str,
+    key: str,
+    limit: int,
+    ttl: int,
+    now: str,
+    amount: int = 1,
+) -> dict[str, Any]:
     return {
         "Update": {
             "TableName": table_name,
             "Key": {"pk": key},
             "UpdateExpression": (
-                "SET #ttl = if_not_exists(#ttl, :ttl), updated_at = :now ADD #count :one"
+                "SET #ttl = if_not_exists(#ttl, :ttl), updated_at = :now ADD #count :amount"
             ),
-            "ConditionExpression": "attribute_not_exists(#count) OR #count < :limit",
+            # count + amount <= limit, written as a strict bound like the
+            # single-reservation form.
+            "ConditionExpression": "attribute_not_exists(#count) OR #count < :ceiling",
             "ExpressionAttributeNames": {"#count": "count", "#ttl": "ttl"},
             "ExpressionAttributeValues": {
-                ":one": 1,
-                ":limit": limit,
+                ":amount": amount,
+                ":ceiling": limit - amount + 1,
                 ":ttl": ttl,
                 ":now": now,
             },
@@ -312,67 +487,104 @@ def _counter_update(table_name: str, key: str, limit: int, ttl: int, now: str) -
     }
 
 
-def _reserve_analysis_budget(
-    dynamodb: Any,
-    table_name: str,
+def _analysis_counters(
     user_id: str,
+    current: datetime,
     *,
     user_request: bool,
-    now_dt: datetime | None = None,
-    remaining_ms: Callable[[], int] | None = None,
-) -> None:
-    current = now_dt or _utc_now()
+    amount: int = 1,
+) -> list[tuple[str, str, int, int, int]]:
+    """Return (key, label, limit, ttl, amount) for the user's or the global counters."""
     date = current.strftime("%Y-%m-%d")
     month = current.strftime("%Y-%m")
     daily_ttl = int((current + timedelta(days=2)).timestamp())
     monthly_ttl = int((current + timedelta(days=35)).timestamp())
-    now = _rfc3339(current)
-    writes: list[dict[str, Any]] = []
-    labels: list[str] = []
     if user_request:
-        writes.append(
-            _counter_update(
-                table_name,
+        return [
+            (
                 f"drinklog-counter#analyze#user#{user_id}#{date}",
+                "daily",
                 int(os.environ.get("ANALYZE_USER_DAILY_LIMIT", "20")),
                 daily_ttl,
-                now,
+                amount,
             )
-        )
-        labels.append("daily")
-    else:
-        writes.extend(
-            [
-                _counter_update(
-                    table_name,
-                    f"drinklog-counter#analyze#global#{date}",
-                    int(os.environ.get("ANALYZE_GLOBAL_DAILY_LIMIT", "50")),
-                    daily_ttl,
-                    now,
-                ),
-                _counter_update(
-                    table_name,
-                    f"drinklog-counter#analyze#global-month#{month}",
-                    int(os.environ.get("ANALYZE_GLOBAL_MONTHLY_LIMIT", "1000")),
-                    monthly_ttl,
-                    now,
-                ),
-            ]
-        )
-        labels.extend(("daily", "monthly"))
+        ]
+    return [
+        (
+            f"drinklog-counter#analyze#global#{date}",
+            "daily",
+            int(os.environ.get("ANALYZE_GLOBAL_DAILY_LIMIT", "50")),
+            daily_ttl,
+            amount,
+        ),
+        (
+            f"drinklog-counter#analyze#global-month#{month}",
+            "monthly",
+            int(os.environ.get("ANALYZE_GLOBAL_MONTHLY_LIMIT", "1000")),
+            monthly_ttl,
+            amount,
+        ),
+    ]
+
+
+def _budget_exceeded(label: str) -> BudgetExceeded:
+    if label == "monthly":
+        return BudgetExceeded(503, "Monthly analysis budget exhausted")
+    return BudgetExceeded(429, "Daily analysis limit exceeded")
+
+
+def _reserve_counters(
+    dynamodb: Any,
+    table_name: str,
+    counters: list[tuple[str, str, int, int, int]],
+    *,
+    current: datetime,
+    remaining_ms: Callable[[], int] | None,
+) -> None:
+    for _key, label, limit, _ttl, amount in counters:
+        if amount > limit:
+            raise _budget_exceeded(label)
+    now = _rfc3339(current)
+    writes = [
+        _counter_update(table_name, key, limit, ttl, now, amount)
+        for key, _label, limit, ttl, amount in counters
+    ]
     client = dynamodb.meta.client
     try:
         transact_write_with_retry(client, writes, remaining_ms=remaining_ms)
     except client.exceptions.TransactionCanceledException as exc:
         reasons = exc.response.get("CancellationReasons", [])
-        for index, label in enumerate(labels):
+        for index, counter in enumerate(counters):
             if index < len(reasons) and reasons[index].get("Code") == "ConditionalCheckFailed":
-                if label == "monthly":
-                    raise BudgetExceeded(503, "Monthly analysis budget exhausted") from exc
-                raise BudgetExceeded(429, "Daily analysis limit exceeded") from exc
+                raise _budget_exceeded(counter[1]) from exc
         raise
 
 
+def _reserve_analysis_budget(
+    dynamodb: Any,
+    table_name: str,
+    user_id: str,
+    *,
+    user_request: bool,
+    amount: int = 1,
+    now_dt: datetime | None = None,
+    remaining_ms: Callable[[], int] | None = None,
+) -> None:
+    """Reserve amount units of the user's request or the global model counters.
+
+    Global units are reserved right before each model call, so a call skipped
+    for lack of handler budget never spends one.
+    """
+    current = now_dt or _utc_now()
+    _reserve_counters(
+        dynamodb,
+        table_name,
+        _analysis_counters(user_id, current, user_request=user_request, amount=amount),
+        current=current,
+        remaining_ms=remaining_ms,
+    )
+
+
 def strip_json_code_fence(text: str) -> str:
     """Remove a single leading/trailing Markdown JSON fence."""
     stripped = text.strip()
@@ -469,19 +681,98 @@ def _remaining_budget_ms(context: Any, started: float) -> int:
 
 
 def _bedrock_client(read_timeout: float):
-    config = Config(
-        connect_timeout=min(2.0, read_timeout),
-        read_timeout=read_timeout,
-        retries={"mode": "standard", "total_max_attempts": 1},
-    )
-    kwargs: dict[str, Any] = {"config": config}
-    region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION")
-    if region:
-        kwargs["region_name"] = region
-    return boto3.client("bedrock-runtime", **kwargs)
+    return get_bedrock_runtime_client(read_timeout)
+
+
+class _JsonObjectScanner:
+    """Find where the first top-level JSON object in streamed text closes."""
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self.length = 0
+        self._start: int | None = None
+        self._end: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Append chunk and return True once the object is complete."""
+        for offset, character in enumerate(chunk):
+            if self._end is not None:
+                break
+            if self._start is None:
+                if character == "{":
+                    self._start = self.length + offset
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif character == "\\":
+                    self._escaped = True
+                elif character == '"':
+                    self._in_string = False
+            elif character == '"':
+                self._in_string = True
+            elif character == "{":
+                self._depth += 1
+            elif character == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = self.length + offset + 1
+        self._parts.append(chunk)
+        self.length += len(chunk)
+        return self._end is not None
+
+    def text(self) -> str:
+        """Return the complete object, or everything received if it never closed."""
+        received = "".join(self._parts)
+        if self._start is None or self._end is None:
+            return received
+        return received[self._start:self._end]
+
+
+def _stream_model_text(client: Any, request: Mapping[str, Any], logger: Any = None) -> str:
+    """Read converse_stream output, closing the stream as soon as the JSON object closes."""
+    requested = time.monotonic()
+    first_token_ms: float | None = None
+    scanner = _JsonObjectScanner()
+    closed_early = False
+    stream = client.converse_stream(**request)["stream"]
+    try:
+        for event in stream:
+            if "messageStop" in event:
+                break
+            delta = ((event.get("contentBlockDelta") or {}).get("delta") or {}).get("text")
+            if not isinstance(delta, str) or not delta:
+                continue
+            if first_token_ms is None:
+                first_token_ms = round((time.monotonic() - requested) * 1000, 1)
+            if scanner.feed(delta):
+                closed_early = True
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
+    if logger is not None:
+        logger.info(
+            "Model stream finished",
+            time_to_first_token_ms=first_token_ms,
+            duration_ms=round((time.monotonic() - requested) * 1000, 1),
+            closed_early=closed_early,
+            output_chars=scanner.length,
+        )
+    return scanner.text()
 
 
-def _invoke_model(model_id: str, image: bytes, context: Any, started: float) -> dict[str, Any] | None:
+def _invoke_model(
+    model_id: str,
+    image: bytes,
+    context: Any,
+    started: float,
+    logger: Any = None,
+) -> dict[str, Any] | None:
     remaining_ms = _remaining_budget_ms(context, started)
     if remaining_ms < MIN_INVOKE_BUDGET_MS:
         return None
@@ -494,21 +785,25 @@ def _invoke_model(model_id: str, image: bytes, context: Any, started: float) ->
             "glass_type": "tumbler",
         }
     client = _bedrock_client(max(0.1, remaining_ms / 1000))
+    request = {
+        "modelId": model_id,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"image": {"format": "jpeg", "source": {"bytes": image}}},
+                    {"text": PROMPT},
+                ],
+            }
+        ],
+        "inferenceConfig": {"maxTokens": 512, "temperature": 0},
+    }
     try:
-        response = client.converse(
-            modelId=model_id,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"image": {"format": "jpeg", "source": {"bytes": image}}},
-                        {"text": PROMPT},
-                    ],
-                }
-            ],
-            inferenceConfig={"maxTokens": 512, "temperature": 0},
-        )
-        parsed = json.loads(strip_json_code_fence(_extract_response_text(response)))
+        if _env_flag_is_set("BEDROCK_STREAMING"):
+            text = _stream_model_text(client, request, logger)
+        else:
+            text = _extract_response_text(client.converse(**request))
+        parsed = json.loads(strip_json_code_fence(text))
     except (BotoCoreError, ClientError):
         return None
     except (json.JSONDecodeError, TypeError, ValueError):
@@ -516,6 +811,84 @@ def _invoke_model(model_id: str, image: bytes, context: Any, started: float) ->
     return _validate_model_output(parsed) or {}
 
 
+def _analysis_cache_key(
+    image: bytes,
+    model_id: str,
+    escalation_model_id: str | None = None,
+    escalation_confidence: Decimal = DEFAULT_ESCALATION_CONFIDENCE,
+) -> str:
+    digest = hashlib.sha256(image).hexdigest()
+    models = model_id
+    if escalation_model_id is not None:
+        # A cascade can answer differently from its first model alone.
+        models = f"{model_id}>{escalation_model_id}@{escalation_confidence}"
+    return f"{ANALYSIS_CACHE_PREFIX}{models}#{PROMPT_VERSION}#{digest}"
+
+
+def _cached_analysis(
+    app_state_table: Any, key: str, logger: Any = None
+) -> tuple[dict[str, Any], str] | None:
+    """Return a still-valid cached model output and the model that produced it.
+
+    Any failure is treated as a miss.
+    """
+    try:
+        item = app_state_table.get_item(Key={"pk": key}).get("Item")
+    except (BotoCoreError, ClientError) as exc:
+        if logger is not None:
+            logger.warning("Analysis cache read failed", error_type=type(exc).__name__)
+        return None
+    # DynamoDB TTL deletes lazily, so expiry is checked here as well.
+    if not item or int(item.get("expires_at", 0)) <= int(_utc_now().timestamp()):
+        return None
+    analysis = _validate_model_output(item.get("analysis"))
+    if analysis is None or not isinstance(item.get("model_id"), str):
+        return None
+    return analysis, item["model_id"]
+
+
+def _store_cached_analysis(
+    app_state_table: Any,
+    key: str,
+    analysis: Mapping[str, Any],
+    model_id: str,
+    logger: Any = None,
+) -> None:
+    """Cache validated model output for identical normalized images.
+
+    Only output that passed _validate_model_output is stored, and its
+    candidate count and field lengths are bounded there, so entries stay small
+    (about 10 KB at worst). Entries are written only after a model call, and
+    every call spends a global daily unit, so at most ANALYZE_GLOBAL_DAILY_LIMIT
+    entries are added per day. With the default TTL of 7 days, 50 calls a day
+    keep at most 350 entries (a few MB) alive, and no per-user cap is needed.
+    """
+    expires_at = int(
+        (
+            _utc_now()
+            + timedelta(
+                seconds=int(
+                    os.environ.get("ANALYSIS_CACHE_TTL_SECONDS", str(ANALYSIS_CACHE_TTL_SECONDS))
+                )
+            )
+        ).timestamp()
+    )
+    try:
+        app_state_table.put_item(
+            Item={
+                "pk": key,
+                "analysis": dict(analysis),
+                "model_id": model_id,
+                "prompt_version": PROMPT_VERSION,
+                "expires_at": expires_at,
+                "ttl": expires_at,
+            }
+        )
+    except (BotoCoreError, ClientError) as exc:
+        if logger is not None:
+            logger.warning("Analysis cache write failed", error_type=type(exc).__name__)
+
+
 def _whiskey_names(whiskey: Mapping[str, Any]) -> list[str]:
     return [
         value
@@ -529,8 +902,7 @@ def _whiskey_id(item: Mapping[str, Any]) -> str | None:
     return value if isinstance(value, str) and value else None
 
 
-def _snapshot_record(item: Mapping[str, Any]) -> dict[str, Any]:
-    record = dict(item)
+def _catalog_names(item: Mapping[str, Any]) -> tuple[str, ...]:
     names = [
         value
         for value in (
@@ -541,83 +913,223 @@ def _snapshot_record(item: Mapping[str, Any]) -> dict[str, Any]:
         )
         if isinstance(value, str) and value
     ]
-    normalized_names = tuple(
+    return tuple(
         dict.fromkeys(normalized for name in names if (normalized := normalize_text(name)))
     )
-    record["_normalized_names"] = normalized_names
-    return record
+
+
+class CatalogIndex:
+    """Compact master snapshot: interned ids plus a normalized name index.
+
+    Only what matching needs is retained. Each name maps to the position of
+    its single owner, or to a tuple of positions when several rows share it.
+    """
+
+    __slots__ = ("ids", "positions")
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.positions: dict[str, int | tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, item: Mapping[str, Any]) -> None:
+        record_id = _whiskey_id(item)
+        if record_id is None:
+            return
+        position = len(self.ids)
+        self.ids.append(sys.intern(record_id))
+        for normalized_name in _catalog_names(item):
+            owner = self.positions.get(normalized_name)
+            if owner is None:
+                self.positions[sys.intern(normalized_name)] = position
+            elif isinstance(owner, int):
+                self.positions[normalized_name] = (owner, position)
+            else:
+                self.positions[normalized_name] = (*owner, position)
+
+    def match(self, normalized_names: Iterable[str]) -> str | None:
+        """Return the id when the names identify exactly one row."""
+        ids: set[str] = set()
+        for normalized_name in normalized_names:
+            owner = self.positions.get(normalized_name)
+            if owner is None:
+                continue
+            if isinstance(owner, int):
+                ids.add(self.ids[owner])
+            else:
+                ids.update(self.ids[position] for position in owner)
+            if len(ids) > 1:
+                return None
+        return next(iter(ids)) if ids else None
 
 
 def _reset_master_cache() -> None:
-    """Clear the module-level master snapshot cache for tests."""
+    """Clear the module-level master snapshot cache for tests.
+
+    Waits for any in-flight background build first so it cannot repopulate
+    the cache afterwards.
+    """
     global _MASTER_CACHE
+    _MASTER_SNAPSHOT_EXECUTOR.submit(lambda: None).result()
     with _MASTER_CACHE_LOCK:
         _MASTER_CACHE = None
 
 
-def _build_master_snapshot(table: Any, table_name: str, logger: Any = None) -> dict[str, Any]:
-    items: list[dict[str, Any]] = []
+def _master_snapshot_segments() -> int:
+    return max(1, int(os.environ.get("MASTER_SNAPSHOT_SEGMENTS", str(MASTER_SNAPSHOT_SEGMENTS))))
+
+
+def _scan_master_segment(
+    table: Any,
+    segment: int,
+    total_segments: int,
+    state: dict[str, Any],
+    state_lock: threading.Lock,
+    logger: Any = None,
+) -> dict[str, Any]:
+    """Scan one parallel-scan segment, sharing page and item caps via state.
+
+    The first segment to hit a cap or an error records the reason in state;
+    the others stop before their next page.
+    """
+    started = time.monotonic()
+    items: list[Mapping[str, Any]] = []
     last_key = None
     page_count = 0
-    complete = True
-    incomplete_reason = None
-    while page_count < MASTER_SNAPSHOT_MAX_PAGES:
+    while True:
+        with state_lock:
+            if state["incomplete_reason"] is not None:
+                break
+            if state["page_count"] >= MASTER_SNAPSHOT_MAX_PAGES:
+                state["incomplete_reason"] = "max_pages"
+                break
+            state["page_count"] += 1
         kwargs: dict[str, Any] = {
             "ProjectionExpression": "id, #name, name_ja, name_en, normalized_name",
             "ExpressionAttributeNames": {"#name": "name"},
         }
+        if total_segments > 1:
+            kwargs["Segment"] = segment
+            kwargs["TotalSegments"] = total_segments
         if last_key:
             kwargs["ExclusiveStartKey"] = last_key
         try:
+            # Table actions only delegate to the thread-safe low-level client.
             response = table.scan(**kwargs)
         except (BotoCoreError, ClientError) as exc:
-            complete = False
-            incomplete_reason = "scan_error"
+            with state_lock:
+                state["incomplete_reason"] = "scan_error"
             if logger is not None:
                 logger.warning(
                     "Master snapshot scan failed",
                     error_type=type(exc).__name__,
+                    segment=segment,
                 )
             break
         page_count += 1
         page_items = response.get("Items", [])
         if not isinstance(page_items, list):
             page_items = []
-        remaining = MASTER_SNAPSHOT_MAX_ITEMS - len(items)
-        items.extend(_snapshot_record(item) for item in page_items[:remaining])
         last_key = response.get("LastEvaluatedKey")
-        if len(page_items) > remaining or (
-            len(items) >= MASTER_SNAPSHOT_MAX_ITEMS and last_key
-        ):
-            complete = False
-            incomplete_reason = "max_items"
-            break
+        with state_lock:
+            remaining = max(MASTER_SNAPSHOT_MAX_ITEMS - state["item_count"], 0)
+            state["item_count"] += min(len(page_items), remaining)
+            if state["incomplete_reason"] is None and (
+                len(page_items) > remaining
+                or (state["item_count"] >= MASTER_SNAPSHOT_MAX_ITEMS and last_key)
+            ):
+                state["incomplete_reason"] = "max_items"
+        items.extend(page_items[:remaining])
         if not last_key:
             break
+    return {
+        "segment": segment,
+        "items": items,
+        "page_count": page_count,
+        "duration_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+def _build_master_snapshot(table: Any, table_name: str, logger: Any = None) -> dict[str, Any]:
+    started = time.monotonic()
+    total_segments = _master_snapshot_segments()
+    state: dict[str, Any] = {"page_count": 0, "item_count": 0, "incomplete_reason": None}
+    state_lock = threading.Lock()
+    if total_segments == 1:
+        segments = [_scan_master_segment(table, 0, 1, state, state_lock, logger)]
     else:
-        complete = not bool(last_key)
-        if not complete:
-            incomplete_reason = "max_pages"
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            segments = list(
+                executor.map(
+                    lambda segment: _scan_master_segment(
+                        table, segment, total_segments, state, state_lock, logger
+                    ),
+                    range(total_segments),
+                )
+            )
 
+    catalog = CatalogIndex()
+    for segment in segments:
+        for item in segment["items"]:
+            catalog.add(item)
+    incomplete_reason = state["incomplete_reason"]
+    complete = incomplete_reason is None
+    page_count = sum(segment["page_count"] for segment in segments)
     snapshot = {
         "table_name": table_name,
         "expires_at": time.monotonic() + MASTER_SNAPSHOT_TTL_SECONDS,
-        "items": tuple(items),
+        "catalog": catalog,
         "complete": complete,
         "incomplete_reason": incomplete_reason,
         "page_count": page_count,
     }
+    if logger is not None:
+        logger.info(
+            "Master snapshot built",
+            master_snapshot_size=state["item_count"],
+            page_count=page_count,
+            segment_count=total_segments,
+            segment_page_counts=[segment["page_count"] for segment in segments],
+            segment_timings_ms=[segment["duration_ms"] for segment in segments],
+            duration_ms=round((time.monotonic() - started) * 1000, 1),
+        )
     if not complete and incomplete_reason != "scan_error" and logger is not None:
         logger.warning(
             "Master snapshot incomplete",
-            master_snapshot_size=len(items),
+            master_snapshot_size=state["item_count"],
             page_count=page_count,
             incomplete_reason=incomplete_reason,
         )
     return snapshot
 
 
-def _get_master_snapshot(table: Any, table_name: str, logger: Any = None) -> dict[str, Any]:
+def _current_catalog_version(
+    app_state_table: Any,
+    table_name: str,
+    logger: Any = None,
+) -> int | None:
+    try:
+        return read_catalog_version(app_state_table, table_name)
+    except (BotoCoreError, ClientError) as exc:
+        if logger is not None:
+            logger.warning("Catalog version read failed", error_type=type(exc).__name__)
+        return None
+
+
+def _get_master_snapshot(
+    table: Any,
+    table_name: str,
+    logger: Any = None,
+    app_state_table: Any = None,
+) -> dict[str, Any]:
+    """Return the cached snapshot, revalidating it against the catalog version.
+
+    An expired snapshot whose catalog version still matches the AppState
+    marker is kept for another TTL at the cost of one get_item. Without a
+    marker (never bumped, or unreadable) the table is rescanned as before.
+    """
     global _MASTER_CACHE
     now = time.monotonic()
     cached = _MASTER_CACHE
@@ -636,7 +1148,22 @@ def _get_master_snapshot(table: Any, table_name: str, logger: Any = None) -> dic
             and cached["expires_at"] > now
         ):
             return cached
+        version = None
+        if app_state_table is not None:
+            version = _current_catalog_version(app_state_table, table_name, logger)
+            if (
+                version is not None
+                and cached is not None
+                and cached["table_name"] == table_name
+                and cached.get("catalog_version") == version
+            ):
+                _MASTER_CACHE = {**cached, "expires_at": now + MASTER_SNAPSHOT_TTL_SECONDS}
+                if logger is not None:
+                    logger.info("Master snapshot revalidated", catalog_version=version)
+                return _MASTER_CACHE
+        # The version is read before the scan so a bump during it forces a rebuild.
         snapshot = _build_master_snapshot(table, table_name, logger)
+        snapshot["catalog_version"] = version
         if snapshot.get("incomplete_reason") != "scan_error":
             _MASTER_CACHE = snapshot
         return snapshot
@@ -654,71 +1181,83 @@ def _cached_master_snapshot(table_name: str) -> dict[str, Any] | None:
     return None
 
 
-def _master_snapshot_within_budget(
+def _unavailable_master_snapshot(table_name: str, reason: str) -> dict[str, Any]:
+    # An incomplete snapshot makes every candidate fall back to match_source
+    # "ai": the record still saves, it just carries no catalog id.
+    return {
+        "table_name": table_name,
+        "expires_at": 0.0,
+        "catalog": CatalogIndex(),
+        "complete": False,
+        "incomplete_reason": reason,
+        "page_count": 0,
+    }
+
+
+def _start_master_snapshot(
     table: Any,
     table_name: str,
     context: Any,
     started: float,
     logger: Any = None,
-) -> dict[str, Any]:
-    """Skip the catalog scan when there is not enough time left to afford it.
+    app_state_table: Any = None,
+) -> Future:
+    """Start the catalog scan in the background so it overlaps the model call.
 
-    The scan runs after the model call and can take up to
-    MASTER_SNAPSHOT_MAX_PAGES sequential round trips on a cold container. With
-    no guard it can push the handler past the Lambda timeout, which surfaces as
-    a 502 instead of a graceful degradation. A warm cache costs nothing, so it
-    is always used; only an actual scan is gated.
+    A warm cache costs nothing, so it is always used; a scan is only started
+    when there is enough budget left to afford it.
     """
     cached = _cached_master_snapshot(table_name)
     if cached is not None:
-        return cached
-    if _remaining_budget_ms(context, started) >= MIN_INVOKE_BUDGET_MS:
-        return _get_master_snapshot(table, table_name, logger)
-    if logger is not None:
-        logger.warning("Skipped master snapshot scan", reason="insufficient_budget")
-    # An incomplete snapshot makes every candidate fall back to match_source
-    # "ai": the record still saves, it just carries no catalog id.
-    return {
-        "table_name": table_name,
-        "expires_at": 0.0,
-        "items": (),
-        "complete": False,
-        "incomplete_reason": "insufficient_budget",
-        "page_count": 0,
-    }
+        future: Future = Future()
+        future.set_result(cached)
+        return future
+    if _remaining_budget_ms(context, started) < MIN_INVOKE_BUDGET_MS:
+        if logger is not None:
+            logger.warning("Skipped master snapshot scan", reason="insufficient_budget")
+        future = Future()
+        future.set_result(_unavailable_master_snapshot(table_name, "insufficient_budget"))
+        return future
+    return _MASTER_SNAPSHOT_EXECUTOR.submit(
+        _get_master_snapshot, table, table_name, logger, app_state_table
+    )
 
 
-def _unique_records(records: list[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
-    unique: dict[str, Mapping[str, Any]] = {}
-    for record in records:
-        record_id = _whiskey_id(record)
-        if record_id:
-            unique[record_id] = record
-    return list(unique.values())
+def _join_master_snapshot(
+    future: Future,
+    table_name: str,
+    context: Any,
+    started: float,
+    logger: Any = None,
+) -> dict[str, Any]:
+    """Wait for the background scan for at most the remaining handler budget.
+
+    The scan can take up to MASTER_SNAPSHOT_MAX_PAGES round trips on a cold
+    container. Waiting past the budget would surface as a 502 instead of a
+    graceful degradation, so a scan that is still running is left to finish
+    into the cache for the next request.
+    """
+    try:
+        return future.result(timeout=max(_remaining_budget_ms(context, started), 0) / 1000)
+    except TimeoutError:
+        if logger is not None:
+            logger.warning("Master snapshot not ready", reason="insufficient_budget")
+        return _unavailable_master_snapshot(table_name, "insufficient_budget")
 
 
 def _catalog_match(
     snapshot: Mapping[str, Any],
     whiskey: Mapping[str, Any],
-) -> Mapping[str, Any] | None:
+) -> str | None:
     if not snapshot.get("complete"):
         return None
 
-    normalized_names = tuple(
-        dict.fromkeys(
-            normalized
-            for name in _whiskey_names(whiskey)
-            if (normalized := normalize_text(name))
-        )
-    )
-    exact_matches = _unique_records(
-        [
-            item
-            for item in snapshot.get("items", ())
-            if set(normalized_names).intersection(item.get("_normalized_names", ()))
-        ]
-    )
-    return exact_matches[0] if len(exact_matches) == 1 else None
+    normalized_names = {
+        normalized
+        for name in _whiskey_names(whiskey)
+        if (normalized := cached_normalize_text(name))
+    }
+    return snapshot["catalog"].match(normalized_names)
 
 
 def _brand_catalog_match(whiskey: Mapping[str, Any]) -> Mapping[str, Any] | None:
@@ -728,12 +1267,7 @@ def _brand_catalog_match(whiskey: Mapping[str, Any]) -> Mapping[str, Any] | None
         if isinstance(name := whiskey.get(field), str)
         for normalized in _normalized_brand_name_variants(name)
     }
-    matches = [
-        brand
-        for brand in BRAND_CATALOG
-        if normalized_names.intersection(brand["_normalized_names"])
-    ]
-    return matches[0] if len(matches) == 1 else None
+    return _indexed_match(BRAND_NAME_INDEX, normalized_names)
 
 
 def _build_candidates(
@@ -742,16 +1276,16 @@ def _build_candidates(
 ) -> list[dict[str, Any]]:
     candidates: list[dict[str, Any]] = []
     for whiskey in analysis.get("whiskeys", []):
-        matched = _catalog_match(snapshot, whiskey)
+        whiskey_id = _catalog_match(snapshot, whiskey)
         brand_matched = _brand_catalog_match(whiskey)
         candidate = {
             "brand_text": whiskey["name_ja"],
             "name_ja": whiskey["name_ja"],
             "name_en": whiskey["name_en"],
             "confidence": whiskey["confidence"],
-            "match_source": "catalog" if matched is not None else "ai",
+            "match_source": "catalog" if whiskey_id is not None else "ai",
         }
-        if matched is not None and (whiskey_id := _whiskey_id(matched)):
+        if whiskey_id is not None:
             candidate["whiskey_id"] = whiskey_id
         for brand_field in ("brand_ja", "brand_en"):
             if whiskey.get(brand_field):
@@ -764,20 +1298,8 @@ def _build_candidates(
     return candidates
 
 
-def analyze_upload(
-    dynamodb: Any,
-    s3: Any,
-    *,
-    app_state_table_name: str,
-    whiskey_table_name: str,
-    bucket_name: str,
-    user_id: str,
-    s3_key: str,
-    model_id: str,
-    context: Any,
-    started: float,
-    logger: Any = None,
-) -> dict[str, Any]:
+def _inspect_upload(s3: Any, *, bucket_name: str, user_id: str, s3_key: str) -> dict[str, str]:
+    """Check the upload's size, ETag, and magic bytes before any decoding."""
     upload_uuid = _upload_identity(s3_key, user_id)
     head = s3.head_object(Bucket=bucket_name, Key=s3_key)
     content_length = head.get("ContentLength")
@@ -793,20 +1315,101 @@ def analyze_upload(
         raise ValidationError({"s3_key": "Uploaded image size or ETag is invalid"})
 
     prefix = _read_body(s3.get_object(Bucket=bucket_name, Key=s3_key, Range="bytes=0-15"))
-    if sniff_format(prefix) not in {"jpeg", "png", "webp"}:
+    source_format = sniff_format(prefix)
+    if source_format not in {"jpeg", "png", "webp"}:
         raise ValidationError({"s3_key": "Uploaded file is not a supported image"})
-    raw = _read_body(s3.get_object(Bucket=bucket_name, Key=s3_key, IfMatch=etag))
-    normalized = normalize_image(raw, max_bytes=int(os.environ.get("IMAGE_MAX_BYTES", "1572864")))
+    return {
+        "s3_key": s3_key,
+        "upload_uuid": upload_uuid,
+        "etag": etag,
+        "source_format": source_format,
+    }
 
-    _reserve_analysis_budget(
-        dynamodb,
-        app_state_table_name,
-        user_id,
-        user_request=True,
-        remaining_ms=lambda: _remaining_budget_ms(context, started),
+
+def _normalize_upload(
+    s3: Any,
+    upload: Mapping[str, str],
+    *,
+    bucket_name: str,
+    user_id: str,
+    logger: Any = None,
+) -> dict[str, Any]:
+    """Normalize an inspected upload in memory; nothing is stored yet."""
+    raw = _read_body(
+        s3.get_object(Bucket=bucket_name, Key=upload["s3_key"], IfMatch=upload["etag"])
+    )
+    encoded = normalize_image_with_stats(
+        raw, max_bytes=int(os.environ.get("IMAGE_MAX_BYTES", "1572864"))
     )
-    analysis: dict[str, Any] | None = None
-    for _attempt in range(2):
+    if logger is not None:
+        logger.info(
+            "Image normalized",
+            jpeg_quality=encoded.quality,
+            encode_attempts=encoded.encode_attempts,
+            normalized_bytes=len(encoded.data),
+        )
+    return {**upload, "image": encoded.data}
+
+
+def _persist_upload(
+    s3: Any,
+    upload: Mapping[str, Any],
+    *,
+    bucket_name: str,
+    user_id: str,
+    logger: Any = None,
+) -> dict[str, Any]:
+    """Store a normalized upload for create once its budget is reserved."""
+    normalized_key = _persist_normalized_image(
+        s3,
+        bucket_name=bucket_name,
+        user_id=user_id,
+        upload_uuid=upload["upload_uuid"],
+        source_etag=upload["etag"],
+        source_format=upload["source_format"],
+        image=upload["image"],
+        logger=logger,
+    )
+    return {**upload, "normalized_key": normalized_key}
+
+
+def _model_outcome(analysis: Mapping[str, Any] | None, min_confidence: Decimal) -> str:
+    """Classify one model answer; anything but "usable" triggers escalation."""
+    if analysis is None:
+        return "no_output"
+    if not analysis:
+        return "invalid_output"
+    if not analysis["whiskeys"]:
+        return "no_whiskeys"
+    if max(whiskey["confidence"] for whiskey in analysis["whiskeys"]) < min_confidence:
+        return "low_confidence"
+    return "usable"
+
+
+def _analyze_image(
+    dynamodb: Any,
+    *,
+    app_state_table_name: str,
+    user_id: str,
+    model_id: str,
+    image: bytes,
+    context: Any,
+    started: float,
+    escalation_model_id: str | None = None,
+    escalation_confidence: Decimal = DEFAULT_ESCALATION_CONFIDENCE,
+    logger: Any = None,
+) -> tuple[dict[str, Any] | None, str]:
+    """Call the model and return its output with the model that produced it.
+
+    Without an escalation model, unusable output is retried once on the same
+    model. With one, the second call goes to the escalation model instead, and
+    is also made when the first answer has no whiskeys or its top confidence is
+    below escalation_confidence. The output is None when nothing usable arrived
+    within the budget.
+    """
+    answers: list[tuple[dict[str, Any] | None, str]] = []
+    stages = (model_id, escalation_model_id or model_id)
+    for stage, stage_model_id in enumerate(stages, start=1):
         if _remaining_budget_ms(context, started) < MIN_INVOKE_BUDGET_MS:
             break
         _reserve_analysis_budget(
@@ -816,23 +1419,65 @@ def analyze_upload(
             user_request=False,
             remaining_ms=lambda: _remaining_budget_ms(context, started),
         )
-        analysis = _invoke_model(model_id, normalized, context, started)
-        if analysis is None or analysis:
+        stage_started = time.monotonic()
+        analysis = _invoke_model(stage_model_id, image, context, started, logger)
+        outcome = _model_outcome(analysis, escalation_confidence)
+        if logger is not None:
+            logger.info(
+                "Model stage finished",
+                stage=stage,
+                model_id=stage_model_id,
+                duration_ms=round((time.monotonic() - stage_started) * 1000, 1),
+                outcome=outcome,
+            )
+        answers.append((analysis, stage_model_id))
+        if escalation_model_id is None:
+            if outcome != "invalid_output":
+                break
+        elif outcome == "usable":
             break
-    if not analysis:
-        analysis = {
-            "whiskeys": [],
-            "serving_style": "NEAT",
-            "glass_type": "",
-        }
 
-    snapshot = _master_snapshot_within_budget(
-        dynamodb.Table(whiskey_table_name),
-        whiskey_table_name,
-        context,
-        started,
-        logger,
-    )
+    # Prefer the last answer that names a whiskey, then any valid answer.
+    chosen: tuple[dict[str, Any] | None, str] = (None, model_id)
+    for analysis, answered_by in reversed(answers):
+        if analysis and analysis["whiskeys"]:
+            chosen = (analysis, answered_by)
+            break
+        if analysis and not chosen[0]:
+            chosen = (analysis, answered_by)
+    if escalation_model_id is not None and logger is not None:
+        escalated = len(answers) > 1
+        logger.info(
+            "Model cascade finished",
+            escalated=escalated,
+            escalation_reason=(
+                _model_outcome(answers[0][0], escalation_confidence) if escalated else None
+            ),
+            stages=len(answers),
+            model_id=chosen[1],
+        )
+    return chosen
+
+
+def _empty_analysis() -> dict[str, Any]:
+    return {
+        "whiskeys": [],
+        "serving_style": "NEAT",
+        "glass_type": "",
+    }
+
+
+def _store_analysis(
+    dynamodb: Any,
+    *,
+    app_state_table_name: str,
+    user_id: str,
+    upload: Mapping[str, Any],
+    analysis: Mapping[str, Any],
+    snapshot: Mapping[str, Any],
+    model_id: str,
+    logger: Any = None,
+) -> dict[str, Any]:
     candidates = _build_candidates(snapshot, analysis)
     if logger is not None:
         catalog_count = sum(
@@ -850,21 +1495,23 @@ def analyze_upload(
             ),
             model_id=model_id,
             master_snapshot_complete=snapshot["complete"],
-            master_snapshot_size=len(snapshot["items"]),
+            master_snapshot_size=len(snapshot["catalog"]),
         )
     expires_at = int((_utc_now() + timedelta(seconds=ANALYSIS_TTL_SECONDS)).timestamp())
-    analysis_id = f"ai-result:{user_id}:{upload_uuid}"
+    analysis_id = f"ai-result:{user_id}:{upload['upload_uuid']}"
     item: dict[str, Any] = {
         "pk": analysis_id,
         "user": user_id,
-        "s3_key": s3_key,
-        "ETag": etag,
+        "s3_key": upload["s3_key"],
+        "ETag": upload["etag"],
         "candidates": candidates,
         "serving_style": analysis["serving_style"],
         "model_id": model_id,
         "expires_at": expires_at,
         "ttl": expires_at,
     }
+    if upload.get("normalized_key") is not None:
+        item["normalized_s3_key"] = upload["normalized_key"]
     if candidates:
         item["confidence"] = candidates[0]["confidence"]
         if candidates[0].get("whiskey_id"):
@@ -881,6 +1528,284 @@ def analyze_upload(
     return response
 
 
+def analyze_upload(
+    dynamodb: Any,
+    s3: Any,
+    *,
+    app_state_table_name: str,
+    whiskey_table_name: str,
+    bucket_name: str,
+    user_id: str,
+    s3_key: str,
+    model_id: str,
+    context: Any,
+    started: float,
+    escalation_model_id: str | None = None,
+    escalation_confidence: Decimal = DEFAULT_ESCALATION_CONFIDENCE,
+    logger: Any = None,
+) -> dict[str, Any]:
+    upload = _inspect_upload(s3, bucket_name=bucket_name, user_id=user_id, s3_key=s3_key)
+    snapshot_future = _start_master_snapshot(
+        dynamodb.Table(whiskey_table_name),
+        whiskey_table_name,
+        context,
+        started,
+        logger,
+        dynamodb.Table(app_state_table_name),
+    )
+    upload = _normalize_upload(
+        s3, upload, bucket_name=bucket_name, user_id=user_id, logger=logger
+    )
+
+    app_state_table = dynamodb.Table(app_state_table_name)
+    cache_key = _analysis_cache_key(
+        upload["image"], model_id, escalation_model_id, escalation_confidence
+    )
+    hit = _cached_analysis(app_state_table, cache_key, logger)
+    if logger is not None:
+        logger.info(
+            "Analysis cache checked",
+            cache_hits=int(hit is not None),
+            cache_misses=int(hit is None),
+        )
+
+    _reserve_analysis_budget(
+        dynamodb,
+        app_state_table_name,
+        user_id,
+        user_request=True,
+        remaining_ms=lambda: _remaining_budget_ms(context, started),
+    )
+    # Only a reserved request writes to S3, so rejected ones cost no PUT. The
+    # store overlaps the model call, and leaving the pool waits for it.
+    store = {"bucket_name": bucket_name, "user_id": user_id, "logger": logger}
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="analyze-store") as executor:
+        stored = executor.submit(_persist_upload, s3, upload, **store)
+        executor.submit(_persist_renditions, s3, upload, **store)
+        if hit is not None:
+            analysis, answered_by = hit
+        else:
+            analysis, answered_by = _analyze_image(
+                dynamodb,
+                app_state_table_name=app_state_table_name,
+                user_id=user_id,
+                model_id=model_id,
+                image=upload["image"],
+                context=context,
+                started=started,
+                escalation_model_id=escalation_model_id,
+                escalation_confidence=escalation_confidence,
+                logger=logger,
+            )
+            if analysis:
+                _store_cached_analysis(app_state_table, cache_key, analysis, answered_by, logger)
+            else:
+                analysis = _empty_analysis()
+        snapshot = _join_master_snapshot(
+            snapshot_future,
+            whiskey_table_name,
+            context,
+            started,
+            logger,
+        )
+        # The store swallows S3 errors, so this only waits for it.
+        upload = stored.result()
+    return _store_analysis(
+        dynamodb,
+        app_state_table_name=app_state_table_name,
+        user_id=user_id,
+        upload=upload,
+        analysis=analysis,
+        snapshot=snapshot,
+        model_id=answered_by,
+        logger=logger,
+    )
+
+
+def _failure(exc: BaseException) -> tuple[int, dict[str, Any]] | None:
+    """Map an expected analysis failure to its status code and body."""
+    if isinstance(exc, ValidationError):
+        return 400, {"error": "Validation failed", "fields": exc.fields}
+    if isinstance(exc, OwnershipError):
+        return 403, {"error": "Upload does not belong to caller"}
+    if isinstance(exc, BudgetExceeded):
+        return exc.status_code, {"error": str(exc)}
+    if isinstance(exc, ImageNormalizationError):
+        return 400, {"error": "Uploaded image is invalid"}
+    if isinstance(exc, ClientError):
+        code = exc.response.get("Error", {}).get("Code")
+        if code in {"404", "NoSuchKey", "NotFound", "PreconditionFailed", "412"}:
+            return 400, {"error": "Uploaded image is missing or changed"}
+    return None
+
+
+def _batch_failure(s3_key: str, exc: BaseException, logger: Any = None) -> dict[str, Any]:
+    failure = _failure(exc)
+    if failure is None:
+        if logger is not None:
+            logger.error("Batch analysis item failed", error_type=type(exc).__name__)
+        failure = 500, {"error": "Internal server error"}
+    status, body = failure
+    return {"s3_key": s3_key, "status": status, **body}
+
+
+def analyze_uploads(
+    dynamodb: Any,
+    s3: Any,
+    *,
+    app_state_table_name: str,
+    whiskey_table_name: str,
+    bucket_name: str,
+    user_id: str,
+    s3_keys: list[str],
+    model_id: str,
+    context: Any,
+    started: float,
+    escalation_model_id: str | None = None,
+    escalation_confidence: Decimal = DEFAULT_ESCALATION_CONFIDENCE,
+    logger: Any = None,
+) -> list[dict[str, Any]]:
+    """Analyze several uploads concurrently within one handler deadline.
+
+    The user's requests for every image that normalizes are reserved in one
+    transaction, so a rejected reservation fails the whole batch before anything
+    is stored. Each model call then reserves its global units as in the single
+    form. Any other failure, including a spent global budget, is reported per
+    image, in request order, with the status the single form would return.
+    """
+    snapshot_future = _start_master_snapshot(
+        dynamodb.Table(whiskey_table_name),
+        whiskey_table_name,
+        context,
+        started,
+        logger,
+        dynamodb.Table(app_state_table_name),
+    )
+
+    app_state_table = dynamodb.Table(app_state_table_name)
+
+    def prepare(s3_key: str) -> dict[str, Any]:
+        # The cache lookup runs here so its reads overlap across the batch.
+        upload = _inspect_upload(s3, bucket_name=bucket_name, user_id=user_id, s3_key=s3_key)
+        upload = _normalize_upload(
+            s3, upload, bucket_name=bucket_name, user_id=user_id, logger=logger
+        )
+        cache_key = _analysis_cache_key(
+            upload["image"], model_id, escalation_model_id, escalation_confidence
+        )
+        return {
+            **upload,
+            "cache_key": cache_key,
+            "cached": _cached_analysis(app_state_table, cache_key, logger),
+        }
+
+    results: list[dict[str, Any] | None] = [None] * len(s3_keys)
+    # Each image may run a model call, a store, and a rendition task at once.
+    with ThreadPoolExecutor(
+        max_workers=3 * len(s3_keys), thread_name_prefix="analyze-batch"
+    ) as executor:
+        prepared: dict[int, dict[str, Any]] = {}
+        for index, future in enumerate([executor.submit(prepare, key) for key in s3_keys]):
+            exc = future.exception()
+            if exc is None:
+                prepared[index] = future.result()
+            else:
+                results[index] = _batch_failure(s3_keys[index], exc, logger)
+        if not prepared:
+            return [result for result in results if result is not None]
+
+        cached = {
+            index: upload["cached"]
+            for index, upload in prepared.items()
+            if upload["cached"] is not None
+        }
+        if logger is not None:
+            logger.info(
+                "Analysis cache checked",
+                cache_hits=len(cached),
+                cache_misses=len(prepared) - len(cached),
+            )
+
+        _reserve_analysis_budget(
+            dynamodb,
+            app_state_table_name,
+            user_id,
+            user_request=True,
+            amount=len(prepared),
+            remaining_ms=lambda: _remaining_budget_ms(context, started),
+        )
+        analyses = {
+            index: executor.submit(
+                _analyze_image,
+                dynamodb,
+                app_state_table_name=app_state_table_name,
+                user_id=user_id,
+                model_id=model_id,
+                image=upload["image"],
+                context=context,
+                started=started,
+                escalation_model_id=escalation_model_id,
+                escalation_confidence=escalation_confidence,
+                logger=logger,
+            )
+            for index, upload in prepared.items()
+            if index not in cached
+        }
+        store = {"bucket_name": bucket_name, "user_id": user_id, "logger": logger}
+        stored = {
+            index: executor.submit(_persist_upload, s3, upload, **store)
+            for index, upload in prepared.items()
+        }
+        for upload in prepared.values():
+            executor.submit(_persist_renditions, s3, upload, **store)
+        snapshot = _join_master_snapshot(
+            snapshot_future,
+            whiskey_table_name,
+            context,
+            started,
+            logger,
+        )
+        for index, future in stored.items():
+            # The store swallows S3 errors, so this only waits for it.
+            prepared[index] = future.result()
+        for index in prepared:
+            if index in cached:
+                analysis, answered_by = cached[index]
+            else:
+                future = analyses[index]
+                exc = future.exception()
+                if exc is not None:
+                    results[index] = _batch_failure(s3_keys[index], exc, logger)
+                    continue
+                analysis, answered_by = future.result()
+                if analysis:
+                    _store_cached_analysis(
+                        app_state_table,
+                        prepared[index]["cache_key"],
+                        analysis,
+                        answered_by,
+                        logger,
+                    )
+                else:
+                    analysis = _empty_analysis()
+            try:
+                response = _store_analysis(
+                    dynamodb,
+                    app_state_table_name=app_state_table_name,
+                    user_id=user_id,
+                    upload=prepared[index],
+                    analysis=analysis,
+                    snapshot=snapshot,
+                    model_id=answered_by,
+                    logger=logger,
+                )
+            except (BotoCoreError, ClientError) as store_exc:
+                results[index] = _batch_failure(s3_keys[index], store_exc, logger)
+            else:
+                results[index] = {"s3_key": s3_keys[index], "status": 200, **response}
+    return [result for result in results if result is not None]
+
+
 def _request_id(event: Mapping[str, Any], context: Any) -> str:
     return (
         getattr(context, "aws_request_id", None)
@@ -890,9 +1815,10 @@ def _request_id(event: Mapping[str, Any], context: Any) -> str:
 
 
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-    """Handle POST /api/drink-logs/analyze."""
+    """Handle POST /api/drink-logs/analyze for one upload or a batch of them."""
     started = time.monotonic()
     model_id = _validate_runtime_config()
+    escalation_model_id, escalation_confidence = _escalation_config(model_id)
     request_id = _request_id(event, context)
     logger = get_logger("drink-log-analyze", correlation_id=extract_correlation_id(event) or request_id)
     logger.log_api_request(
@@ -904,43 +1830,45 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     if not user_id:
         return create_response(401, {"error": "Authentication required"}, event=event, private=True)
     try:
-        s3_key = _parse_input(event)
-        upload_uuid = _upload_identity(s3_key, user_id)
-        del upload_uuid
-        result = analyze_upload(
-            get_dynamodb_resource(),
-            get_s3_client(),
-            app_state_table_name=os.environ["APP_STATE_TABLE"],
-            whiskey_table_name=os.environ["WHISKEY_SEARCH_TABLE"],
-            bucket_name=os.environ["IMAGES_BUCKET"],
-            user_id=user_id,
-            s3_key=s3_key,
-            model_id=model_id,
-            context=context,
-            started=started,
-            logger=logger,
-        )
+        s3_keys, batch = _parse_input(event)
+        for s3_key in s3_keys:
+            _upload_identity(s3_key, user_id)
+        arguments = {
+            "app_state_table_name": os.environ["APP_STATE_TABLE"],
+            "whiskey_table_name": os.environ["WHISKEY_SEARCH_TABLE"],
+            "bucket_name": os.environ["IMAGES_BUCKET"],
+            "user_id": user_id,
+            "model_id": model_id,
+            "context": context,
+            "started": started,
+            "escalation_model_id": escalation_model_id,
+            "escalation_confidence": escalation_confidence,
+            "logger": logger,
+        }
+        if batch:
+            result = {
+                "results": analyze_uploads(
+                    get_dynamodb_resource(), get_s3_client(), s3_keys=s3_keys, **arguments
+                )
+            }
+        else:
+            result = analyze_upload(
+                get_dynamodb_resource(), get_s3_client(), s3_key=s3_keys[0], **arguments
+            )
         return create_response(200, result, event=event, private=True)
-    except ValidationError as exc:
-        return create_response(
-            400,
-            {"error": "Validation failed", "fields": exc.fields},
-            event=event,
-            private=True,
-        )
-    except OwnershipError:
-        return create_response(403, {"error": "Upload does not belong to caller"}, event=event, private=True)
-    except BudgetExceeded as exc:
-        return create_response(exc.status_code, {"error": str(exc)}, event=event, private=True)
-    except ImageNormalizationError:
-        return create_response(400, {"error": "Uploaded image is invalid"}, event=event, private=True)
-    except ClientError as exc:
-        code = exc.response.get("Error", {}).get("Code")
-        if code in {"404", "NoSuchKey", "NotFound", "PreconditionFailed", "412"}:
-            return create_response(400, {"error": "Uploaded image is missing or changed"}, event=event, private=True)
-        logger.error("AWS operation failed", error_code=code, request_id=request_id)
     except Exception as exc:
-        logger.error("Unhandled analysis error", error_type=type(exc).__name__, request_id=request_id)
+        failure = _failure(exc)
+        if failure is not None:
+            status, body = failure
+            return create_response(status, body, event=event, private=True)
+        if isinstance(exc, ClientError):
+            logger.error(
+                "AWS operation failed",
+                error_code=exc.response.get("Error", {}).get("Code"),
+                request_id=request_id,
+            )
+        else:
+            logger.error("Unhandled analysis error", error_type=type(exc).__name__, request_id=request_id)
     return create_response(
         500,
         {"error": "Internal server error", "request_id": request_id},
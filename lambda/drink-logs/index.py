@@ -12,19 +12,22 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Iterable, Iterator, Mapping
 
 from botocore.exceptions import ClientError
 
 try:
     from whiskey_common.clients import get_dynamodb_resource, get_s3_client
+    from whiskey_common.decimal_utils import decimal_default
     from whiskey_common.images import (
         ImageNormalizationError,
         normalize_image,
+        render_renditions,
         sniff_format,
     )
     from whiskey_common.jwt_utils import extract_user_id_from_event
     from whiskey_common.logger import extract_correlation_id, get_logger
+    from whiskey_common.normalize import normalize_text
     from whiskey_common.responses import create_response
     from whiskey_common.scan_utils import decode_next_token, encode_next_token
     from whiskey_common.transactions import transact_write_with_retry
@@ -33,13 +36,16 @@ except ModuleNotFoundError as exc:
         raise
     sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "common" / "python"))
     from whiskey_common.clients import get_dynamodb_resource, get_s3_client
+    from whiskey_common.decimal_utils import decimal_default
     from whiskey_common.images import (
         ImageNormalizationError,
         normalize_image,
+        render_renditions,
         sniff_format,
     )
     from whiskey_common.jwt_utils import extract_user_id_from_event
     from whiskey_common.logger import extract_correlation_id, get_logger
+    from whiskey_common.normalize import normalize_text
     from whiskey_common.responses import create_response
     from whiskey_common.scan_utils import decode_next_token, encode_next_token
     from whiskey_common.transactions import transact_write_with_retry
@@ -61,18 +67,80 @@ INTERNAL_FIELDS = {
     "content_type",
     "tmp_etag",
     "s3_image_key",
+    "s3_display_key",
+    "s3_thumbnail_key",
     "tmp_s3_key",
+    "tmp_normalized_key",
     "quota_allocated",
     "delete_started_at",
+    "user_brand_key",
+    "user_place_key",
+    "stats_keys",
+    "reconcile_state",
 }
 DEFAULT_PAGE_LIMIT = 20
 MAX_PAGE_LIMIT = 50
 MAX_TIMELINE_PAGE_QUERIES = 10
+# Exact filters answered by a sparse index instead of paging UserDatetimeIndex.
+# Complete records carry "<user_id>#<value>" in the key attribute; the first
+# filter present picks the index and any other filter stays a FilterExpression.
+TIMELINE_FILTER_INDEXES = {
+    "place_id": ("UserPlaceDatetimeIndex", "user_place_key"),
+    "brand_key": ("UserBrandDatetimeIndex", "user_brand_key"),
+}
+# Per-user counters move in the same transactions as drinklog-quota#user. Each
+# counter is its own small AppState item, {STATS_OWNER}#{counter}, so a user with
+# many brands or places never grows one item toward the 400 KB limit, and
+# StatsOwnerIndex (stats_owner, pk) lists one user's counters. Each record stores
+# the counters it added as stats_keys so deletion and compensation release
+# exactly those.
+STATS_OWNER = "drinklog-stats#user#{user_id}"
+STATS_INDEX = "StatsOwnerIndex"
+# Brands count on the catalog brand_key when the log has one; hand-typed and
+# unmatched brands fall back to the normalized brand_text under their own prefix
+# so the two never collide.
+STATS_GROUPS = {
+    "brand": "brand_keys",
+    "brand_text": "brand_text_keys",
+    "place": "place_ids",
+    "style": "serving_styles",
+    "month": "months",
+}
+MAX_STATS_UPDATE_ATTEMPTS = 3
 PRESIGNED_POST_SECONDS = 120
 PRESIGNED_GET_SECONDS = 900
+# A cached GET URL is handed out only while it has at least this long to live.
+PRESIGNED_URL_REUSE_MARGIN_SECONDS = 300
+PRESIGNED_URL_CACHE_MAX_ENTRIES = 5_000
+# Exports read whole 1 MB query pages with only these attributes and stream
+# NDJSON to S3, so memory stays at one page plus one multipart part.
+EXPORT_FIELDS = (
+    "id",
+    "datetime",
+    "brand_text",
+    "brand_source",
+    "brand_key",
+    "whiskey_id",
+    "serving_style",
+    "store",
+    "notes",
+    "rating",
+    "ai",
+    "created_at",
+    "updated_at",
+)
+EXPORT_KEY = "exports/{user_id}/{export_id}.ndjson"
+EXPORT_PART_BYTES = 8 * 1024 * 1024
 NAMESPACE_DRINKLOG = uuid.UUID("7df1920f-5929-51ee-9860-164c1d4bc388")
 UUID_TEXT = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-5][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}"
 ANALYSIS_ID_RE = re.compile(rf"^(?:ai-result:([^:]+):)?({UUID_TEXT})$")
+# Normalized JPEG that analyze stores beside the upload, with its renditions as
+# {uuid}.analyzed.{name}.jpg (see drink-log-analyze).
+ANALYZED_IMAGE_KEY = "tmp/{user_id}/{upload_uuid}.analyzed.jpg"
+# Smaller renditions stored next to logs/{user}/{uuid}-{attempt}.jpg as
+# {uuid}-{attempt}.{name}.jpg, and the record field holding each key.
+RENDITION_KEY_FIELDS = {"display": "s3_display_key", "thumbnail": "s3_thumbnail_key"}
+RENDITION_URL_FIELDS = {"display": "display_url", "thumbnail": "thumbnail_url"}
 RFC3339_WITH_OFFSET_RE = re.compile(
     r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})$"
 )
@@ -123,7 +191,8 @@ def _rfc3339(value: datetime) -> str:
     )
 
 
-def _validate_create_datetime(value: Any) -> str | None:
+def _parse_rfc3339(value: Any) -> datetime | None:
+    """Parse an RFC3339 timestamp with an explicit offset into UTC."""
     if not isinstance(value, str) or not RFC3339_WITH_OFFSET_RE.fullmatch(value):
         return None
     try:
@@ -132,7 +201,13 @@ def _validate_create_datetime(value: Any) -> str | None:
         return None
     if parsed.utcoffset() is None:
         return None
-    normalized = parsed.astimezone(timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _validate_create_datetime(value: Any) -> str | None:
+    normalized = _parse_rfc3339(value)
+    if normalized is None:
+        return None
     if normalized < datetime(2000, 1, 1, tzinfo=timezone.utc):
         return None
     if normalized > _utc_now() + timedelta(minutes=5):
@@ -300,6 +375,11 @@ def validate_update_input(data: Mapping[str, Any]) -> dict[str, Any]:
 def parse_timeline_query(
     query: Mapping[str, Any],
 ) -> tuple[int, dict[str, Any] | None, dict[str, str]]:
+    """Return limit, start key, and filters.
+
+    filters also carries the datetime range ("from" inclusive, "to" exclusive,
+    both normalized to the stored sort-key format) and "order" when ascending.
+    """
     try:
         limit = int(query.get("limit", DEFAULT_PAGE_LIMIT))
     except (TypeError, ValueError) as exc:
@@ -312,7 +392,7 @@ def parse_timeline_query(
         raise ValidationError({"next_token": "Invalid continuation token"}) from exc
     filters: dict[str, str] = {}
     errors: dict[str, str] = {}
-    for name in ("brand", "store", "place_id"):
+    for name in ("brand", "store", "place_id", "brand_key"):
         value = query.get(name)
         if value is None:
             continue
@@ -320,11 +400,98 @@ def parse_timeline_query(
             errors[name] = "Must be a string of at most 100 characters"
         elif value:
             filters[name] = value
+    bounds: dict[str, datetime] = {}
+    for name in ("from", "to"):
+        if query.get(name) is None:
+            continue
+        parsed = _parse_rfc3339(query[name])
+        if parsed is None:
+            errors[name] = "Must be an RFC3339 timestamp with a timezone offset"
+        else:
+            bounds[name] = parsed
+            filters[name] = _rfc3339(parsed)
+    if len(bounds) == 2 and bounds["from"] >= bounds["to"]:
+        errors["to"] = "Must be later than from"
+    order = query.get("order", "desc")
+    if order not in {"asc", "desc"}:
+        errors["order"] = "Must be asc or desc"
+    elif order == "asc":
+        filters["order"] = order
     if errors:
         raise ValidationError(errors)
+    # A token from another index, or one outside the requested range, would be
+    # rejected by DynamoDB as a 500.
+    _index_name, key_attribute, _routed = _timeline_index(filters)
+    if start_key is not None and (
+        set(start_key) != {"id", "datetime", key_attribute}
+        or not isinstance(start_key["datetime"], str)
+        or ("from" in filters and start_key["datetime"] < filters["from"])
+        or ("to" in filters and start_key["datetime"] >= filters["to"])
+    ):
+        raise ValidationError({"next_token": "Invalid continuation token"})
     return limit, start_key, filters
 
 
+def _timeline_index(filters: Mapping[str, str]) -> tuple[str, str, str | None]:
+    """Return the index, its partition key attribute, and the filter it answers."""
+    for name, (index_name, key_attribute) in TIMELINE_FILTER_INDEXES.items():
+        if name in filters:
+            return index_name, key_attribute, name
+    return "UserDatetimeIndex", "user_id", None
+
+
+def _timeline_key_condition(
+    key_attribute: str,
+    filters: Mapping[str, str],
+) -> tuple[str, dict[str, str], dict[str, str]]:
+    """Return the key condition with the datetime range on the index sort key."""
+    condition = f"{key_attribute} = :partition"
+    if "from" not in filters and "to" not in filters:
+        return condition, {}, {}
+    names = {"#datetime": "datetime"}
+    if "from" in filters and "to" in filters:
+        # A key condition allows one sort-key clause and BETWEEN is inclusive,
+        # so the exclusive end moves back one unit of the millisecond format.
+        before_to = _rfc3339(
+            datetime.fromisoformat(filters["to"].replace("Z", "+00:00"))
+            - timedelta(milliseconds=1)
+        )
+        values = {":from": filters["from"], ":before_to": before_to}
+        return f"{condition} AND #datetime BETWEEN :from AND :before_to", names, values
+    if "from" in filters:
+        return f"{condition} AND #datetime >= :from", names, {":from": filters["from"]}
+    return f"{condition} AND #datetime < :to", names, {":to": filters["to"]}
+
+
+def _brand_text_key(brand_text: Any) -> str:
+    return normalize_text(brand_text) if isinstance(brand_text, str) else ""
+
+
+def _timeline_filter_keys(
+    user_id: str,
+    fields: Mapping[str, Any],
+) -> tuple[dict[str, str], list[str]]:
+    """Return sparse-index attributes to set and to remove for changed fields.
+
+    fields may hold "brand_key" (the catalog brand id) and "place_id"; a
+    missing value clears the key.
+    """
+    sets: dict[str, str] = {}
+    removes: list[str] = []
+    if "brand_key" in fields:
+        if fields["brand_key"]:
+            brand_key = fields["brand_key"]
+            sets.update(brand_key=brand_key, user_brand_key=f"{user_id}#{brand_key}")
+        else:
+            removes.extend(("brand_key", "user_brand_key"))
+    if "place_id" in fields:
+        if fields["place_id"]:
+            sets["user_place_key"] = f"{user_id}#{fields['place_id']}"
+        else:
+            removes.append("user_place_key")
+    return sets, removes
+
+
 def derive_drink_log_id(user_id: str, upload_uuid: str) -> str:
     """Derive a stable ID bound to both the owner and upload UUID."""
     parsed = str(uuid.UUID(upload_uuid))
@@ -399,6 +566,68 @@ def _quota_counter_decrement(table_name: str, key: str, now: str) -> dict[str, A
     }
 
 
+def _stats_keys(fields: Mapping[str, Any]) -> list[str]:
+    """Return the counters one drink log contributes to (month is the UTC month)."""
+    keys = ["total"]
+    if fields.get("brand_key"):
+        keys.append(f"brand#{fields['brand_key']}")
+    elif brand_text_key := _brand_text_key(fields.get("brand_text")):
+        keys.append(f"brand_text#{brand_text_key}")
+    place_id = (fields.get("store") or {}).get("place_id")
+    if place_id:
+        keys.append(f"place#{place_id}")
+    if fields.get("serving_style"):
+        keys.append(f"style#{fields['serving_style']}")
+    if isinstance(fields.get("datetime"), str):
+        keys.append(f"month#{fields['datetime'][:7]}")
+    return keys
+
+
+def _stats_deltas(removed: Iterable[str], added: Iterable[str]) -> dict[str, int]:
+    deltas: dict[str, int] = {}
+    for key in removed:
+        deltas[key] = deltas.get(key, 0) - 1
+    for key in added:
+        deltas[key] = deltas.get(key, 0) + 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _stats_counter_updates(
+    table_name: str,
+    user_id: str,
+    deltas: Mapping[str, int],
+    now: str,
+) -> list[dict[str, Any]]:
+    """Return one ADD per counter item; ADD creates the item on first use."""
+    owner = STATS_OWNER.format(user_id=user_id)
+    return [
+        {
+            "Update": {
+                "TableName": table_name,
+                "Key": {"pk": f"{owner}#{key}"},
+                "UpdateExpression": (
+                    "SET stats_owner = :owner, updated_at = :updated_at ADD #count :delta"
+                ),
+                "ExpressionAttributeNames": {"#count": "count"},
+                "ExpressionAttributeValues": {
+                    ":owner": owner,
+                    ":updated_at": now,
+                    ":delta": delta,
+                },
+            }
+        }
+        for key, delta in deltas.items()
+    ]
+
+
+def _stats_release(table_name: str, item: Mapping[str, Any], now: str) -> list[dict[str, Any]]:
+    """Return the transaction steps that uncount a record, if it was counted."""
+    keys = item.get("stats_keys")
+    if not keys:
+        return []
+    return _stats_counter_updates(table_name, item["user_id"], _stats_deltas(keys, ()), now)
+
+
 def create_upload_url(
     dynamodb: Any,
     s3: Any,
@@ -492,6 +721,7 @@ def _completion_from_analysis(
 ) -> dict[str, Any]:
     brand_text = _candidate_brand(candidate) if candidate_selected else ""
     whiskey_id = None
+    brand_key = None
     if isinstance(candidate, Mapping):
         # The selected candidate is authoritative -- including when it has no
         # match. analyze writes a top-level whiskey_id taken from candidates[0],
@@ -500,6 +730,9 @@ def _completion_from_analysis(
         # "matched": the exact class of confidently-wrong record this design
         # exists to prevent.
         whiskey_id = candidate.get("whiskey_id") or candidate.get("matched_whiskey_id")
+        # The catalog brand id analyze attached, shared by every expression of
+        # the brand. Free-text candidates have none.
+        brand_key = candidate.get("brand_key") if candidate_selected else None
     elif candidate_selected:
         # Legacy analysis items whose candidate is not a Mapping (e.g. a bare
         # string) still rely on the analysis-level value. Those sit in AppState
@@ -507,6 +740,10 @@ def _completion_from_analysis(
         whiskey_id = result.get("whiskey_id") or result.get("matched_whiskey_id")
     if whiskey_id is not None and (not isinstance(whiskey_id, str) or not whiskey_id):
         raise AnalysisConflict("Matched whiskey ID is invalid")
+    if brand_key is not None and (
+        not isinstance(brand_key, str) or not brand_key or len(brand_key) > 100
+    ):
+        raise AnalysisConflict("Catalog brand key is invalid")
     serving_style = result.get("serving_style", "NEAT")
     if serving_style not in SERVING_STYLES:
         raise AnalysisConflict("Analysis serving style is invalid")
@@ -519,6 +756,8 @@ def _completion_from_analysis(
     }
     if whiskey_id:
         completion["whiskey_id"] = whiskey_id
+    if brand_key:
+        completion["brand_key"] = brand_key
     model_id = result.get("model_id")
     confidence = result.get("confidence")
     if isinstance(candidate, Mapping) and candidate.get("confidence") is not None:
@@ -538,6 +777,7 @@ def _completion_from_analysis(
         completion["brand_text"] = overrides["brand_text"]
         completion["brand_source"] = "manual"
         completion.pop("whiskey_id", None)
+        completion.pop("brand_key", None)
     if "serving_style" in overrides:
         completion["serving_style"] = overrides["serving_style"]
     if "store" in overrides:
@@ -617,6 +857,9 @@ def _prepare_initial_record(
         "id": derive_drink_log_id(user_id, upload_uuid),
         "user_id": user_id,
         "status": "pending",
+        # Sparse ReconcileStateIndex key: set while the reconciler may have work on
+        # the record (pending, deleting, or complete with tmp_s3_key still set).
+        "reconcile_state": "pending",
         "datetime": (overrides or {}).get("datetime", now),
         "tmp_s3_key": s3_key,
         "tmp_etag": etag,
@@ -626,6 +869,12 @@ def _prepare_initial_record(
         "created_at": now,
         "updated_at": now,
     }
+    pending["stats_keys"] = _stats_keys({**completion, "datetime": pending["datetime"]})
+    if result.get("normalized_s3_key") == ANALYZED_IMAGE_KEY.format(
+        user_id=user_id,
+        upload_uuid=upload_uuid,
+    ):
+        pending["tmp_normalized_key"] = result["normalized_s3_key"]
     condition = "#user = :user AND s3_key = :s3_key AND #etag = :etag"
     names = {"#user": "user", "#etag": etag_name}
     values = {
@@ -699,6 +948,15 @@ def _initial_create_transaction(
         ),
         dict(consume_analysis),
     ]
+    if pending.get("stats_keys"):
+        transaction.extend(
+            _stats_counter_updates(
+                app_state_table_name,
+                user_id,
+                _stats_deltas((), pending["stats_keys"]),
+                now,
+            )
+        )
     transact_write_with_retry(dynamodb.meta.client, transaction)
 
 
@@ -739,6 +997,7 @@ def _compensate_pending(
                     "drinklog-quota#global",
                     now,
                 ),
+                *_stats_release(app_state_table_name, record, now),
             ],
         )
         return True
@@ -769,6 +1028,129 @@ def _object_absent(s3: Any, bucket_name: str, key: str) -> bool:
     return False
 
 
+def _copy_analyzed_object(
+    s3: Any,
+    *,
+    bucket_name: str,
+    key: str,
+    source_etag: str,
+    source_format: str,
+    final_key: str,
+) -> bool:
+    """Server-side copy one object analyze stored; False if it is unusable.
+
+    An object that is gone or was not made from this exact upload is not
+    copied.
+    """
+    try:
+        head = s3.head_object(Bucket=bucket_name, Key=key)
+        metadata = head.get("Metadata") or {}
+        if (
+            metadata.get("source-etag") != source_etag
+            or metadata.get("source-format") != source_format
+        ):
+            return False
+        s3.copy_object(
+            Bucket=bucket_name,
+            Key=final_key,
+            CopySource={"Bucket": bucket_name, "Key": key},
+            CopySourceIfMatch=head["ETag"],
+            MetadataDirective="REPLACE",
+            ContentType="image/jpeg",
+            CacheControl="private, no-store",
+        )
+    except ClientError as exc:
+        if _is_missing_s3_error(exc) or exc.response.get("Error", {}).get("Code") in {
+            "PreconditionFailed",
+            "412",
+        }:
+            return False
+        raise
+    return True
+
+
+def _promote_analyzed_image(
+    s3: Any,
+    *,
+    bucket_name: str,
+    key: str,
+    source_etag: str,
+    source_format: str,
+    final_key: str,
+) -> dict[str, str] | None:
+    """Copy analyze's normalized JPEG and renditions; return record fields to set.
+
+    Returns None when the full image cannot be reused, in which case the
+    caller normalizes the upload itself. Nothing is read back: a rendition
+    analyze did not store, or that fails to copy, is left out as in
+    _put_renditions.
+    """
+    if not _copy_analyzed_object(
+        s3,
+        bucket_name=bucket_name,
+        key=key,
+        source_etag=source_etag,
+        source_format=source_format,
+        final_key=final_key,
+    ):
+        return None
+    keys: dict[str, str] = {}
+    for name, field in RENDITION_KEY_FIELDS.items():
+        rendition_key = _rendition_key(final_key, name)
+        try:
+            copied = _copy_analyzed_object(
+                s3,
+                bucket_name=bucket_name,
+                key=_rendition_key(key, name),
+                source_etag=source_etag,
+                source_format=source_format,
+                final_key=rendition_key,
+            )
+        except ClientError as exc:
+            get_logger("drink-logs").warning(
+                "Image rendition was not copied", error_type=type(exc).__name__
+            )
+            copied = False
+        if copied:
+            keys[field] = rendition_key
+    return keys
+
+
+def _rendition_key(image_key: str, name: str) -> str:
+    return f"{image_key.removesuffix('.jpg')}.{name}.jpg"
+
+
+def _put_renditions(
+    s3: Any,
+    bucket_name: str,
+    final_key: str,
+    normalized: bytes,
+) -> dict[str, str]:
+    """Store the smaller renditions beside final_key; return record fields to set.
+
+    A rendition failure, in rendering or in S3, leaves the record with only the
+    full image, which clients already fall back to.
+    """
+    keys: dict[str, str] = {}
+    try:
+        for name, body in render_renditions(normalized).items():
+            key = _rendition_key(final_key, name)
+            s3.put_object(
+                Bucket=bucket_name,
+                Key=key,
+                Body=body,
+                ContentType="image/jpeg",
+                CacheControl="private, no-store",
+            )
+            keys[RENDITION_KEY_FIELDS[name]] = key
+    except (ImageNormalizationError, ClientError) as exc:
+        get_logger("drink-logs").warning(
+            "Image renditions were not stored", error_type=type(exc).__name__
+        )
+        return {}
+    return keys
+
+
 def _remove_tmp_reference(
     table: Any,
     record_id: str,
@@ -778,7 +1160,7 @@ def _remove_tmp_reference(
     try:
         response = table.update_item(
             Key={"id": record_id},
-            UpdateExpression="REMOVE tmp_s3_key",
+            UpdateExpression="REMOVE tmp_s3_key, reconcile_state",
             ConditionExpression="#owner = :caller AND #status = :complete AND tmp_s3_key = :tmp",
             ExpressionAttributeNames={"#owner": "user_id", "#status": "status"},
             ExpressionAttributeValues={
@@ -797,6 +1179,7 @@ def _complete_pending_record(
     table: Any,
     record: Mapping[str, Any],
     final_key: str,
+    rendition_keys: Mapping[str, str] | None = None,
 ) -> dict[str, Any] | None:
     completion = record.get("_completion")
     if not isinstance(completion, Mapping):
@@ -812,11 +1195,13 @@ def _complete_pending_record(
         "#completion": "_completion",
         "#content_type": "content_type",
         "#tmp_etag": "tmp_etag",
+        "#tmp_normalized_key": "tmp_normalized_key",
     }
     values: dict[str, Any] = {
         ":caller": record["user_id"],
         ":pending": "pending",
         ":complete": "complete",
+        ":tmp_reference": "tmp",
         ":final_key": final_key,
         ":brand_text": completion["brand_text"],
         ":brand_source": completion["brand_source"],
@@ -826,6 +1211,7 @@ def _complete_pending_record(
     }
     sets = [
         "#status = :complete",
+        "reconcile_state = :tmp_reference",
         "s3_image_key = :final_key",
         "#brand_text = :brand_text",
         "#brand_source = :brand_source",
@@ -838,13 +1224,24 @@ def _complete_pending_record(
             names[f"#{field}"] = field
             values[f":{field}"] = completion[field]
             sets.append(f"#{field} = :{field}")
+    for field, key in (rendition_keys or {}).items():
+        values[f":{field}"] = key
+        sets.append(f"{field} = :{field}")
+    filter_sets, filter_removes = _timeline_filter_keys(
+        record["user_id"],
+        {
+            "brand_key": completion.get("brand_key"),
+            "place_id": completion["store"].get("place_id"),
+        },
+    )
+    for field, value in filter_sets.items():
+        values[f":{field}"] = value
+        sets.append(f"{field} = :{field}")
+    removes = ["#completion", "#content_type", "#tmp_etag", "#tmp_normalized_key", *filter_removes]
     try:
         response = table.update_item(
             Key={"id": record["id"]},
-            UpdateExpression=(
-                f"SET {', '.join(sets)} "
-                "REMOVE #completion, #content_type, #tmp_etag"
-            ),
+            UpdateExpression=f"SET {', '.join(sets)} REMOVE {', '.join(removes)}",
             ConditionExpression="#owner = :caller AND #status = :pending",
             ExpressionAttributeNames=names,
             ExpressionAttributeValues=values,
@@ -870,41 +1267,32 @@ def _finish_pending_create(
     if not isinstance(tmp_key, str) or not isinstance(etag, str) or content_type not in CONTENT_TYPES:
         raise CreateConflict("Pending record is incomplete")
 
-    try:
-        raw = _read_s3_body(s3, bucket_name=bucket_name, key=tmp_key, etag=etag)
-        actual_format = sniff_format(raw[:16])
-        expected_format = CONTENT_TYPES[content_type][0]
-        if actual_format != expected_format:
-            raise ImageNormalizationError("Image bytes do not match the declared content type")
-        normalized = normalize_image(
-            raw,
-            max_bytes=int(os.environ.get("IMAGE_MAX_BYTES", "1572864")),
-        )
-    except ImageNormalizationError as exc:
-        compensated = _compensate_pending(
-            dynamodb,
-            drinklogs_table_name,
-            app_state_table_name,
-            record,
+    expected_format = CONTENT_TYPES[content_type][0]
+    upload_uuid = _extract_upload_uuid(tmp_key, record["user_id"])
+    attempt = uuid.uuid4().hex
+    final_key = f"logs/{record['user_id']}/{upload_uuid}-{attempt}.jpg"
+    analyzed_key = record.get("tmp_normalized_key")
+    rendition_keys = None
+    if isinstance(analyzed_key, str):
+        rendition_keys = _promote_analyzed_image(
+            s3,
+            bucket_name=bucket_name,
+            key=analyzed_key,
+            source_etag=etag,
+            source_format=expected_format,
+            final_key=final_key,
         )
-        winner = _get_record(table, record["id"])
-        if not compensated and winner and winner.get("status") == "complete":
-            return winner
-        if not compensated and winner:
-            raise RuntimeError("Terminal image failure was not compensated") from exc
-        if compensated:
-            try:
-                s3.delete_object(Bucket=bucket_name, Key=tmp_key)
-            except ClientError:
-                # The record no longer references this object. The explicit
-                # tmp/ reconciliation pass will retry this recoverable cleanup.
-                pass
-        raise ValidationError({"image": str(exc)}) from exc
-    except ClientError as exc:
-        if _is_missing_s3_error(exc) or exc.response.get("Error", {}).get("Code") in {
-            "PreconditionFailed",
-            "412",
-        }:
+    if rendition_keys is None:
+        try:
+            raw = _read_s3_body(s3, bucket_name=bucket_name, key=tmp_key, etag=etag)
+            actual_format = sniff_format(raw[:16])
+            if actual_format != expected_format:
+                raise ImageNormalizationError("Image bytes do not match the declared content type")
+            normalized = normalize_image(
+                raw,
+                max_bytes=int(os.environ.get("IMAGE_MAX_BYTES", "1572864")),
+            )
+        except ImageNormalizationError as exc:
             compensated = _compensate_pending(
                 dynamodb,
                 drinklogs_table_name,
@@ -915,27 +1303,50 @@ def _finish_pending_create(
             if not compensated and winner and winner.get("status") == "complete":
                 return winner
             if not compensated and winner:
-                raise RuntimeError("Changed image failure was not compensated") from exc
+                raise RuntimeError("Terminal image failure was not compensated") from exc
             if compensated:
                 try:
                     s3.delete_object(Bucket=bucket_name, Key=tmp_key)
                 except ClientError:
-                    # The tmp/ reconciler owns retry after record compensation.
+                    # The record no longer references this object. The explicit
+                    # tmp/ reconciliation pass will retry this recoverable cleanup.
                     pass
-            raise ValidationError({"image": "Uploaded image is missing or changed"}) from exc
-        raise
+            raise ValidationError({"image": str(exc)}) from exc
+        except ClientError as exc:
+            if _is_missing_s3_error(exc) or exc.response.get("Error", {}).get("Code") in {
+                "PreconditionFailed",
+                "412",
+            }:
+                compensated = _compensate_pending(
+                    dynamodb,
+                    drinklogs_table_name,
+                    app_state_table_name,
+                    record,
+                )
+                winner = _get_record(table, record["id"])
+                if not compensated and winner and winner.get("status") == "complete":
+                    return winner
+                if not compensated and winner:
+                    raise RuntimeError("Changed image failure was not compensated") from exc
+                if compensated:
+                    try:
+                        s3.delete_object(Bucket=bucket_name, Key=tmp_key)
+                    except ClientError:
+                        # The tmp/ reconciler owns retry after record compensation.
+                        pass
+                raise ValidationError({"image": "Uploaded image is missing or changed"}) from exc
+            raise
+
+        s3.put_object(
+            Bucket=bucket_name,
+            Key=final_key,
+            Body=normalized,
+            ContentType="image/jpeg",
+            CacheControl="private, no-store",
+        )
+        rendition_keys = _put_renditions(s3, bucket_name, final_key, normalized)
 
-    upload_uuid = _extract_upload_uuid(tmp_key, record["user_id"])
-    attempt = uuid.uuid4().hex
-    final_key = f"logs/{record['user_id']}/{upload_uuid}-{attempt}.jpg"
-    s3.put_object(
-        Bucket=bucket_name,
-        Key=final_key,
-        Body=normalized,
-        ContentType="image/jpeg",
-        CacheControl="private, no-store",
-    )
-    completed = _complete_pending_record(table, record, final_key)
+    completed = _complete_pending_record(table, record, final_key, rendition_keys)
     if completed is None:
         winner = _get_record(table, record["id"])
         if not winner or winner.get("user_id") != record["user_id"]:
@@ -947,6 +1358,15 @@ def _finish_pending_create(
     s3.delete_object(Bucket=bucket_name, Key=tmp_key)
     if not _object_absent(s3, bucket_name, tmp_key):
         raise RuntimeError("Temporary image deletion was not confirmed")
+    if isinstance(analyzed_key, str):
+        analyzed_keys = [analyzed_key]
+        analyzed_keys += [_rendition_key(analyzed_key, name) for name in RENDITION_KEY_FIELDS]
+        for key in analyzed_keys:
+            try:
+                s3.delete_object(Bucket=bucket_name, Key=key)
+            except ClientError:
+                # Unreferenced tmp/ objects are removed by the tmp/ reconciler.
+                pass
     cleaned = _remove_tmp_reference(table, record["id"], record["user_id"], tmp_key)
     return cleaned or _get_record(table, record["id"]) or completed
 
@@ -1043,27 +1463,94 @@ def create_drink_log(
     ), created
 
 
-def _safe_image_key(item: Mapping[str, Any], user_id: str) -> str | None:
-    key = item.get("s3_image_key")
+def _safe_image_key(
+    item: Mapping[str, Any],
+    user_id: str,
+    field: str = "s3_image_key",
+) -> str | None:
+    key = item.get(field)
     if item.get("status") != "complete" or not isinstance(key, str):
         return None
     return key if key.startswith(f"logs/{user_id}/") else None
 
 
-def _public_record(item: Mapping[str, Any], s3: Any, bucket_name: str, user_id: str) -> dict[str, Any]:
-    result = {key: value for key, value in item.items() if key not in INTERNAL_FIELDS}
+def _presigned_image_url(s3: Any, bucket_name: str, key: str) -> str:
+    return s3.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": bucket_name,
+            "Key": key,
+            "ResponseCacheControl": "private, no-store",
+        },
+        ExpiresIn=PRESIGNED_GET_SECONDS,
+    )
+
+
+_PRESIGNED_URL_CACHE: dict[tuple[str, str, int], str] = {}
+
+
+def _reset_presigned_url_cache() -> None:
+    _PRESIGNED_URL_CACHE.clear()
+
+
+def _presigned_image_urls(s3: Any, bucket_name: str, keys: Iterable[str]) -> dict[str, str]:
+    """Return GET URLs for keys, reusing those signed earlier in the same window.
+
+    Windows are PRESIGNED_GET_SECONDS minus the reuse margin long, so a reused
+    URL always has at least the margin left. One call signs a whole page
+    against a single window, and repeated pages get byte-identical URLs.
+    """
+    window_seconds = PRESIGNED_GET_SECONDS - PRESIGNED_URL_REUSE_MARGIN_SECONDS
+    window = int(_utc_now().timestamp()) // window_seconds
+    urls: dict[str, str] = {}
+    for key in keys:
+        cache_key = (bucket_name, key, window)
+        url = _PRESIGNED_URL_CACHE.get(cache_key)
+        if url is None:
+            url = _presigned_image_url(s3, bucket_name, key)
+            _PRESIGNED_URL_CACHE[cache_key] = url
+        urls[key] = url
+    # Entries are inserted in window order, so stale ones are always first.
+    while _PRESIGNED_URL_CACHE:
+        oldest = next(iter(_PRESIGNED_URL_CACHE))
+        if oldest[2] == window and len(_PRESIGNED_URL_CACHE) <= PRESIGNED_URL_CACHE_MAX_ENTRIES:
+            break
+        del _PRESIGNED_URL_CACHE[oldest]
+    return urls
+
+
+def _image_keys(item: Mapping[str, Any], user_id: str) -> dict[str, str]:
+    """Map each response URL field to the owned S3 key it should sign."""
     image_key = _safe_image_key(item, user_id)
-    if image_key:
-        result["image_url"] = s3.generate_presigned_url(
-            "get_object",
-            Params={
-                "Bucket": bucket_name,
-                "Key": image_key,
-                "ResponseCacheControl": "private, no-store",
-            },
-            ExpiresIn=PRESIGNED_GET_SECONDS,
-        )
-    return result
+    if not image_key:
+        return {}
+    keys = {"image_url": image_key}
+    for name, field in RENDITION_KEY_FIELDS.items():
+        rendition_key = _safe_image_key(item, user_id, field)
+        if rendition_key:
+            keys[RENDITION_URL_FIELDS[name]] = rendition_key
+    return keys
+
+
+def _public_records(
+    items: Iterable[Mapping[str, Any]], s3: Any, bucket_name: str, user_id: str
+) -> list[dict[str, Any]]:
+    records = list(items)
+    image_keys = [_image_keys(item, user_id) for item in records]
+    urls = _presigned_image_urls(
+        s3, bucket_name, [key for keys in image_keys for key in keys.values()]
+    )
+    return [
+        {
+            **{key: value for key, value in item.items() if key not in INTERNAL_FIELDS},
+            **{url_field: urls[key] for url_field, key in keys.items()},
+        }
+        for item, keys in zip(records, image_keys)
+    ]
+
+
+def _public_record(item: Mapping[str, Any], s3: Any, bucket_name: str, user_id: str) -> dict[str, Any]:
+    return _public_records([item], s3, bucket_name, user_id)[0]
 
 
 def get_timeline(
@@ -1077,13 +1564,16 @@ def get_timeline(
     filters: Mapping[str, str],
 ) -> tuple[list[dict[str, Any]], str | None]:
     table = dynamodb.Table(drinklogs_table_name)
-    items: list[dict[str, Any]] = []
+    items: list[Mapping[str, Any]] = []
     cursor = start_key
     next_token: str | None = None
     max_pages = max(1, int(os.environ.get("TIMELINE_MAX_PAGES", str(MAX_TIMELINE_PAGE_QUERIES))))
+    index_name, key_attribute, routed = _timeline_index(filters)
+    partition = user_id if routed is None else f"{user_id}#{filters[routed]}"
+    key_condition, key_names, key_values = _timeline_key_condition(key_attribute, filters)
     for _ in range(max_pages):
-        names = {"#status": "status"}
-        values: dict[str, Any] = {":user_id": user_id, ":complete": "complete"}
+        names = {"#status": "status", **key_names}
+        values: dict[str, Any] = {":partition": partition, ":complete": "complete", **key_values}
         clauses = ["#status = :complete"]
         if "brand" in filters:
             names["#brand"] = "brand_text"
@@ -1093,17 +1583,20 @@ def get_timeline(
             names.update({"#store": "store", "#name": "name"})
             values[":store"] = filters["store"]
             clauses.append("contains(#store.#name, :store)")
-        if "place_id" in filters:
+        if "place_id" in filters and routed != "place_id":
             names.update({"#store": "store", "#place_id": "place_id"})
             values[":place_id"] = filters["place_id"]
             clauses.append("#store.#place_id = :place_id")
+        if "brand_key" in filters and routed != "brand_key":
+            values[":brand_key"] = filters["brand_key"]
+            clauses.append("brand_key = :brand_key")
         kwargs: dict[str, Any] = {
-            "IndexName": "UserDatetimeIndex",
-            "KeyConditionExpression": "user_id = :user_id",
+            "IndexName": index_name,
+            "KeyConditionExpression": key_condition,
             "FilterExpression": " AND ".join(clauses),
             "ExpressionAttributeNames": names,
             "ExpressionAttributeValues": values,
-            "ScanIndexForward": False,
+            "ScanIndexForward": filters.get("order") == "asc",
             "Limit": max(1, limit - len(items)),
         }
         if cursor:
@@ -1111,7 +1604,7 @@ def get_timeline(
         response = table.query(**kwargs)
         for item in response.get("Items", []):
             if item.get("status") == "complete" and item.get("user_id") == user_id:
-                items.append(_public_record(item, s3, bucket_name, user_id))
+                items.append(item)
                 if len(items) == limit:
                     break
         cursor = response.get("LastEvaluatedKey")
@@ -1121,7 +1614,156 @@ def get_timeline(
         next_token = encode_next_token(cursor)
         if len(items) == limit:
             break
-    return items, next_token
+    return _public_records(items, s3, bucket_name, user_id), next_token
+
+
+def _export_lines(table: Any, user_id: str) -> Iterator[bytes]:
+    """Yield the caller's complete drink logs, oldest first, as NDJSON lines."""
+    names = {f"#f{index}": field for index, field in enumerate(EXPORT_FIELDS)}
+    names.update({"#owner": "user_id", "#status": "status"})
+    kwargs: dict[str, Any] = {
+        "IndexName": "UserDatetimeIndex",
+        "KeyConditionExpression": "#owner = :user_id",
+        "FilterExpression": "#status = :complete",
+        "ProjectionExpression": ", ".join(name for name in names if name.startswith("#f")),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": {":user_id": user_id, ":complete": "complete"},
+        "ScanIndexForward": True,
+    }
+    while True:
+        response = table.query(**kwargs)
+        for item in response.get("Items", []):
+            line = json.dumps(item, default=decimal_default, ensure_ascii=False, separators=(",", ":"))
+            yield line.encode("utf-8") + b"\n"
+        if not response.get("LastEvaluatedKey"):
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _upload_stream(
+    s3: Any,
+    bucket_name: str,
+    key: str,
+    chunks: Iterable[bytes],
+    content_type: str,
+) -> tuple[int, int]:
+    """Upload chunks as one object and return (chunk count, byte count).
+
+    Small bodies use a single PUT. Larger ones become a multipart upload of
+    EXPORT_PART_BYTES parts that is aborted if anything fails.
+    """
+    object_args = {"Bucket": bucket_name, "Key": key}
+    buffer = bytearray()
+    parts: list[dict[str, Any]] = []
+    upload_id: str | None = None
+    count = size = 0
+    try:
+        for chunk in chunks:
+            buffer += chunk
+            count += 1
+            size += len(chunk)
+            if len(buffer) < EXPORT_PART_BYTES:
+                continue
+            if upload_id is None:
+                upload_id = s3.create_multipart_upload(
+                    **object_args,
+                    ContentType=content_type,
+                    CacheControl="private, no-store",
+                )["UploadId"]
+            part = s3.upload_part(
+                **object_args,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=bytes(buffer),
+            )
+            parts.append({"ETag": part["ETag"], "PartNumber": len(parts) + 1})
+            buffer.clear()
+        if upload_id is None:
+            s3.put_object(
+                **object_args,
+                Body=bytes(buffer),
+                ContentType=content_type,
+                CacheControl="private, no-store",
+            )
+            return count, size
+        if buffer:
+            part = s3.upload_part(
+                **object_args,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=bytes(buffer),
+            )
+            parts.append({"ETag": part["ETag"], "PartNumber": len(parts) + 1})
+        s3.complete_multipart_upload(
+            **object_args,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        if upload_id is not None:
+            # The lifecycle rule on exports/ also aborts leftovers after a day.
+            s3.abort_multipart_upload(**object_args, UploadId=upload_id)
+        raise
+    return count, size
+
+
+def export_drink_logs(
+    dynamodb: Any,
+    s3: Any,
+    drinklogs_table_name: str,
+    app_state_table_name: str,
+    bucket_name: str,
+    user_id: str,
+) -> dict[str, Any]:
+    now_dt = _utc_now()
+    now = _rfc3339(now_dt)
+    utc_date = now_dt.strftime("%Y-%m-%d")
+    client = dynamodb.meta.client
+    try:
+        transact_write_with_retry(
+            client,
+            [
+                _rate_counter_update(
+                    app_state_table_name,
+                    f"drinklog-counter#export#user#{user_id}#{utc_date}",
+                    int(os.environ.get("EXPORT_USER_DAILY_LIMIT", "5")),
+                    int((now_dt + timedelta(days=2)).timestamp()),
+                    now,
+                )
+            ],
+        )
+    except client.exceptions.TransactionCanceledException as exc:
+        reasons = exc.response.get("CancellationReasons", [])
+        if any(reason.get("Code") == "ConditionalCheckFailed" for reason in reasons):
+            raise RateLimitExceeded from exc
+        if _is_transaction_conflict_only(reasons):
+            raise TransientConflict from exc
+        raise
+
+    key = EXPORT_KEY.format(user_id=user_id, export_id=uuid.uuid4())
+    count, size = _upload_stream(
+        s3,
+        bucket_name,
+        key,
+        _export_lines(dynamodb.Table(drinklogs_table_name), user_id),
+        "application/x-ndjson",
+    )
+    filename = f"drink-logs-{now_dt.strftime('%Y%m%d')}.ndjson"
+    download_url = s3.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": bucket_name,
+            "Key": key,
+            "ResponseContentDisposition": f'attachment; filename="{filename}"',
+        },
+        ExpiresIn=PRESIGNED_GET_SECONDS,
+    )
+    return {
+        "download_url": download_url,
+        "expires_in": PRESIGNED_GET_SECONDS,
+        "count": count,
+        "bytes": size,
+    }
 
 
 def get_owned_drink_log(
@@ -1137,12 +1779,74 @@ def get_owned_drink_log(
     return _public_record(item, s3, bucket_name, user_id)
 
 
-def update_drink_log(
+def get_drink_log_stats(dynamodb: Any, app_state_table_name: str, user_id: str) -> dict[str, Any]:
+    """Return the caller's counters, listed from StatsOwnerIndex.
+
+    The index is eventually consistent, so a count may trail the latest write
+    by a moment.
+    """
+    owner = STATS_OWNER.format(user_id=user_id)
+    table = dynamodb.Table(app_state_table_name)
+    kwargs: dict[str, Any] = {
+        "IndexName": STATS_INDEX,
+        "KeyConditionExpression": "stats_owner = :owner",
+        # Counters that fell to zero after edits or deletes stay behind as 0.
+        "FilterExpression": "#count > :zero",
+        "ExpressionAttributeNames": {"#count": "count"},
+        "ExpressionAttributeValues": {":owner": owner, ":zero": 0},
+    }
+    counters: dict[str, int] = {}
+    while True:
+        response = table.query(**kwargs)
+        for item in response.get("Items", []):
+            counters[item["pk"].removeprefix(f"{owner}#")] = int(item["count"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    groups: dict[str, dict[str, int]] = {group: {} for group in STATS_GROUPS.values()}
+    for counter, count in counters.items():
+        prefix, separator, value = counter.partition("#")
+        group = STATS_GROUPS.get(prefix)
+        if separator and group:
+            groups[group][value] = count
+    stats: dict[str, Any] = {"total": counters.get("total", 0)}
+    for group, counts in groups.items():
+        order = (lambda entry: entry[0]) if group == "months" else (lambda entry: (-entry[1], entry[0]))
+        stats[group] = dict(sorted(counts.items(), key=order))
+    return stats
+
+
+def _update_owned_record(
     table: Any,
+    record_id: str,
+    expression: str,
+    condition: str,
+    names: Mapping[str, str],
+    values: Mapping[str, Any],
+) -> dict[str, Any] | None:
+    try:
+        response = table.update_item(
+            Key={"id": record_id},
+            UpdateExpression=expression,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_NEW",
+        )
+        return response.get("Attributes")
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return None
+
+
+def update_drink_log(
+    dynamodb: Any,
+    drinklogs_table_name: str,
+    app_state_table_name: str,
     user_id: str,
     record_id: str,
     data: Mapping[str, Any],
 ) -> dict[str, Any] | None:
+    table = dynamodb.Table(drinklogs_table_name)
     names = {"#owner": "user_id", "#status": "status", "#updated_at": "updated_at"}
     values: dict[str, Any] = {
         ":caller": user_id,
@@ -1177,21 +1881,95 @@ def update_drink_log(
             else:
                 values[":place_id"] = store["place_id"]
                 sets.append("#store.#place_id = :place_id")
-    expression = f"SET {', '.join(sets)}"
-    if removes:
-        expression += f" REMOVE {', '.join(removes)}"
-    try:
-        response = table.update_item(
-            Key={"id": record_id},
-            UpdateExpression=expression,
-            ConditionExpression="#owner = :caller AND #status = :complete",
-            ExpressionAttributeNames=names,
-            ExpressionAttributeValues=values,
-            ReturnValues="ALL_NEW",
-        )
-        return response.get("Attributes")
-    except table.meta.client.exceptions.ConditionalCheckFailedException:
-        return None
+    filter_fields: dict[str, Any] = {}
+    if "brand_text" in data:
+        # A hand-typed name no longer names the catalog brand it was matched to.
+        filter_fields["brand_key"] = None
+    if "place_id" in data.get("store", {}):
+        filter_fields["place_id"] = data["store"]["place_id"]
+    filter_sets, filter_removes = _timeline_filter_keys(user_id, filter_fields)
+    for field, value in filter_sets.items():
+        values[f":{field}"] = value
+        sets.append(f"{field} = :{field}")
+    removes.extend(filter_removes)
+    remove_clause = f" REMOVE {', '.join(removes)}" if removes else ""
+    expression = f"SET {', '.join(sets)}{remove_clause}"
+    condition = "#owner = :caller AND #status = :complete"
+    if not ({"brand_text", "serving_style"} & set(data) or "place_id" in data.get("store", {})):
+        return _update_owned_record(table, record_id, expression, condition, names, values)
+
+    # The edit may move the record between stats counters, so read the counted
+    # keys and swap them in one transaction guarded on those same keys.
+    client = dynamodb.meta.client
+    for _attempt in range(MAX_STATS_UPDATE_ATTEMPTS):
+        current = _get_record(table, record_id)
+        if not current or current.get("user_id") != user_id or current.get("status") != "complete":
+            return None
+        previous = current.get("stats_keys")
+        if not isinstance(previous, list):
+            # Records created before stats existed were never counted.
+            return _update_owned_record(
+                table,
+                record_id,
+                expression,
+                f"{condition} AND attribute_not_exists(stats_keys)",
+                names,
+                values,
+            )
+        store = dict(current.get("store") or {})
+        if "place_id" in data.get("store", {}):
+            store["place_id"] = data["store"]["place_id"]
+        edited = {field: data[field] for field in ("brand_text", "serving_style") if field in data}
+        if "brand_text" in data:
+            edited["brand_key"] = None
+        stats_keys = _stats_keys({**current, **edited, "store": store})
+        guarded_values = {**values, ":stats_keys": stats_keys, ":previous_stats_keys": previous}
+        guarded_expression = f"SET {', '.join(sets)}, stats_keys = :stats_keys{remove_clause}"
+        guarded_condition = f"{condition} AND stats_keys = :previous_stats_keys"
+        deltas = _stats_deltas(previous, stats_keys)
+        if not deltas:
+            updated = _update_owned_record(
+                table,
+                record_id,
+                guarded_expression,
+                guarded_condition,
+                names,
+                guarded_values,
+            )
+            if updated is not None:
+                return updated
+            continue
+        try:
+            transact_write_with_retry(
+                client,
+                [
+                    {
+                        "Update": {
+                            "TableName": drinklogs_table_name,
+                            "Key": {"id": record_id},
+                            "UpdateExpression": guarded_expression,
+                            "ConditionExpression": guarded_condition,
+                            "ExpressionAttributeNames": names,
+                            "ExpressionAttributeValues": guarded_values,
+                        }
+                    },
+                    *_stats_counter_updates(
+                        app_state_table_name,
+                        user_id,
+                        deltas,
+                        values[":updated_at"],
+                    ),
+                ],
+            )
+        except client.exceptions.TransactionCanceledException as exc:
+            reasons = exc.response.get("CancellationReasons", [])
+            if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                continue
+            if _is_transaction_conflict_only(reasons):
+                raise TransientConflict from exc
+            raise
+        return _get_record(table, record_id)
+    raise TransientConflict
 
 
 def _finalize_delete(
@@ -1227,6 +2005,7 @@ def _finalize_delete(
                     now,
                 ),
                 _quota_counter_decrement(app_state_table_name, "drinklog-quota#global", now),
+                *_stats_release(app_state_table_name, item, now),
             ]
         )
     try:
@@ -1252,8 +2031,9 @@ def delete_drink_log(
         response = table.update_item(
             Key={"id": record_id},
             UpdateExpression=(
-                "SET #status = :deleting, "
-                "delete_started_at = if_not_exists(delete_started_at, :started_at)"
+                "SET #status = :deleting, reconcile_state = :deleting, "
+                "delete_started_at = if_not_exists(delete_started_at, :started_at) "
+                "REMOVE user_brand_key, user_place_key"
             ),
             ConditionExpression=(
                 "#owner = :caller AND (#status = :complete OR #status = :deleting)"
@@ -1272,13 +2052,14 @@ def delete_drink_log(
     item = response.get("Attributes")
     if not item:
         raise RuntimeError("Deleting record was not returned")
-    key = item.get("s3_image_key")
-    if isinstance(key, str) and key.startswith(f"logs/{user_id}/"):
-        s3.delete_object(Bucket=bucket_name, Key=key)
-        if not _object_absent(s3, bucket_name, key):
-            raise RuntimeError("Drink log image deletion was not confirmed")
-    elif key:
-        raise RuntimeError("Refusing to delete an image outside the owner prefix")
+    for field in ("s3_image_key", *RENDITION_KEY_FIELDS.values()):
+        key = item.get(field)
+        if isinstance(key, str) and key.startswith(f"logs/{user_id}/"):
+            s3.delete_object(Bucket=bucket_name, Key=key)
+            if not _object_absent(s3, bucket_name, key):
+                raise RuntimeError("Drink log image deletion was not confirmed")
+        elif key:
+            raise RuntimeError("Refusing to delete an image outside the owner prefix")
     return _finalize_delete(dynamodb, drinklogs_table_name, app_state_table_name, item)
 
 
@@ -1409,11 +2190,16 @@ def _handle_update(context: _RouteContext) -> _RouteResult:
         lambda: validate_update_input(_parse_json_body(context.event)),
         _VALIDATION_ERRORS,
     )
-    record = update_drink_log(
-        context.table,
-        context.user_id,
-        context.record_id,
-        data,
+    record = _invoke_route_step(
+        lambda: update_drink_log(
+            context.dynamodb,
+            context.drinklogs_table_name,
+            context.app_state_table_name,
+            context.user_id,
+            context.record_id,
+            data,
+        ),
+        (TransientConflict,),
     )
     if not record:
         return 404, {"error": "Drink log not found"}
@@ -1428,6 +2214,29 @@ def _handle_update(context: _RouteContext) -> _RouteResult:
     )
 
 
+def _handle_export(context: _RouteContext) -> _RouteResult:
+    result = _invoke_route_step(
+        lambda: export_drink_logs(
+            context.dynamodb,
+            context.s3,
+            context.drinklogs_table_name,
+            context.app_state_table_name,
+            context.bucket_name,
+            context.user_id,
+        ),
+        _UPLOAD_ERRORS,
+    )
+    return 200, result
+
+
+def _handle_stats(context: _RouteContext) -> _RouteResult:
+    return 200, get_drink_log_stats(
+        context.dynamodb,
+        context.app_state_table_name,
+        context.user_id,
+    )
+
+
 def _handle_delete(context: _RouteContext) -> _RouteResult:
     deleted = delete_drink_log(
         context.dynamodb,
@@ -1448,6 +2257,8 @@ _ROUTE_DISPATCH: dict[_RouteKey, _RouteHandler] = {
     ("POST", "collection"): _handle_create,
     ("GET", "record"): _handle_detail,
     ("GET", "collection"): _handle_timeline,
+    ("GET", "stats"): _handle_stats,
+    ("POST", "export"): _handle_export,
     ("PUT", "record"): _handle_update,
     ("DELETE", "record"): _handle_delete,
 }
@@ -1456,6 +2267,10 @@ _ROUTE_DISPATCH: dict[_RouteKey, _RouteHandler] = {
 def _route_key(method: str, path: str, record_id: Any) -> _RouteKey:
     if method == "POST" and path.endswith("/upload-url"):
         return method, "upload-url"
+    if path.endswith("/stats"):
+        return method, "stats"
+    if path.endswith("/export"):
+        return method, "export"
     return method, "record" if record_id else "collection"
 
 
@@ -1464,11 +2279,11 @@ def _validation_error(exc: Exception, _route: _RouteKey) -> _RouteResult:
 
 
 def _rate_limit_error(_exc: Exception, route: _RouteKey) -> _RouteResult:
-    message = (
-        "Daily upload limit exceeded"
-        if route == ("POST", "upload-url")
-        else "Daily create or storage limit exceeded"
-    )
+    messages = {
+        ("POST", "upload-url"): "Daily upload limit exceeded",
+        ("POST", "export"): "Daily export limit exceeded",
+    }
+    message = messages.get(route, "Daily create or storage limit exceeded")
     return 429, {"error": message}
 
 
@@ -27,8 +27,22 @@ except ModuleNotFoundError as exc:
 
 NAMESPACE_DRINKLOG = uuid.UUID("7df1920f-5929-51ee-9860-164c1d4bc388")
 UUID_TEXT = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-5][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}"
-LOG_KEY_RE = re.compile(rf"^logs/([^/]+)/({UUID_TEXT})-[0-9a-fA-F]+\.jpg$")
+# Full image logs/{user}/{uuid}-{attempt}.jpg plus its .display/.thumbnail renditions.
+LOG_KEY_RE = re.compile(
+    rf"^logs/([^/]+)/({UUID_TEXT})-[0-9a-fA-F]+(?:\.(?:display|thumbnail))?\.jpg$"
+)
+# Uploads tmp/{user}/{uuid}.{ext} and the analyzed image and renditions written
+# beside them.
+TMP_KEY_RE = re.compile(
+    rf"^tmp/([^/]+)/({UUID_TEXT})\."
+    r"(?:jpg|jpeg|png|webp|analyzed(?:\.(?:display|thumbnail))?\.jpg)$"
+)
+IMAGE_KEY_FIELDS = ("s3_image_key", "s3_display_key", "s3_thumbnail_key")
+TMP_KEY_FIELDS = ("tmp_s3_key", "tmp_normalized_key")
 MAX_BATCH_GET_ATTEMPTS = 3
+# Sparse GSI over reconcile_state (pending / deleting / tmp) and updated_at. Only
+# records the reconciler may act on carry the key, so queries scale with backlog.
+RECONCILE_INDEX = "ReconcileStateIndex"
 
 
 def _utc_now() -> datetime:
@@ -73,18 +87,48 @@ def _object_is_old(item: Mapping[str, Any], cutoff: datetime) -> bool:
     return timestamp is not None and timestamp < cutoff
 
 
-def _scan_all(table: Any, **kwargs: Any) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
-    cursor = None
+def _query_backlog(table: Any, state: str, cutoff: datetime) -> list[str]:
+    """Return ids the reconcile index lists under state with updated_at before cutoff.
+
+    The bound is rounded up to the next whole second so stored timestamps of any
+    fractional precision compare as a superset; callers re-check age exactly.
+    """
+    bound = (cutoff + timedelta(seconds=1)).astimezone(timezone.utc)
+    request: dict[str, Any] = {
+        "IndexName": RECONCILE_INDEX,
+        "KeyConditionExpression": "reconcile_state = :state AND updated_at < :cutoff",
+        "ExpressionAttributeValues": {
+            ":state": state,
+            ":cutoff": bound.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+    }
+    record_ids: list[str] = []
     while True:
-        request = dict(kwargs)
-        if cursor:
-            request["ExclusiveStartKey"] = cursor
-        response = table.scan(**request)
-        items.extend(response.get("Items", []))
+        response = table.query(**request)
+        record_ids.extend(item["id"] for item in response.get("Items", []))
         cursor = response.get("LastEvaluatedKey")
         if not cursor:
-            return items
+            return record_ids
+        request["ExclusiveStartKey"] = cursor
+
+
+def _backlog_records(
+    dynamodb: Any,
+    table_name: str,
+    state: str,
+    status: str,
+    cutoff: datetime,
+) -> list[dict[str, Any]]:
+    """Consistently read indexed candidates; the index itself is eventually consistent."""
+    record_ids = _query_backlog(dynamodb.Table(table_name), state, cutoff)
+    records = _batch_get_records(dynamodb, table_name, record_ids)
+    return [
+        records[record_id]
+        for record_id in dict.fromkeys(record_ids)
+        if record_id in records
+        and records[record_id].get("status") == status
+        and _record_is_old(records[record_id], cutoff)
+    ]
 
 
 def _list_all_objects(s3: Any, bucket_name: str, prefix: str) -> list[dict[str, Any]]:
@@ -155,6 +199,29 @@ def _quota_counter_decrement(table_name: str, key: str, now: str) -> dict[str, A
     }
 
 
+def _stats_release(table_name: str, item: Mapping[str, Any], now: str) -> list[dict[str, Any]]:
+    """Uncount a record from its drinklog-stats#user counter items (see drink-logs)."""
+    owner = f"drinklog-stats#user#{item['user_id']}"
+    return [
+        {
+            "Update": {
+                "TableName": table_name,
+                "Key": {"pk": f"{owner}#{key}"},
+                "UpdateExpression": (
+                    "SET stats_owner = :owner, updated_at = :updated_at ADD #count :minus_one"
+                ),
+                "ExpressionAttributeNames": {"#count": "count"},
+                "ExpressionAttributeValues": {
+                    ":owner": owner,
+                    ":updated_at": now,
+                    ":minus_one": -1,
+                },
+            }
+        }
+        for key in dict.fromkeys(item.get("stats_keys") or ())
+    ]
+
+
 def _get_record(table: Any, record_id: str) -> dict[str, Any] | None:
     return table.get_item(Key={"id": record_id}, ConsistentRead=True).get("Item")
 
@@ -163,7 +230,7 @@ def _acquire_pending(table: Any, item: Mapping[str, Any]) -> dict[str, Any] | No
     try:
         response = table.update_item(
             Key={"id": item["id"]},
-            UpdateExpression="SET #status = :deleting",
+            UpdateExpression="SET #status = :deleting, reconcile_state = :deleting",
             ConditionExpression="#status = :pending AND #owner = :owner",
             ExpressionAttributeNames={"#status": "status", "#owner": "user_id"},
             ExpressionAttributeValues={
@@ -190,6 +257,7 @@ def _create_tombstone(
         "id": record_id,
         "user_id": user_id,
         "status": "deleting",
+        "reconcile_state": "deleting",
         "datetime": _rfc3339(timestamp),
         "s3_image_key": key,
         "quota_allocated": False,
@@ -235,6 +303,7 @@ def _finalize_deleting(
                     now,
                 ),
                 _quota_counter_decrement(app_state_table_name, "drinklog-quota#global", now),
+                *_stats_release(app_state_table_name, item, now),
             ]
         )
     client = dynamodb.meta.client
@@ -247,13 +316,15 @@ def _finalize_deleting(
         raise RuntimeError("Deleting record transaction did not converge")
 
 
+def _record_image_keys(item: Mapping[str, Any]) -> set[Any]:
+    return {item[field] for field in IMAGE_KEY_FIELDS if item.get(field)}
+
+
 def _delete_record_image(s3: Any, bucket_name: str, item: Mapping[str, Any]) -> None:
-    key = item.get("s3_image_key")
-    if not key:
-        return
-    if not isinstance(key, str) or not key.startswith(f"logs/{item['user_id']}/"):
-        raise RuntimeError("Refusing to reconcile an image outside its owner prefix")
-    _delete_and_confirm(s3, bucket_name, key)
+    for key in _record_image_keys(item):
+        if not isinstance(key, str) or not key.startswith(f"logs/{item['user_id']}/"):
+            raise RuntimeError("Refusing to reconcile an image outside its owner prefix")
+        _delete_and_confirm(s3, bucket_name, key)
 
 
 def reconcile_log_objects(
@@ -289,7 +360,7 @@ def reconcile_log_objects(
         if record and record.get("user_id") != user_id:
             continue
         if record and record.get("status") == "complete":
-            if record.get("s3_image_key") == key:
+            if key in _record_image_keys(record):
                 continue
             _delete_and_confirm(s3, bucket_name, key)
             deleted += 1
@@ -300,7 +371,7 @@ def reconcile_log_objects(
                 current = _get_record(table, record_id)
                 if not current or current.get("user_id") != user_id:
                     continue
-                if current.get("status") == "complete" and current.get("s3_image_key") == key:
+                if current.get("status") == "complete" and key in _record_image_keys(current):
                     continue
                 if current.get("status") not in {"complete", "deleting"}:
                     continue
@@ -322,7 +393,7 @@ def reconcile_log_objects(
             current = _get_record(table, record_id)
             if not current or current.get("user_id") != user_id:
                 continue
-            if current.get("status") == "complete" and current.get("s3_image_key") == key:
+            if current.get("status") == "complete" and key in _record_image_keys(current):
                 continue
             if current.get("status") not in {"complete", "deleting"}:
                 continue
@@ -339,18 +410,9 @@ def reconcile_deleting_records(
     bucket_name: str,
     cutoff: datetime,
 ) -> int:
-    table = dynamodb.Table(drinklogs_table_name)
-    records = _scan_all(
-        table,
-        ConsistentRead=True,
-        FilterExpression="#status = :deleting",
-        ExpressionAttributeNames={"#status": "status"},
-        ExpressionAttributeValues={":deleting": "deleting"},
-    )
+    records = _backlog_records(dynamodb, drinklogs_table_name, "deleting", "deleting", cutoff)
     completed = 0
     for item in records:
-        if not _record_is_old(item, cutoff):
-            continue
         _delete_record_image(s3, bucket_name, item)
         if _finalize_deleting(dynamodb, drinklogs_table_name, app_state_table_name, item):
             completed += 1
@@ -366,17 +428,9 @@ def reconcile_pending_records(
     cutoff: datetime,
 ) -> int:
     table = dynamodb.Table(drinklogs_table_name)
-    records = _scan_all(
-        table,
-        ConsistentRead=True,
-        FilterExpression="#status = :pending",
-        ExpressionAttributeNames={"#status": "status"},
-        ExpressionAttributeValues={":pending": "pending"},
-    )
+    records = _backlog_records(dynamodb, drinklogs_table_name, "pending", "pending", cutoff)
     completed = 0
     for item in records:
-        if not _record_is_old(item, cutoff):
-            continue
         acquired = _acquire_pending(table, item)
         if not acquired:
             continue
@@ -386,6 +440,17 @@ def reconcile_pending_records(
     return completed
 
 
+def _tmp_references(record: dict[str, Any]) -> set[str]:
+    """Return the tmp/ keys a record still needs, including analyzed renditions."""
+    keys = {record.get(field) for field in TMP_KEY_FIELDS}
+    analyzed = record.get("tmp_normalized_key")
+    if isinstance(analyzed, str):
+        keys.update(
+            f"{analyzed.removesuffix('.jpg')}.{name}.jpg" for name in ("display", "thumbnail")
+        )
+    return {key for key in keys if isinstance(key, str)}
+
+
 def reconcile_tmp_objects(
     dynamodb: Any,
     s3: Any,
@@ -393,21 +458,24 @@ def reconcile_tmp_objects(
     bucket_name: str,
     cutoff: datetime,
 ) -> int:
-    table = dynamodb.Table(drinklogs_table_name)
-    records = _scan_all(
-        table,
-        ConsistentRead=True,
-        ProjectionExpression="id, tmp_s3_key",
-    )
-    referenced = {
-        item["tmp_s3_key"]
-        for item in records
-        if isinstance(item.get("tmp_s3_key"), str)
-    }
+    objects = [
+        obj
+        for obj in _list_all_objects(s3, bucket_name, "tmp/")
+        if isinstance(obj.get("Key"), str) and _object_is_old(obj, cutoff)
+    ]
+    # Only the record derived from the upload UUID can reference a tmp/ object,
+    # so reading those ids replaces a scan of every record.
+    owners: dict[str, str] = {}
+    for obj in objects:
+        match = TMP_KEY_RE.fullmatch(obj["Key"])
+        if match:
+            owners[obj["Key"]] = _derive_id(*match.groups())
+    records = _batch_get_records(dynamodb, drinklogs_table_name, owners.values())
     deleted = 0
-    for obj in _list_all_objects(s3, bucket_name, "tmp/"):
-        key = obj.get("Key")
-        if not isinstance(key, str) or key in referenced or not _object_is_old(obj, cutoff):
+    for obj in objects:
+        key = obj["Key"]
+        record = records.get(owners.get(key, ""))
+        if record and key in _tmp_references(record):
             continue
         _delete_and_confirm(s3, bucket_name, key)
         deleted += 1
@@ -422,17 +490,9 @@ def reconcile_complete_tmp_references(
     cutoff: datetime,
 ) -> int:
     table = dynamodb.Table(drinklogs_table_name)
-    records = _scan_all(
-        table,
-        ConsistentRead=True,
-        FilterExpression="#status = :complete AND attribute_exists(tmp_s3_key)",
-        ExpressionAttributeNames={"#status": "status"},
-        ExpressionAttributeValues={":complete": "complete"},
-    )
+    records = _backlog_records(dynamodb, drinklogs_table_name, "tmp", "complete", cutoff)
     cleaned = 0
     for item in records:
-        if not _record_is_old(item, cutoff):
-            continue
         key = item.get("tmp_s3_key")
         if not isinstance(key, str) or not key.startswith(f"tmp/{item['user_id']}/"):
             continue
@@ -440,7 +500,7 @@ def reconcile_complete_tmp_references(
         try:
             table.update_item(
                 Key={"id": item["id"]},
-                UpdateExpression="REMOVE tmp_s3_key",
+                UpdateExpression="REMOVE tmp_s3_key, reconcile_state",
                 ConditionExpression="#status = :complete AND tmp_s3_key = :key",
                 ExpressionAttributeNames={"#status": "status"},
                 ExpressionAttributeValues={":complete": "complete", ":key": key},
@@ -3,6 +3,7 @@
 import os
 import sys
 import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -42,6 +43,16 @@ def transform_whiskey_item(item: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _scan_budget(dynamodb: Any) -> Callable[[], None]:
+    """Charge each DynamoDB scan page to the shared daily search budget."""
+    return lambda: consume_scan_budget(
+        dynamodb,
+        os.environ["APP_STATE_TABLE"],
+        "search",
+        int(os.environ.get("PUBLIC_SCAN_DAILY_LIMIT", "10000")),
+    )
+
+
 def handle_search_endpoint(query_params: dict[str, Any], logger: Any) -> dict[str, Any]:
     query = query_params.get("q", "").strip()
     try:
@@ -56,15 +67,10 @@ def handle_search_endpoint(query_params: dict[str, Any], logger: Any) -> dict[st
         query,
         limit=limit,
         next_token=query_params.get("next_token"),
-        before_page=lambda: consume_scan_budget(
-            dynamodb,
-            os.environ["APP_STATE_TABLE"],
-            "search",
-            int(os.environ.get("PUBLIC_SCAN_DAILY_LIMIT", "10000")),
-        ),
+        before_page=_scan_budget(dynamodb),
     )
+    # Results arrive relevance-ranked from the service; keep that order.
     whiskeys = [transform_whiskey_item(item) for item in raw_results]
-    whiskeys.sort(key=lambda item: item.get("name", ""))
     logger.debug("Search completed", result_count=len(whiskeys))
     return {
         "whiskeys": whiskeys,
@@ -75,6 +81,32 @@ def handle_search_endpoint(query_params: dict[str, Any], logger: Any) -> dict[st
     }
 
 
+def handle_suggest_endpoint(query_params: dict[str, Any], logger: Any) -> dict[str, Any]:
+    query = query_params.get("q", "").strip()
+    try:
+        limit = int(query_params.get("limit", 10))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("limit must be an integer") from exc
+    if not 1 <= limit <= 20:
+        raise ValueError("limit must be from 1 to 20")
+
+    # A warm index answers without DynamoDB; only a cold build or the
+    # oversized-catalog scan fallback is charged to the search budget.
+    dynamodb = get_dynamodb_resource()
+    raw_results = WhiskeySearchService(dynamodb).suggest_whiskeys(
+        query,
+        limit=limit,
+        before_page=_scan_budget(dynamodb),
+    )
+    whiskeys = [transform_whiskey_item(item) for item in raw_results]
+    logger.debug("Suggest completed", result_count=len(whiskeys))
+    return {"whiskeys": whiskeys, "count": len(whiskeys), "query": query}
+
+
+def _is_suggest_path(path: str) -> bool:
+    return path.rstrip("/").endswith("/suggest")
+
+
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     start_time = time.monotonic()
     request_id = (
@@ -91,7 +123,10 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     headers = get_cors_headers(event)
     try:
         query_params = event.get("queryStringParameters") or {}
-        body = handle_search_endpoint(query_params, logger)
+        if _is_suggest_path(event.get("path") or ""):
+            body = handle_suggest_endpoint(query_params, logger)
+        else:
+            body = handle_search_endpoint(query_params, logger)
         return create_response(200, body, headers, start_time=start_time, logger=logger)
     except ValueError as exc:
         return create_response(400, {"error": str(exc)}, headers, start_time=start_time, logger=logger)
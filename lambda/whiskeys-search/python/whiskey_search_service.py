@@ -2,26 +2,105 @@
 
 import os
 import sys
+import threading
+import time
 from collections.abc import Callable
+from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
 from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import BotoCoreError, ClientError
 
 try:
+    from whiskey_common.catalog_version import read_catalog_version
     from whiskey_common.clients import get_dynamodb_resource
     from whiskey_common.logger import get_logger
-    from whiskey_common.normalize import normalize_text
+    from whiskey_common.normalize import cached_normalize_text
     from whiskey_common.scan_utils import decode_next_token, encode_next_token
+    from whiskey_common.search_index import (
+        DOCUMENT_FIELDS,
+        SearchIndex,
+        load_artifact,
+        rank_documents,
+    )
 except ModuleNotFoundError as exc:
     if exc.name != "whiskey_common":
         raise
     sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "common" / "python"))
+    from whiskey_common.catalog_version import read_catalog_version
     from whiskey_common.clients import get_dynamodb_resource
     from whiskey_common.logger import get_logger
-    from whiskey_common.normalize import normalize_text
+    from whiskey_common.normalize import cached_normalize_text
     from whiskey_common.scan_utils import decode_next_token, encode_next_token
+    from whiskey_common.search_index import (
+        DOCUMENT_FIELDS,
+        SearchIndex,
+        load_artifact,
+        rank_documents,
+    )
+
+
+SEARCH_INDEX_TTL_SECONDS = 900
+SEARCH_INDEX_MAX_ITEMS = 50_000
+SEARCH_INDEX_MAX_PAGES = 100
+# Written by scripts/build_search_index.py and shipped in the Lambda bundle.
+SEARCH_INDEX_ARTIFACT_PATH = Path(__file__).resolve().parents[1] / "search-index.idx"
+
+_SEARCH_INDEX_LOCK = threading.Lock()
+_SEARCH_INDEX_CACHE: dict[str, Any] | None = None
+
+
+def _reset_search_index() -> None:
+    """Clear the module-level search index cache for tests."""
+    global _SEARCH_INDEX_CACHE
+    with _SEARCH_INDEX_LOCK:
+        _SEARCH_INDEX_CACHE = None
+
+
+def _load_search_index_artifact(path: Path | None = None) -> dict[str, Any] | None:
+    """Load and verify the bundled index artifact, or None when unusable."""
+    path = path or Path(os.environ.get("SEARCH_INDEX_ARTIFACT", str(SEARCH_INDEX_ARTIFACT_PATH)))
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    try:
+        index, header = load_artifact(data)
+    except (KeyError, TypeError, ValueError) as exc:
+        get_logger(function_name="whiskey-search-service").warning(
+            "Search index artifact rejected",
+            path=str(path),
+            error=str(exc),
+        )
+        return None
+    return {"index": index, "header": header}
+
+
+# Loaded at import so the cost lands in the init phase, not the first request.
+_SEARCH_INDEX_ARTIFACT = _load_search_index_artifact()
+
+
+def _search_index_enabled() -> bool:
+    return os.environ.get("SEARCH_INDEX_ENABLED", "1") != "0"
+
+
+def _cached_search_index(table_name: str) -> dict[str, Any] | None:
+    cached = _SEARCH_INDEX_CACHE
+    if (
+        cached is not None
+        and cached["table_name"] == table_name
+        and cached["expires_at"] > time.monotonic()
+    ):
+        return cached
+    return None
+
+
+def _search_index_expires_at() -> float:
+    return time.monotonic() + int(
+        os.environ.get("SEARCH_INDEX_TTL_SECONDS", str(SEARCH_INDEX_TTL_SECONDS))
+    )
 
 
 class WhiskeySearchService:
@@ -30,6 +109,7 @@ class WhiskeySearchService:
     def __init__(self, dynamodb: Any | None = None):
         environment = os.getenv("ENVIRONMENT", "dev")
         self.whiskey_table_name = os.getenv("WHISKEY_SEARCH_TABLE", f"WhiskeySearch-{environment}")
+        self.app_state_table_name = os.getenv("APP_STATE_TABLE")
         self.logger = get_logger(function_name="whiskey-search-service")
         self.dynamodb = dynamodb or get_dynamodb_resource()
         self._whiskey_table = None
@@ -49,6 +129,199 @@ class WhiskeySearchService:
             return float(item) if item % 1 else int(item)
         return item
 
+    def _current_catalog_version(self) -> int | None:
+        """Read the AppState catalog marker; None when unset, unconfigured, or unreadable."""
+        if not self.app_state_table_name:
+            return None
+        try:
+            return read_catalog_version(
+                self.dynamodb.Table(self.app_state_table_name),
+                self.whiskey_table_name,
+            )
+        except (BotoCoreError, ClientError) as exc:
+            self.logger.warning("Catalog version read failed", error_type=type(exc).__name__)
+            return None
+
+    def _artifact_stale_reason(
+        self,
+        header: dict[str, Any],
+        catalog_version: int | None,
+    ) -> str | None:
+        if header.get("table_name") != self.whiskey_table_name:
+            return "table_name"
+        # Import scripts bump the marker on every catalog write, so an artifact
+        # built before the latest bump is missing rows.
+        if catalog_version is not None and header.get("catalog_version") != catalog_version:
+            return "catalog_version"
+        max_age = int(os.environ.get("SEARCH_INDEX_ARTIFACT_MAX_AGE_SECONDS", "0"))
+        if max_age:
+            try:
+                built_at = datetime.fromisoformat(str(header.get("built_at")))
+            except ValueError:
+                return "built_at"
+            if (datetime.now(timezone.utc) - built_at).total_seconds() > max_age:
+                return "max_age"
+        return None
+
+    def _artifact_search_index(self, catalog_version: int | None) -> dict[str, Any] | None:
+        artifact = _SEARCH_INDEX_ARTIFACT
+        if artifact is None:
+            return None
+        stale_reason = self._artifact_stale_reason(artifact["header"], catalog_version)
+        if stale_reason:
+            self.logger.warning(
+                "Search index artifact stale",
+                reason=stale_reason,
+                catalog_version=catalog_version,
+                artifact_catalog_version=artifact["header"].get("catalog_version"),
+                content_hash=artifact["header"].get("content_hash"),
+            )
+            return None
+        self.logger.info(
+            "Search index loaded from artifact",
+            item_count=len(artifact["index"]),
+            content_hash=artifact["header"].get("content_hash"),
+        )
+        return {
+            "table_name": self.whiskey_table_name,
+            "expires_at": _search_index_expires_at(),
+            "index": artifact["index"],
+            "catalog_version": catalog_version,
+        }
+
+    def _build_search_index(
+        self,
+        before_page: Callable[[], None] | None,
+        catalog_version: int | None,
+    ) -> dict[str, Any]:
+        names = {f"#f{position}": field for position, field in enumerate(DOCUMENT_FIELDS)}
+        scan_kwargs: dict[str, Any] = {
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+        }
+        items: list[dict] = []
+        started = time.monotonic()
+        page_count = 0
+        while True:
+            if before_page:
+                before_page()
+            response = self.whiskey_table.scan(**scan_kwargs)
+            page_count += 1
+            items.extend(self._serialize_item(item) for item in response.get("Items", []))
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if len(items) > SEARCH_INDEX_MAX_ITEMS or (
+                last_evaluated_key and page_count >= SEARCH_INDEX_MAX_PAGES
+            ):
+                # Too large to hold per container; requests scan until the TTL
+                # expires and the next build is attempted.
+                self.logger.warning(
+                    "Search index skipped",
+                    reason="max_items" if len(items) > SEARCH_INDEX_MAX_ITEMS else "max_pages",
+                    item_count=len(items),
+                    page_count=page_count,
+                )
+                index = None
+                break
+            if not last_evaluated_key:
+                index = SearchIndex.build(items)
+                self.logger.info(
+                    "Search index built",
+                    item_count=len(index),
+                    page_count=page_count,
+                    duration_ms=round((time.monotonic() - started) * 1000, 1),
+                )
+                break
+            scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+        return {
+            "table_name": self.whiskey_table_name,
+            "expires_at": _search_index_expires_at(),
+            "index": index,
+            "catalog_version": catalog_version,
+        }
+
+    def _revalidated_search_index(self, catalog_version: int | None) -> dict[str, Any] | None:
+        """Extend an expired index whose catalog version still matches the marker."""
+        expired = _SEARCH_INDEX_CACHE
+        if (
+            catalog_version is None
+            or expired is None
+            or expired["table_name"] != self.whiskey_table_name
+            or expired.get("catalog_version") != catalog_version
+        ):
+            return None
+        self.logger.info("Search index revalidated", catalog_version=catalog_version)
+        return {**expired, "expires_at": _search_index_expires_at()}
+
+    def get_search_index(
+        self,
+        before_page: Callable[[], None] | None = None,
+    ) -> SearchIndex | None:
+        """Return the warm per-container index, revalidating it once per TTL.
+
+        On expiry the AppState catalog marker is read once. An index built at
+        the same catalog version is kept; otherwise a bundled artifact at that
+        version is loaded, or the index is rebuilt from a full table scan.
+        """
+        global _SEARCH_INDEX_CACHE
+        cached = _cached_search_index(self.whiskey_table_name)
+        if cached is not None:
+            return cached["index"]
+        with _SEARCH_INDEX_LOCK:
+            cached = _cached_search_index(self.whiskey_table_name)
+            if cached is None:
+                # Read before the scan so a bump during it forces the next rebuild.
+                version = self._current_catalog_version()
+                cached = (
+                    self._revalidated_search_index(version)
+                    or self._artifact_search_index(version)
+                    or self._build_search_index(before_page, version)
+                )
+                _SEARCH_INDEX_CACHE = cached
+            return cached["index"]
+
+    def suggest_whiskeys(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        before_page: Callable[[], None] | None = None,
+    ) -> list[dict]:
+        """Answer a typeahead query: prefix matches first, then substrings.
+
+        A warm index answers from memory. A cold container loads the bundled
+        artifact or builds the index under the caller's scan budget, exactly
+        as search does; a catalog too large to index falls back to the bounded
+        substring scan.
+        """
+        if _search_index_enabled():
+            index = self.get_search_index(before_page)
+            if index is not None:
+                return index.suggest(query, limit=limit)
+        items, _ = self.search_whiskeys(query, limit=limit, before_page=before_page)
+        return items
+
+    def _search_index_page(
+        self,
+        index: SearchIndex,
+        query: str,
+        limit: int,
+        cursor: dict[str, Any] | None,
+    ) -> tuple[list[dict], str | None]:
+        after = None
+        if cursor is not None:
+            after = cursor.get("after")
+            if (
+                not isinstance(after, list)
+                or len(after) != 3
+                or isinstance(after[0], bool)
+                or not isinstance(after[0], int)
+                or any(not isinstance(value, str) for value in after[1:])
+            ):
+                raise ValueError("Invalid next_token")
+        items, resume_after = index.search(query, limit=limit, after=after)
+        next_token = encode_next_token({"after": resume_after}) if resume_after else None
+        return items, next_token
+
     def search_whiskeys(
         self,
         query: str,
@@ -69,8 +342,17 @@ class WhiskeySearchService:
             raise ValueError("max_pages must be at least 1")
 
         last_evaluated_key = decode_next_token(next_token)
+        # Index cursors carry "after"; scan cursors are a raw LastEvaluatedKey
+        # and keep resuming the scan they came from.
+        if _search_index_enabled() and (last_evaluated_key is None or "after" in last_evaluated_key):
+            index = self.get_search_index(before_page)
+            if index is not None:
+                return self._search_index_page(index, query, limit, last_evaluated_key)
+            if last_evaluated_key is not None:
+                raise ValueError("Invalid next_token")
+
         scan_kwargs: dict[str, Any] = {"Limit": page_size}
-        normalized_query = normalize_text(query)
+        normalized_query = cached_normalize_text(query)
         if query:
             scan_kwargs["FilterExpression"] = (
                 Attr("name").contains(query) | Attr("normalized_name").contains(normalized_query)
@@ -89,20 +371,21 @@ class WhiskeySearchService:
             if len(page_items) > remaining:
                 items.extend(page_items[:remaining])
                 continuation = encode_next_token({"id": items[-1]["id"]})
-                return [self._serialize_item(item) for item in items], continuation
+                return self._ranked(query, items), continuation
 
             items.extend(page_items)
             last_evaluated_key = response.get("LastEvaluatedKey")
             if not last_evaluated_key:
-                return [self._serialize_item(item) for item in items], None
+                return self._ranked(query, items), None
             if len(items) >= limit:
-                return [self._serialize_item(item) for item in items], encode_next_token(
-                    last_evaluated_key
-                )
+                return self._ranked(query, items), encode_next_token(last_evaluated_key)
 
-        return [self._serialize_item(item) for item in items], encode_next_token(
-            last_evaluated_key
-        )
+        return self._ranked(query, items), encode_next_token(last_evaluated_key)
+
+    def _ranked(self, query: str, items: list[dict]) -> list[dict]:
+        # Scan pages hold at most `limit` filtered items; the continuation
+        # token was taken from scan order before ranking.
+        return rank_documents(query, [self._serialize_item(item) for item in items])
 
     def get_whiskey_by_id(self, whiskey_id: str) -> dict | None:
         response = self.whiskey_table.get_item(Key={"id": whiskey_id})
@@ -236,8 +236,10 @@ async def search_whiskeys(request: Request) -> Response:
 
 
 @app.post("/api/drink-logs/upload-url")
+@app.post("/api/drink-logs/export")
 @app.post("/api/drink-logs")
 @app.get("/api/drink-logs")
+@app.get("/api/drink-logs/stats")
 async def drink_logs_collection(request: Request) -> Response:
     return await invoke(request, DRINK_LOGS.lambda_handler)
 
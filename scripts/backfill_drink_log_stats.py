@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+DrinkLogsの既存レコードを利用者ごとの集計カウンタ (AppState drinklog-stats#user#...) に載せる
+- 完了済み (status=complete) のレコードのみ対象。pending/deleting は作成・削除の処理が数える
+- stats_keys をLambdaと同じ形式で計算し、レコードの stats_keys 更新とカウンタの増減を
+  1 つの条件付きトランザクションで書く。未集計のレコードは加算のみ、旧形式
+  (brand#<正規化した brand_text>) で数えたレコードは付け替える
+- brand#<brand_key> はカタログにある brand_key を持ち、手入力 (brand_source=manual) でない
+  ときだけ。それ以外は brand_text#<正規化した brand_text> (backfill_timeline_filter_keys と同じ判定)
+- stats_keys と updated_at を条件にするため、並行する編集・削除と二重に数えない
+- 既定は dry-run。--apply を付けたときだけ書き込む
+- 新しい集計形式のLambdaをデプロイした後に、backfill_timeline_filter_keys.py に続けて実行する
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
+if str(COMMON_PYTHON) not in sys.path:
+    sys.path.insert(0, str(COMMON_PYTHON))
+
+from whiskey_common.normalize import normalize_text  # noqa: E402
+
+from backfill_timeline_filter_keys import CATALOG_BRAND_KEYS  # noqa: E402
+from insert_whiskeys_to_dynamodb import create_dynamodb_resource  # noqa: E402
+
+
+STATS_OWNER = "drinklog-stats#user#{user_id}"
+
+
+def expected_stats_keys(item: dict[str, Any]) -> list[str]:
+    """Return the counters drink-logs counts a complete record in (same format as the Lambda)."""
+    keys = ["total"]
+    brand_key = item.get("brand_key")
+    brand_text = item.get("brand_text")
+    brand_text_key = normalize_text(brand_text) if isinstance(brand_text, str) else ""
+    if brand_key in CATALOG_BRAND_KEYS and item.get("brand_source") != "manual":
+        keys.append(f"brand#{brand_key}")
+    elif brand_text_key:
+        keys.append(f"brand_text#{brand_text_key}")
+    place_id = (item.get("store") or {}).get("place_id")
+    if place_id:
+        keys.append(f"place#{place_id}")
+    if item.get("serving_style"):
+        keys.append(f"style#{item['serving_style']}")
+    if isinstance(item.get("datetime"), str):
+        keys.append(f"month#{item['datetime'][:7]}")
+    return keys
+
+
+def stats_deltas(previous: list[str], expected: list[str]) -> dict[str, int]:
+    deltas: dict[str, int] = {}
+    for key in previous:
+        deltas[key] = deltas.get(key, 0) - 1
+    for key in expected:
+        deltas[key] = deltas.get(key, 0) + 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def plan_update(item: dict[str, Any]) -> list[str] | None:
+    """Return the stats_keys to write, or None when the record is already counted so."""
+    if item.get("status") != "complete":
+        return None
+    expected = expected_stats_keys(item)
+    if item.get("stats_keys") == expected:
+        return None
+    return expected
+
+
+def apply_update(
+    client: Any,
+    drinklogs_table_name: str,
+    app_state_table_name: str,
+    item: dict[str, Any],
+    expected: list[str],
+    now: str,
+) -> bool:
+    """Write one planned update; return False when the record changed since the scan."""
+    previous = item.get("stats_keys")
+    values: dict[str, Any] = {
+        ":complete": "complete",
+        ":updated_at": item.get("updated_at"),
+        ":stats_keys": expected,
+    }
+    condition = "#status = :complete AND updated_at = :updated_at"
+    if isinstance(previous, list):
+        condition += " AND stats_keys = :previous_stats_keys"
+        values[":previous_stats_keys"] = previous
+    else:
+        condition += " AND attribute_not_exists(stats_keys)"
+        previous = []
+    owner = STATS_OWNER.format(user_id=item["user_id"])
+    transaction: list[dict[str, Any]] = [
+        {
+            "Update": {
+                "TableName": drinklogs_table_name,
+                "Key": {"id": item["id"]},
+                "UpdateExpression": "SET stats_keys = :stats_keys",
+                "ConditionExpression": condition,
+                "ExpressionAttributeNames": {"#status": "status"},
+                "ExpressionAttributeValues": values,
+            }
+        },
+        *(
+            {
+                "Update": {
+                    "TableName": app_state_table_name,
+                    "Key": {"pk": f"{owner}#{key}"},
+                    "UpdateExpression": (
+                        "SET stats_owner = :owner, updated_at = :updated_at ADD #count :delta"
+                    ),
+                    "ExpressionAttributeNames": {"#count": "count"},
+                    "ExpressionAttributeValues": {
+                        ":owner": owner,
+                        ":updated_at": now,
+                        ":delta": delta,
+                    },
+                }
+            }
+            for key, delta in stats_deltas(previous, expected).items()
+        ),
+    ]
+    try:
+        client.transact_write_items(TransactItems=transaction)
+    except client.exceptions.TransactionCanceledException as exc:
+        reasons = exc.response.get("CancellationReasons", [])
+        if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+            return False
+        raise
+    return True
+
+
+def backfill(
+    dynamodb: Any,
+    drinklogs_table_name: str,
+    app_state_table_name: str,
+    *,
+    apply: bool,
+    now: str,
+) -> dict[str, int]:
+    table = dynamodb.Table(drinklogs_table_name)
+    client = dynamodb.meta.client
+    counts = {"scanned": 0, "planned": 0, "updated": 0, "skipped": 0}
+    kwargs: dict[str, Any] = {}
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            counts["scanned"] += 1
+            expected = plan_update(item)
+            if expected is None:
+                continue
+            counts["planned"] += 1
+            if apply:
+                updated = apply_update(
+                    client, drinklogs_table_name, app_state_table_name, item, expected, now
+                )
+                counts["updated" if updated else "skipped"] += 1
+        if "LastEvaluatedKey" not in response:
+            return counts
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill DrinkLogs per-user stats counters")
+    parser.add_argument("--target", choices=("local", "dev"), required=True)
+    parser.add_argument("--table-name")
+    parser.add_argument("--app-state-table-name")
+    parser.add_argument("--apply", action="store_true", help="write updates (default: dry-run)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    table_name = args.table_name or os.environ.get("DRINKLOGS_TABLE", f"DrinkLogs-{args.target}")
+    app_state_table_name = args.app_state_table_name or os.environ.get(
+        "APP_STATE_TABLE", f"AppState-{args.target}"
+    )
+    now = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    try:
+        dynamodb = create_dynamodb_resource(args.target)
+        counts = backfill(dynamodb, table_name, app_state_table_name, apply=args.apply, now=now)
+    except Exception as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    mode = "更新" if args.apply else "dry-run"
+    print(
+        f"{table_name} → {app_state_table_name} ({mode}): 走査 {counts['scanned']}件 / "
+        f"対象 {counts['planned']}件 / 更新 {counts['updated']}件 / 競合スキップ {counts['skipped']}件"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
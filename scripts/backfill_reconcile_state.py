@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+DrinkLogsの既存レコードにリコンサイラ用キー reconcile_state を埋める
+- pending / deleting はステータス名、complete で tmp_s3_key が残るものは "tmp"
+- それ以外 (通常の complete) にキーが残っていれば削除する
+- status (と tmp_s3_key) を条件にするため、並行する作成・削除の遷移を上書きしない
+- 既定は dry-run。--apply を付けたときだけ書き込む
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Any
+
+from insert_whiskeys_to_dynamodb import create_dynamodb_resource
+
+
+def expected_reconcile_state(item: dict[str, Any]) -> str | None:
+    """Return the reconcile_state drink-logs keeps on a record in this state."""
+    status = item.get("status")
+    if status in {"pending", "deleting"}:
+        return status
+    if status == "complete" and item.get("tmp_s3_key"):
+        return "tmp"
+    return None
+
+
+def apply_update(table: Any, item: dict[str, Any], state: str | None) -> bool:
+    """Write (None removes) one state; return False when the record changed since the scan."""
+    names = {"#status": "status"}
+    values: dict[str, Any] = {":status": item.get("status")}
+    condition = "#status = :status"
+    if item.get("status") == "complete":
+        if item.get("tmp_s3_key"):
+            condition += " AND tmp_s3_key = :tmp"
+            values[":tmp"] = item["tmp_s3_key"]
+        else:
+            condition += " AND attribute_not_exists(tmp_s3_key)"
+    if state is None:
+        expression = "REMOVE reconcile_state"
+    else:
+        expression = "SET reconcile_state = :state"
+        values[":state"] = state
+    try:
+        table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression=expression,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+    return True
+
+
+def backfill(table: Any, *, apply: bool) -> dict[str, int]:
+    counts = {"scanned": 0, "planned": 0, "updated": 0, "skipped": 0}
+    kwargs: dict[str, Any] = {
+        "ProjectionExpression": "id, #status, tmp_s3_key, reconcile_state",
+        "ExpressionAttributeNames": {"#status": "status"},
+    }
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            counts["scanned"] += 1
+            state = expected_reconcile_state(item)
+            if item.get("reconcile_state") == state:
+                continue
+            counts["planned"] += 1
+            if apply:
+                counts["updated" if apply_update(table, item, state) else "skipped"] += 1
+        if "LastEvaluatedKey" not in response:
+            return counts
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill DrinkLogs reconcile_state")
+    parser.add_argument("--target", choices=("local", "dev"), required=True)
+    parser.add_argument("--table-name")
+    parser.add_argument("--apply", action="store_true", help="write updates (default: dry-run)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    table_name = args.table_name or os.environ.get("DRINKLOGS_TABLE", f"DrinkLogs-{args.target}")
+    try:
+        table = create_dynamodb_resource(args.target).Table(table_name)
+        counts = backfill(table, apply=args.apply)
+    except Exception as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    mode = "更新" if args.apply else "dry-run"
+    print(
+        f"{table_name} ({mode}): 走査 {counts['scanned']}件 / 対象 {counts['planned']}件 / "
+        f"更新 {counts['updated']}件 / 競合スキップ {counts['skipped']}件"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
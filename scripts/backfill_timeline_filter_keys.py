@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+DrinkLogsの既存レコードにタイムライン絞り込み用キーを埋める
+- brand_key / user_brand_key (UserBrandDatetimeIndex) と user_place_key (UserPlaceDatetimeIndex)
+- brand_key はカタログのブランドID。作成時に選んだ候補からしか分からないため、既存の
+  brand_key がカタログにあり、手入力 (brand_source=manual) でないときだけ残す。
+  以前の形式 (正規化した brand_text) はカタログにないので取り除く
+- 完了済み (status=complete) のレコードのみ対象。pending/deleting は書き換えない
+- updated_at を条件にするため、並行する編集 (キーも同時に書かれる) を上書きしない
+- 既定は dry-run。--apply を付けたときだけ書き込む
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from insert_whiskeys_to_dynamodb import create_dynamodb_resource
+
+
+ROOT = Path(__file__).resolve().parents[1]
+# analyze が候補に付ける brand_key の出どころ
+BRANDS_PATH = ROOT / "lambda" / "drink-log-analyze" / "brands.json"
+FILTER_KEY_FIELDS = ("brand_key", "user_brand_key", "user_place_key")
+
+
+def load_catalog_brand_keys(path: Path = BRANDS_PATH) -> frozenset[str]:
+    with path.open(encoding="utf-8") as file:
+        return frozenset(brand["brand_key"] for brand in json.load(file)["brands"])
+
+
+CATALOG_BRAND_KEYS = load_catalog_brand_keys()
+
+
+def expected_filter_keys(item: dict[str, Any]) -> dict[str, str]:
+    """Return the keys drink-logs writes for a complete record (same format as the Lambda)."""
+    keys: dict[str, str] = {}
+    user_id = item["user_id"]
+    brand_key = item.get("brand_key")
+    if brand_key in CATALOG_BRAND_KEYS and item.get("brand_source") != "manual":
+        keys["brand_key"] = brand_key
+        keys["user_brand_key"] = f"{user_id}#{brand_key}"
+    place_id = (item.get("store") or {}).get("place_id")
+    if place_id:
+        keys["user_place_key"] = f"{user_id}#{place_id}"
+    return keys
+
+
+def plan_update(item: dict[str, Any]) -> tuple[dict[str, str], list[str]] | None:
+    """Return (attributes to set, attributes to remove), or None when already in step."""
+    if item.get("status") != "complete":
+        return None
+    expected = expected_filter_keys(item)
+    sets = {field: value for field, value in expected.items() if item.get(field) != value}
+    removes = [field for field in FILTER_KEY_FIELDS if field in item and field not in expected]
+    if not sets and not removes:
+        return None
+    return sets, removes
+
+
+def apply_update(table: Any, item: dict[str, Any], sets: dict[str, str], removes: list[str]) -> bool:
+    """Write one planned update; return False when the record changed since the scan."""
+    expression = []
+    if sets:
+        expression.append("SET " + ", ".join(f"{field} = :{field}" for field in sets))
+    if removes:
+        expression.append("REMOVE " + ", ".join(removes))
+    values: dict[str, Any] = {f":{field}": value for field, value in sets.items()}
+    values.update({":complete": "complete", ":updated_at": item.get("updated_at")})
+    try:
+        table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression=" ".join(expression),
+            ConditionExpression="#status = :complete AND updated_at = :updated_at",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues=values,
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+    return True
+
+
+def backfill(table: Any, *, apply: bool) -> dict[str, int]:
+    counts = {"scanned": 0, "planned": 0, "updated": 0, "skipped": 0}
+    kwargs: dict[str, Any] = {}
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get("Items", []):
+            counts["scanned"] += 1
+            plan = plan_update(item)
+            if plan is None:
+                continue
+            counts["planned"] += 1
+            if apply:
+                counts["updated" if apply_update(table, item, *plan) else "skipped"] += 1
+        if "LastEvaluatedKey" not in response:
+            return counts
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill DrinkLogs timeline filter keys")
+    parser.add_argument("--target", choices=("local", "dev"), required=True)
+    parser.add_argument("--table-name")
+    parser.add_argument("--apply", action="store_true", help="write updates (default: dry-run)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    table_name = args.table_name or os.environ.get("DRINKLOGS_TABLE", f"DrinkLogs-{args.target}")
+    try:
+        table = create_dynamodb_resource(args.target).Table(table_name)
+        counts = backfill(table, apply=args.apply)
+    except Exception as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    mode = "更新" if args.apply else "dry-run"
+    print(
+        f"{table_name} ({mode}): 走査 {counts['scanned']}件 / 対象 {counts['planned']}件 / "
+        f"更新 {counts['updated']}件 / 競合スキップ {counts['skipped']}件"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
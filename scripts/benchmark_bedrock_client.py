@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Bedrock runtime クライアント生成コストのベンチマーク
+- 旧実装 (呼び出しごとに boto3.client("bedrock-runtime") を生成) と
+  get_bedrock_runtime_client (粗いタイムアウト区分ごとにキャッシュ) を比較
+- 解析 1 回あたり最大 2 回 (リトライ込み) の取得を想定し、残り時間を少しずつ減らして呼ぶ
+- クライアント生成のみを計測し、Bedrock へのリクエストは送らない
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
+if str(COMMON_PYTHON) not in sys.path:
+    sys.path.insert(0, str(COMMON_PYTHON))
+
+from whiskey_common import clients  # noqa: E402
+
+
+def per_call_client(read_timeout: float) -> Any:
+    """The previous analyze behaviour: a new client for every invoke."""
+    config = Config(
+        connect_timeout=min(2.0, read_timeout),
+        read_timeout=read_timeout,
+        retries={"mode": "standard", "total_max_attempts": 1},
+    )
+    return boto3.client("bedrock-runtime", config=config, region_name=os.environ["AWS_REGION"])
+
+
+def _read_timeouts(requests: int) -> list[float]:
+    # 1 回目は残り約 19 秒、リトライは約 9 秒後。ウォーム環境で揺れる程度の差を付ける。
+    timeouts: list[float] = []
+    for index in range(requests):
+        jitter = (index % 7) * 0.1
+        timeouts.append(19.8 - jitter)
+        if index % 4 == 0:
+            timeouts.append(10.5 - jitter)
+    return timeouts
+
+
+def _run(factory: Callable[[float], Any], timeouts: list[float]) -> list[float]:
+    samples: list[float] = []
+    for read_timeout in timeouts:
+        started = time.perf_counter()
+        factory(read_timeout)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Bedrock runtime client construction")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("AWS_REGION", "ap-northeast-1")
+    timeouts = _read_timeouts(args.requests)
+    # どちらも初回はサービスモデルの読み込みを含むため、先に 1 回ずつ温めておく。
+    per_call_client(timeouts[0])
+    per_call = _run(per_call_client, timeouts)
+    cached = _run(clients.get_bedrock_runtime_client, timeouts)
+
+    print(f"requests: {args.requests}  client lookups: {len(timeouts)}")
+    for label, samples in (("per-call client", per_call), ("cached client", cached)):
+        print(
+            f"{label:>16}: mean {statistics.fmean(samples):.3f} ms"
+            f"  p99 {sorted(samples)[int(len(samples) * 0.99) - 1]:.3f} ms"
+            f"  total {sum(samples):.1f} ms"
+        )
+    print(f"{'clients built':>16}: per-call {len(timeouts)}  cached {len(clients._BEDROCK_CLIENTS)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+JPEG エンコード戦略の比較ベンチマーク
+- scripts/eval/images の写真を normalize_image と同じ前処理で 1600px に縮小
+- 旧実装 (品質を 90 から線形に下げる) と encode_within_budget の
+  エンコード回数・処理時間・選ばれた品質を予算ごとに表示
+- どちらかが予算を超えた場合は終了コード 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
+if str(COMMON_PYTHON) not in sys.path:
+    sys.path.insert(0, str(COMMON_PYTHON))
+
+from whiskey_common import images  # noqa: E402
+
+
+IMAGES_DIR = ROOT / "scripts" / "eval" / "images"
+DEFAULT_BUDGETS = (1_572_864, 300_000, 60_000, 45_000, 30_000, 20_000)
+
+
+def reference_encode(image: Image.Image, max_bytes: int) -> tuple[bytes, int, int]:
+    """The original linear sweep, kept as the oracle. Returns (data, quality, encodes)."""
+    current = image.copy()
+    encodes = 0
+    try:
+        while True:
+            for quality in images.JPEG_QUALITIES:
+                encodes += 1
+                encoded = images._encode_jpeg(current, quality)
+                if len(encoded) <= max_bytes:
+                    return encoded, quality, encodes
+            current_long_side = max(current.size)
+            next_long_side = max(images.MIN_LONG_SIDE, int(current_long_side * 0.8))
+            if current_long_side <= images.MIN_LONG_SIDE or next_long_side >= current_long_side:
+                raise images.ImageEncodeError("Unable to encode image within byte budget")
+            current = images._resize_long_side(current, next_long_side)
+    finally:
+        current.close()
+
+
+def bounded_encode(image: Image.Image, max_bytes: int) -> tuple[bytes, int, int]:
+    encoded = images.encode_within_budget(image, max_bytes=max_bytes)
+    return encoded.data, encoded.quality, encoded.encode_attempts
+
+
+def load_photo(path: Path) -> Image.Image:
+    with Image.open(path) as source:
+        oriented = ImageOps.exif_transpose(source)
+        image = images._flatten_to_rgb(oriented)
+    return images._resize_long_side(image, images.TARGET_LONG_SIDE)
+
+
+def _run(
+    strategy: Callable[[Image.Image, int], tuple[bytes, int, int]],
+    photos: list[Image.Image],
+    max_bytes: int,
+) -> tuple[list[int], list[int], float, int]:
+    qualities: list[int] = []
+    encodes: list[int] = []
+    over_budget = 0
+    started = time.perf_counter()
+    for photo in photos:
+        data, quality, attempts = strategy(photo, max_bytes)
+        qualities.append(quality)
+        encodes.append(attempts)
+        over_budget += len(data) > max_bytes
+    return qualities, encodes, time.perf_counter() - started, over_budget
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JPEG quality search strategies")
+    parser.add_argument("--images", type=Path, default=IMAGES_DIR)
+    parser.add_argument("--budget", type=int, action="append", dest="budgets")
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        path
+        for path in args.images.iterdir()
+        if path.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"}
+    )
+    if not paths:
+        print(f"no photos in {args.images}", file=sys.stderr)
+        return 1
+    photos = [load_photo(path) for path in paths]
+    print(f"photos: {len(photos)}")
+
+    failed = False
+    for max_bytes in args.budgets or DEFAULT_BUDGETS:
+        reference = _run(reference_encode, photos, max_bytes)
+        bounded = _run(bounded_encode, photos, max_bytes)
+        quality_deltas = [new - old for old, new in zip(reference[0], bounded[0])]
+        print(f"budget {max_bytes} bytes")
+        for label, (_qualities, encodes, elapsed, over_budget) in (
+            ("linear sweep", reference),
+            ("bounded search", bounded),
+        ):
+            print(
+                f"{label:>16}: {sum(encodes) / len(encodes):.2f} encodes/photo"
+                f" (max {max(encodes)})  {elapsed / len(photos) * 1000:.1f} ms/photo"
+                f"  over budget: {over_budget}"
+            )
+        print(f"{'quality delta':>16}: min {min(quality_deltas)}  max {max(quality_deltas)}")
+        failed = failed or reference[3] > 0 or bounded[3] > 0
+    for photo in photos:
+        photo.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
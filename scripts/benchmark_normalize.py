@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+normalize_text の等価性確認とマイクロベンチマーク
+- シードデータ・brands.json・expressions.json の全文字列で旧実装と出力を比較
+- 旧実装 / 現行実装 / LRU版 の1件あたり処理時間を表示
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+import unicodedata
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
+if str(COMMON_PYTHON) not in sys.path:
+    sys.path.insert(0, str(COMMON_PYTHON))
+
+from whiskey_common.normalize import cached_normalize_text, normalize_text  # noqa: E402
+
+
+SAMPLE_SOURCES = (
+    ROOT / "scripts" / "local" / "seed_data" / "whiskeys.json",
+    ROOT / "scripts" / "catalog" / "brands.json",
+    ROOT / "scripts" / "catalog" / "expressions.json",
+    ROOT / "lambda" / "drink-log-analyze" / "brands.json",
+)
+# Width, case, whitespace and kana edge cases the catalog files may not cover.
+EXTRA_SAMPLES = (
+    "",
+    " ",
+    "ＹＡＭＡＺＡＫＩ　１２",
+    "ｻﾝﾄﾘｰ ｳｲｽｷｰ",
+    "ヴァヵヶ・ー",
+    "Glen\tMoray\nClassic",
+    "Ⅻ ㍻ ﬁ",
+    "İSLAY",
+)
+
+
+def reference_normalize_text(text: str) -> str:
+    """The original generator-based implementation, kept as the oracle."""
+    if not text:
+        return ""
+
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    normalized = "".join(normalized.split())
+    return "".join(
+        chr(ord(character) - 0x60)
+        if "ァ" <= character <= "ヶ"
+        else character
+        for character in normalized
+    )
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for nested in value.values():
+            yield from _strings(nested)
+    elif isinstance(value, list):
+        for nested in value:
+            yield from _strings(nested)
+
+
+def collect_samples(paths: Iterable[Path] = SAMPLE_SOURCES) -> list[str]:
+    """Return every string value in the catalog sources plus edge cases."""
+    samples: list[str] = list(EXTRA_SAMPLES)
+    for path in paths:
+        with path.open(encoding="utf-8") as source_file:
+            samples.extend(_strings(json.load(source_file)))
+    return samples
+
+
+def find_mismatches(samples: Iterable[str]) -> list[tuple[str, str, str]]:
+    """Return (input, expected, actual) for every diverging sample."""
+    return [
+        (sample, expected, actual)
+        for sample in samples
+        if (expected := reference_normalize_text(sample))
+        != (actual := normalize_text(sample))
+        or cached_normalize_text(sample) != expected
+    ]
+
+
+def _per_call_microseconds(function: Any, samples: list[str], repeat: int) -> float:
+    elapsed = min(
+        timeit.repeat(lambda: [function(sample) for sample in samples], number=1, repeat=repeat)
+    )
+    return elapsed / len(samples) * 1_000_000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark normalize_text against the original")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    samples = collect_samples()
+    mismatches = find_mismatches(samples)
+    for sample, expected, actual in mismatches[:20]:
+        print(f"MISMATCH {sample!r}: expected {expected!r}, got {actual!r}")
+    print(f"samples: {len(samples)}  mismatches: {len(mismatches)}")
+
+    cached_normalize_text.cache_clear()
+    for sample in samples:
+        cached_normalize_text(sample)
+    for label, function in (
+        ("reference", reference_normalize_text),
+        ("normalize_text", normalize_text),
+        ("cached_normalize_text (warm)", cached_normalize_text),
+    ):
+        print(f"{label:>30}: {_per_call_microseconds(function, samples, args.repeat):.3f} us/call")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+WhiskeySearchテーブルから検索インデックス成果物を生成
+- whiskeys-search Lambdaのバンドルに同梱し、コールドスタート時のスキャンを回避
+- ヘッダーにformat_version・content_hash・table_name・catalog_versionを記録
+- 成果物が無い/古い場合 (AppStateのカタログバージョンと不一致を含む)、
+  Lambdaは従来どおりDynamoDBスキャンで索引を構築
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
+if str(COMMON_PYTHON) not in sys.path:
+    sys.path.insert(0, str(COMMON_PYTHON))
+
+from whiskey_common.catalog_version import read_catalog_version  # noqa: E402
+from whiskey_common.decimal_utils import decimal_default  # noqa: E402
+from whiskey_common.search_index import (  # noqa: E402
+    DOCUMENT_FIELDS,
+    SearchIndex,
+    dump_artifact,
+    load_artifact,
+    read_artifact_header,
+)
+
+from insert_whiskeys_to_dynamodb import create_dynamodb_resource  # noqa: E402
+
+
+DEFAULT_OUTPUT = ROOT / "lambda" / "whiskeys-search" / "search-index.idx"
+
+
+def scan_documents(table: Any) -> list[dict[str, Any]]:
+    """Scan every record with the display fields the search API returns."""
+    names = {f"#f{position}": field for position, field in enumerate(DOCUMENT_FIELDS)}
+    scan_kwargs: dict[str, Any] = {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    documents: list[dict[str, Any]] = []
+    while True:
+        response = table.scan(**scan_kwargs)
+        documents.extend(
+            json.loads(json.dumps(item, default=decimal_default))
+            for item in response.get("Items", [])
+        )
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return documents
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+
+def build_artifact(
+    table: Any,
+    table_name: str,
+    now: datetime | None = None,
+    catalog_version: int | None = None,
+) -> bytes:
+    """Build a verified artifact for one WhiskeySearch table.
+
+    catalog_version must be read before the scan, so a bump during it makes
+    the artifact stale rather than silently missing rows.
+    """
+    index = SearchIndex.build(scan_documents(table))
+    built_at = (now or datetime.now(timezone.utc)).isoformat().replace("+00:00", "Z")
+    data = dump_artifact(
+        index,
+        table_name=table_name,
+        built_at=built_at,
+        catalog_version=catalog_version,
+    )
+    load_artifact(data)
+    return data
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the bundled whiskey search index")
+    parser.add_argument("--target", choices=("local", "dev"), required=True)
+    parser.add_argument(
+        "--table-name",
+        help="table recorded in the artifact; the Lambda ignores artifacts for other tables",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    suffix = "local" if args.target == "local" else "dev"
+    table_name = args.table_name or os.environ.get(
+        "WHISKEY_SEARCH_TABLE", f"WhiskeySearch-{suffix}"
+    )
+    app_state_table_name = os.environ.get("APP_STATE_TABLE", f"AppState-{suffix}")
+    try:
+        dynamodb = create_dynamodb_resource(args.target)
+        version = read_catalog_version(dynamodb.Table(app_state_table_name), table_name)
+        data = build_artifact(dynamodb.Table(table_name), table_name, catalog_version=version)
+    except Exception as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    temporary = args.output.with_suffix(args.output.suffix + ".tmp")
+    temporary.write_bytes(data)
+    temporary.replace(args.output)
+    header = read_artifact_header(data)
+    print(
+        f"検索インデックス生成完了: {args.output} "
+        f"({header['item_count']}件, catalog_version={header.get('catalog_version')}, "
+        f"sha256={header['content_hash'][:12]})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
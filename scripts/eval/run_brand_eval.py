@@ -10,10 +10,13 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import math
 import mimetypes
 import os
 import re
+import statistics
 import sys
+import time
 import unicodedata
 import uuid
 from collections import Counter
@@ -442,6 +445,41 @@ def _aggregate_records(records: Sequence[Mapping[str, Any]]) -> dict[str, Any]:
     }
 
 
+def _model_metrics(records: Sequence[Mapping[str, Any]]) -> dict[str, Any]:
+    """Summarize which model answered and how long analyze took.
+
+    With a model cascade deployed, answers from the escalation model show how
+    often it was needed; comparing runs with and without the cascade shows
+    what it costs in latency.
+    """
+    scored = [
+        record
+        for record in records
+        if record.get("status_code", 200) == 200 and isinstance(record.get("response"), Mapping)
+    ]
+    answered_by = Counter(
+        str(record["response"].get("model_id") or "unknown") for record in scored
+    )
+    latencies = sorted(
+        float(record["latency_ms"])
+        for record in scored
+        if isinstance(record.get("latency_ms"), (int, float))
+    )
+    latency = None
+    if latencies:
+        latency = {
+            "cases": len(latencies),
+            "mean": round(statistics.fmean(latencies), 1),
+            "p50": latencies[(len(latencies) - 1) // 2],
+            "p95": latencies[math.ceil(len(latencies) * 0.95) - 1],
+            "max": latencies[-1],
+        }
+    return {
+        "answered_by": dict(sorted(answered_by.items())),
+        "latency_ms": latency,
+    }
+
+
 def calculate_metrics(
     records: Sequence[Mapping[str, Any]],
     conditions: Sequence[str] = CONDITIONS,
@@ -480,6 +518,7 @@ def calculate_metrics(
         "error_cases": len(records) - overall["cases"],
         "overall": overall,
         "by_condition": by_condition,
+        "models": _model_metrics(records),
         "false_confirmation_cases": false_confirmation_cases,
     }
 
@@ -618,6 +657,21 @@ def print_metrics_report(metrics: Mapping[str, Any]) -> None:
         for condition, aggregate in metrics["by_condition"].items()
     ]
     print(_format_table(headers, condition_rows))
+    models = metrics.get("models")
+    if models:
+        print("\nAnswering model")
+        answered_total = sum(models["answered_by"].values())
+        model_rows = [
+            [model_id, format_rate(count, answered_total, _rate(count, answered_total))]
+            for model_id, count in models["answered_by"].items()
+        ]
+        print(_format_table(("Model", "Cases"), model_rows))
+        latency = models["latency_ms"]
+        if latency:
+            print(
+                f"Analyze latency ({latency['cases']} cases): mean {latency['mean']} ms"
+                f" / p50 {latency['p50']} ms / p95 {latency['p95']} ms / max {latency['max']} ms"
+            )
     print("\nFalse confirmations")
     false_cases = metrics["false_confirmation_cases"]
     if not false_cases:
@@ -1083,8 +1137,11 @@ def execute_case(
     s3_client: Any,
     lambda_client: Any,
     audience: str,
-) -> tuple[int, dict[str, Any], str]:
-    """Upload, invoke, and always request deletion of one temporary image."""
+) -> tuple[int, dict[str, Any], str, float]:
+    """Upload, invoke, and always request deletion of one temporary image.
+
+    Also returns the analyze invocation latency in milliseconds.
+    """
     image_path = manifest_path.parent / case["image"]
     extension = image_path.suffix.lower()
     s3_key = f"tmp/{eval_user}/{uuid.uuid4()}{extension}"
@@ -1096,11 +1153,13 @@ def execute_case(
             s3_key,
             ExtraArgs={"ContentType": content_type},
         )
+        invoked = time.monotonic()
         status_code, response = invoke_analyze(
             lambda_client,
             build_analyze_event(s3_key, eval_user, audience),
         )
-        return status_code, response, s3_key
+        latency_ms = round((time.monotonic() - invoked) * 1000, 1)
+        return status_code, response, s3_key, latency_ms
     finally:
         original_error = sys.exc_info()[1]
         try:
@@ -1154,7 +1213,7 @@ def execute_evaluation(
             "attempted_at": utc_now_text(),
         }
         try:
-            status_code, response, s3_key = execute_case(
+            status_code, response, s3_key, latency_ms = execute_case(
                 case=case,
                 manifest_path=manifest_path,
                 eval_user=eval_user,
@@ -1168,6 +1227,7 @@ def execute_evaluation(
                     "status_code": status_code,
                     "response": response,
                     "temporary_s3_key": s3_key,
+                    "latency_ms": latency_ms,
                 }
             )
             if status_code != 200:
@@ -26,6 +26,7 @@ COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
 if str(COMMON_PYTHON) not in sys.path:
     sys.path.insert(0, str(COMMON_PYTHON))
 
+from whiskey_common.catalog_version import bump_catalog_version  # noqa: E402
 from whiskey_common.normalize import normalize_text  # noqa: E402
 
 from catalog.catalog import IDENTITY_FIELDS, catalog_key  # noqa: E402
@@ -75,6 +76,9 @@ class WhiskeyDatabaseInserter:
         self.whiskey_table = self.dynamodb.Table(
             os.environ.get("WHISKEY_SEARCH_TABLE", f"WhiskeySearch-{suffix}")
         )
+        self.app_state_table = self.dynamodb.Table(
+            os.environ.get("APP_STATE_TABLE", f"AppState-{suffix}")
+        )
         self.processed_count = 0
         self.inserted_count = 0
         self.duplicate_count = 0
@@ -352,6 +356,10 @@ class WhiskeyDatabaseInserter:
 
         self.inserted_count = success_count
         print(f"DynamoDB投入完了: {success_count}/{len(db_items)}件")
+        if success_count:
+            # 分析Lambdaはこのマーカーが変わった時だけカタログを再スキャンする
+            version = bump_catalog_version(self.app_state_table, self.whiskey_table.name)
+            print(f"カタログバージョン更新: {version}")
         
         return success_count == len(db_items)
 
@@ -38,23 +38,55 @@ TABLE_DEFINITIONS: tuple[dict[str, Any], ...] = (
             {"AttributeName": "id", "AttributeType": "S"},
             {"AttributeName": "user_id", "AttributeType": "S"},
             {"AttributeName": "datetime", "AttributeType": "S"},
+            {"AttributeName": "user_place_key", "AttributeType": "S"},
+            {"AttributeName": "user_brand_key", "AttributeType": "S"},
+            {"AttributeName": "reconcile_state", "AttributeType": "S"},
+            {"AttributeName": "updated_at", "AttributeType": "S"},
         ],
         "GlobalSecondaryIndexes": [
             {
-                "IndexName": "UserDatetimeIndex",
+                "IndexName": index_name,
                 "KeySchema": [
-                    {"AttributeName": "user_id", "KeyType": "HASH"},
+                    {"AttributeName": partition_key, "KeyType": "HASH"},
                     {"AttributeName": "datetime", "KeyType": "RANGE"},
                 ],
                 "Projection": {"ProjectionType": "ALL"},
             }
+            for index_name, partition_key in (
+                ("UserDatetimeIndex", "user_id"),
+                ("UserPlaceDatetimeIndex", "user_place_key"),
+                ("UserBrandDatetimeIndex", "user_brand_key"),
+            )
+        ]
+        + [
+            {
+                "IndexName": "ReconcileStateIndex",
+                "KeySchema": [
+                    {"AttributeName": "reconcile_state", "KeyType": "HASH"},
+                    {"AttributeName": "updated_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "KEYS_ONLY"},
+            }
         ],
         "BillingMode": "PAY_PER_REQUEST",
     },
     {
         "TableName": "AppState-local",
         "KeySchema": [{"AttributeName": "pk", "KeyType": "HASH"}],
-        "AttributeDefinitions": [{"AttributeName": "pk", "AttributeType": "S"}],
+        "AttributeDefinitions": [
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "stats_owner", "AttributeType": "S"},
+        ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "StatsOwnerIndex",
+                "KeySchema": [
+                    {"AttributeName": "stats_owner", "KeyType": "HASH"},
+                    {"AttributeName": "pk", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["count"]},
+            }
+        ],
         "BillingMode": "PAY_PER_REQUEST",
     },
 )
@@ -21,6 +21,7 @@ COMMON_PYTHON = ROOT / "lambda" / "common" / "python"
 if str(COMMON_PYTHON) not in sys.path:
     sys.path.insert(0, str(COMMON_PYTHON))
 
+from whiskey_common.catalog_version import bump_catalog_version  # noqa: E402
 from whiskey_common.normalize import normalize_text  # noqa: E402
 
 SCRIPTS_DIR = ROOT / "scripts"
@@ -104,11 +105,14 @@ def seed(
 ) -> int:
     dynamodb = create_dynamodb_resource(target, profile)
     suffix = "local" if target == "local" else "dev"
-    whiskey_table = dynamodb.Table(f"WhiskeySearch-{suffix}")
+    whiskey_table_name = f"WhiskeySearch-{suffix}"
+    whiskey_table = dynamodb.Table(whiskey_table_name)
     items = build_seed_items(brands_path, expressions_path)
     with whiskey_table.batch_writer(overwrite_by_pkeys=["id"]) as writer:
         for item in items:
             writer.put_item(Item=item)
+    # Warm analyze containers rescan the catalog only when this marker changes.
+    bump_catalog_version(dynamodb.Table(f"AppState-{suffix}"), whiskey_table_name)
     return len(items)
 
 
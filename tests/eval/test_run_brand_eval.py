@@ -286,6 +286,45 @@ def test_null_expected_id_with_confirmation_is_false_confirmation():
     assert score["rejected"] is False
 
 
+def test_model_metrics_report_answering_model_and_latency(capsys):
+    records = []
+    for index, (model_id, latency_ms) in enumerate(
+        [
+            ("jp.amazon.nova-2-lite-v1:0", 900.0),
+            ("jp.amazon.nova-2-lite-v1:0", 1100.0),
+            ("jp.amazon.nova-2-lite-v1:0", 1000.0),
+            ("jp.anthropic.claude-haiku-4-5-20251001-v1:0", 3100.0),
+        ]
+    ):
+        record = _record(index, _case("bottle_front", "a"), [{"whiskey_id": "a"}])
+        record["response"]["model_id"] = model_id
+        record["latency_ms"] = latency_ms
+        records.append(record)
+    records.append(_record(4, _case("bottle_front", "b"), [], status_code=500))
+
+    metrics = brand_eval.calculate_metrics(records)
+
+    assert metrics["models"] == {
+        "answered_by": {
+            "jp.amazon.nova-2-lite-v1:0": 3,
+            "jp.anthropic.claude-haiku-4-5-20251001-v1:0": 1,
+        },
+        "latency_ms": {"cases": 4, "mean": 1525.0, "p50": 1000.0, "p95": 3100.0, "max": 3100.0},
+    }
+    brand_eval.print_metrics_report(metrics)
+    output = capsys.readouterr().out
+    assert "jp.anthropic.claude-haiku-4-5-20251001-v1:0 | 1/4 (25.0%)" in output
+    assert "p95 3100.0 ms" in output
+
+
+def test_model_metrics_tolerate_results_without_latency():
+    metrics = brand_eval.calculate_metrics(
+        [_record(0, _case("bottle_front", "a"), [{"whiskey_id": "a"}])]
+    )
+
+    assert metrics["models"] == {"answered_by": {"unknown": 1}, "latency_ms": None}
+
+
 def test_empty_condition_uses_none_rate_and_no_cases_label():
     metrics = brand_eval.calculate_metrics(
         [_record(0, _case("bottle_front", "a"), [{"whiskey_id": "a"}])]
@@ -1017,7 +1056,7 @@ def test_generated_s3_key_matches_analyze_upload_contract(tmp_path):
     (images / "0.jpg").write_bytes(b"\xff\xd8\xffplaceholder")
     s3 = StubS3()
 
-    status, _response, s3_key = brand_eval.execute_case(
+    status, _response, s3_key, latency_ms = brand_eval.execute_case(
         case=case,
         manifest_path=tmp_path / "manifest.json",
         eval_user="brand-eval",
@@ -1029,6 +1068,7 @@ def test_generated_s3_key_matches_analyze_upload_contract(tmp_path):
 
     assert status == 200
     assert analyze.UPLOAD_KEY_RE.fullmatch(s3_key)
+    assert latency_ms >= 0
 
 
 def test_temporary_image_is_deleted_when_lambda_invoke_fails(tmp_path):
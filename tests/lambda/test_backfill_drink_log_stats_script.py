@@ -0,0 +1,159 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from tests.lambda_module_loader import load_lambda_module
+
+
+script = load_lambda_module(
+    "backfill_drink_log_stats_script_tests",
+    "scripts/backfill_drink_log_stats.py",
+)
+drink_logs = load_lambda_module(
+    "backfill_drink_log_stats_drink_logs_tests",
+    "lambda/drink-logs/index.py",
+)
+
+NOW = "2026-08-01T00:00:00.000Z"
+
+
+def _item(record_id, **overrides):
+    item = {
+        "id": record_id,
+        "user_id": "user-1",
+        "status": "complete",
+        "datetime": "2026-07-20T00:00:00.000Z",
+        "brand_text": "アードベッグ 10年",
+        "brand_source": "ai",
+        "brand_key": "ardbeg",
+        "serving_style": "NEAT",
+        "store": {"name": "Bar", "place_id": "place-1"},
+        "updated_at": "2026-07-20T00:00:00.000Z",
+    }
+    item.update(overrides)
+    return item
+
+
+def _tables():
+    dynamodb = boto3.resource("dynamodb", region_name="ap-northeast-1")
+    for name, key in (("DrinkLogs-test", "id"), ("AppState-test", "pk")):
+        dynamodb.create_table(
+            TableName=name,
+            KeySchema=[{"AttributeName": key, "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": key, "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+    return dynamodb
+
+
+def _counters(dynamodb):
+    owner = "drinklog-stats#user#user-1#"
+    return {
+        item["pk"].removeprefix(owner): int(item["count"])
+        for item in dynamodb.Table("AppState-test").scan()["Items"]
+    }
+
+
+def test_target_is_required_and_default_is_dry_run():
+    with pytest.raises(SystemExit):
+        script.parse_args([])
+    assert script.parse_args(["--target", "local"]).apply is False
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"brand_source": "manual", "brand_key": None},
+        {"brand_key": None, "store": {"name": ""}, "serving_style": None},
+    ],
+)
+def test_expected_keys_match_what_the_lambda_counts(overrides):
+    item = _item("a", **overrides)
+
+    assert script.expected_stats_keys(item) == drink_logs._stats_keys(item)
+
+
+def test_legacy_normalized_brand_key_counts_under_its_text():
+    item = _item("a", brand_key="あーどべっぐ10年")
+
+    assert script.expected_stats_keys(item)[1] == "brand_text#あーどべっぐ10年"
+
+
+def test_backfill_counts_uncounted_records_and_rekeys_old_brand_counters():
+    with mock_aws():
+        dynamodb = _tables()
+        logs = dynamodb.Table("DrinkLogs-test")
+        logs.put_item(Item=_item("uncounted"))
+        logs.put_item(
+            Item=_item(
+                "old-format",
+                brand_text="Talisker 10",
+                brand_source="manual",
+                brand_key=None,
+                serving_style="SODA",
+                stats_keys=["total", "brand#talisker10", "style#SODA", "month#2026-07"],
+            )
+        )
+        logs.put_item(Item=_item("pending", status="pending"))
+        for key, count in (("total", 1), ("brand#talisker10", 1), ("style#SODA", 1), ("month#2026-07", 1)):
+            dynamodb.Table("AppState-test").put_item(
+                Item={
+                    "pk": f"drinklog-stats#user#user-1#{key}",
+                    "stats_owner": "drinklog-stats#user#user-1",
+                    "count": count,
+                }
+            )
+
+        dry_run = script.backfill(dynamodb, "DrinkLogs-test", "AppState-test", apply=False, now=NOW)
+        assert dry_run == {"scanned": 3, "planned": 2, "updated": 0, "skipped": 0}
+        assert "stats_keys" not in logs.get_item(Key={"id": "uncounted"})["Item"]
+
+        counts = script.backfill(dynamodb, "DrinkLogs-test", "AppState-test", apply=True, now=NOW)
+
+        assert counts == {"scanned": 3, "planned": 2, "updated": 2, "skipped": 0}
+        assert logs.get_item(Key={"id": "uncounted"})["Item"]["stats_keys"] == [
+            "total",
+            "brand#ardbeg",
+            "place#place-1",
+            "style#NEAT",
+            "month#2026-07",
+        ]
+        assert _counters(dynamodb) == {
+            "total": 2,
+            "brand#ardbeg": 1,
+            "brand#talisker10": 0,
+            "brand_text#talisker10": 1,
+            "place#place-1": 2,
+            "style#NEAT": 1,
+            "style#SODA": 1,
+            "month#2026-07": 2,
+        }
+        counter = dynamodb.Table("AppState-test").get_item(
+            Key={"pk": "drinklog-stats#user#user-1#brand#ardbeg"}
+        )["Item"]
+        assert counter["stats_owner"] == "drinklog-stats#user#user-1"
+        # A second run finds every record already counted.
+        rerun = script.backfill(dynamodb, "DrinkLogs-test", "AppState-test", apply=True, now=NOW)
+        assert rerun["planned"] == 0
+
+
+def test_record_changed_since_the_scan_is_skipped_without_counting():
+    with mock_aws():
+        dynamodb = _tables()
+        logs = dynamodb.Table("DrinkLogs-test")
+        scanned = _item("edited")
+        logs.put_item(Item={**scanned, "updated_at": "2026-07-21T00:00:00.000Z"})
+
+        updated = script.apply_update(
+            dynamodb.meta.client,
+            "DrinkLogs-test",
+            "AppState-test",
+            scanned,
+            script.expected_stats_keys(scanned),
+            NOW,
+        )
+
+        assert updated is False
+        assert "stats_keys" not in logs.get_item(Key={"id": "edited"})["Item"]
+        assert _counters(dynamodb) == {}
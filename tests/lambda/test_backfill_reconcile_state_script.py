@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from tests.lambda_module_loader import load_lambda_module
+
+
+script = load_lambda_module(
+    "backfill_reconcile_state_script_tests",
+    "scripts/backfill_reconcile_state.py",
+)
+
+
+class ConditionalFailed(Exception):
+    pass
+
+
+def test_expected_state_matches_the_reconciler_backlog():
+    assert script.expected_reconcile_state({"status": "pending"}) == "pending"
+    assert script.expected_reconcile_state({"status": "deleting"}) == "deleting"
+    residual = {"status": "complete", "tmp_s3_key": "tmp/user-1/a.png"}
+    assert script.expected_reconcile_state(residual) == "tmp"
+    assert script.expected_reconcile_state({"status": "complete"}) is None
+
+
+def test_backfill_sets_and_removes_states_and_skips_conflicts():
+    table = Mock()
+    table.meta = SimpleNamespace(
+        client=SimpleNamespace(
+            exceptions=SimpleNamespace(ConditionalCheckFailedException=ConditionalFailed)
+        )
+    )
+    table.scan.side_effect = [
+        {
+            "Items": [
+                {"id": "pending", "status": "pending"},
+                {"id": "indexed", "status": "deleting", "reconcile_state": "deleting"},
+                {"id": "clean", "status": "complete"},
+            ],
+            "LastEvaluatedKey": {"id": "clean"},
+        },
+        {
+            "Items": [
+                {"id": "residual", "status": "complete", "tmp_s3_key": "tmp/user-1/a.png"},
+                {"id": "stale", "status": "complete", "reconcile_state": "tmp"},
+            ]
+        },
+    ]
+    table.update_item.side_effect = [None, ConditionalFailed(), None]
+
+    counts = script.backfill(table, apply=True)
+
+    assert counts == {"scanned": 5, "planned": 3, "updated": 2, "skipped": 1}
+    assert table.scan.call_args_list[1].kwargs["ExclusiveStartKey"] == {"id": "clean"}
+    pending, residual, stale = (call.kwargs for call in table.update_item.call_args_list)
+    assert pending["ConditionExpression"] == "#status = :status"
+    assert pending["ExpressionAttributeValues"] == {":status": "pending", ":state": "pending"}
+    assert residual["ConditionExpression"] == "#status = :status AND tmp_s3_key = :tmp"
+    assert residual["ExpressionAttributeValues"][":state"] == "tmp"
+    assert stale["UpdateExpression"] == "REMOVE reconcile_state"
+    assert stale["ConditionExpression"] == (
+        "#status = :status AND attribute_not_exists(tmp_s3_key)"
+    )
+
+
+def test_dry_run_never_writes():
+    table = Mock()
+    table.scan.return_value = {"Items": [{"id": "pending", "status": "pending"}]}
+
+    assert script.backfill(table, apply=False)["planned"] == 1
+    table.update_item.assert_not_called()
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from tests.lambda_module_loader import load_lambda_module
+
+
+script = load_lambda_module(
+    "backfill_timeline_filter_keys_script_tests",
+    "scripts/backfill_timeline_filter_keys.py",
+)
+drink_logs = load_lambda_module(
+    "backfill_timeline_filter_keys_drink_logs_tests",
+    "lambda/drink-logs/index.py",
+)
+
+
+class ConditionalFailed(Exception):
+    pass
+
+
+def _item(record_id, **overrides):
+    item = {
+        "id": record_id,
+        "user_id": "user-1",
+        "status": "complete",
+        "brand_text": "アードベッグ 10年",
+        "brand_source": "ai",
+        "brand_key": "ardbeg",
+        "store": {"name": "Bar", "place_id": "place-1"},
+        "updated_at": "2026-07-20T00:00:00Z",
+    }
+    item.update(overrides)
+    return item
+
+
+def test_target_is_required_and_default_is_dry_run():
+    with pytest.raises(SystemExit):
+        script.parse_args([])
+    assert script.parse_args(["--target", "local"]).apply is False
+
+
+def test_expected_keys_match_what_the_lambda_writes():
+    item = _item("a")
+    sets, removes = drink_logs._timeline_filter_keys(
+        "user-1",
+        {"brand_key": item["brand_key"], "place_id": item["store"]["place_id"]},
+    )
+    assert script.expected_filter_keys(item) == sets
+    assert removes == []
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        # The earlier format keyed the index on the normalized brand_text.
+        {"brand_key": "あーどべっぐ10年"},
+        # A hand-typed name does not name the catalog brand it replaced.
+        {"brand_source": "manual"},
+    ],
+)
+def test_non_catalog_brand_keys_are_removed(overrides):
+    item = _item("a", **overrides)
+    item["user_brand_key"] = f"user-1#{item['brand_key']}"
+
+    assert script.plan_update(item) == ({"user_place_key": "user-1#place-1"}, ["brand_key", "user_brand_key"])
+
+
+def test_catalog_brand_keys_come_from_the_analyze_catalog():
+    assert {"ardbeg", "caol_ila", "talisker"} <= script.CATALOG_BRAND_KEYS
+
+
+def test_backfill_plans_only_stale_complete_records_and_skips_conflicts():
+    current = _item("current")
+    current.update(script.expected_filter_keys(current))
+    renamed = _item("renamed", brand_text="", store={"name": ""})
+    renamed.update(brand_key="old", user_brand_key="user-1#old")
+    table = Mock()
+    table.meta = SimpleNamespace(
+        client=SimpleNamespace(
+            exceptions=SimpleNamespace(ConditionalCheckFailedException=ConditionalFailed)
+        )
+    )
+    table.scan.side_effect = [
+        {
+            "Items": [_item("missing"), _item("pending", status="pending"), current],
+            "LastEvaluatedKey": {"id": "current"},
+        },
+        {"Items": [renamed]},
+    ]
+    table.update_item.side_effect = [None, ConditionalFailed()]
+
+    counts = script.backfill(table, apply=True)
+
+    assert counts == {"scanned": 4, "planned": 2, "updated": 1, "skipped": 1}
+    assert table.scan.call_args_list[1].kwargs == {"ExclusiveStartKey": {"id": "current"}}
+    first, second = (call.kwargs for call in table.update_item.call_args_list)
+    assert first["Key"] == {"id": "missing"}
+    assert first["ExpressionAttributeValues"][":user_place_key"] == "user-1#place-1"
+    assert first["ExpressionAttributeValues"][":updated_at"] == "2026-07-20T00:00:00Z"
+    assert second["UpdateExpression"] == "REMOVE brand_key, user_brand_key"
+
+
+def test_dry_run_never_writes():
+    table = Mock()
+    table.scan.return_value = {"Items": [_item("missing")]}
+
+    assert script.backfill(table, apply=False)["planned"] == 1
+    table.update_item.assert_not_called()
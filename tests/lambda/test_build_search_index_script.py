@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from tests.lambda_module_loader import load_lambda_module
+
+
+script = load_lambda_module(
+    "build_search_index_script_tests",
+    "scripts/build_search_index.py",
+)
+from whiskey_common.search_index import load_artifact
+
+
+def test_target_is_required():
+    with pytest.raises(SystemExit):
+        script.parse_args([])
+    assert script.parse_args(["--target", "local"]).output == script.DEFAULT_OUTPUT
+
+
+def test_artifact_is_built_from_every_scan_page_with_display_fields():
+    table = Mock()
+    table.scan.side_effect = [
+        {
+            "Items": [{"id": "w1", "name": "山崎 12年", "confidence": Decimal("0.9")}],
+            "LastEvaluatedKey": {"id": "w1"},
+        },
+        {"Items": [{"id": "w2", "name": "Hibiki", "confidence": Decimal("1")}]},
+    ]
+
+    data = script.build_artifact(
+        table,
+        "WhiskeySearch-dev",
+        now=datetime(2026, 1, 2, tzinfo=timezone.utc),
+    )
+    index, header = load_artifact(data)
+
+    assert header["table_name"] == "WhiskeySearch-dev"
+    assert header["built_at"] == "2026-01-02T00:00:00Z"
+    assert header["catalog_version"] is None
+    assert [document["id"] for document in index.documents] == ["w2", "w1"]
+    assert index.documents[1]["confidence"] == 0.9
+    assert table.scan.call_args_list[1].kwargs["ExclusiveStartKey"] == {"id": "w1"}
+    assert set(table.scan.call_args_list[0].kwargs["ExpressionAttributeNames"].values()) == set(
+        script.DOCUMENT_FIELDS
+    )
+
+
+def test_main_writes_artifact_to_output(monkeypatch, tmp_path):
+    monkeypatch.delenv("WHISKEY_SEARCH_TABLE", raising=False)
+    monkeypatch.delenv("APP_STATE_TABLE", raising=False)
+    table = Mock()
+    table.scan.return_value = {"Items": [{"id": "w1", "name": "Hibiki"}]}
+    app_state = Mock()
+    app_state.get_item.return_value = {"Item": {"version": 4}}
+    dynamodb = Mock()
+    dynamodb.Table.side_effect = lambda name: app_state if name == "AppState-local" else table
+    monkeypatch.setattr(script, "create_dynamodb_resource", lambda target: dynamodb)
+    output = tmp_path / "search-index.idx"
+
+    assert script.main(["--target", "local", "--output", str(output)]) == 0
+
+    dynamodb.Table.assert_any_call("WhiskeySearch-local")
+    header = load_artifact(output.read_bytes())[1]
+    assert header["item_count"] == 1
+    assert header["catalog_version"] == 4
+    assert app_state.get_item.call_args.kwargs["Key"] == {"pk": "catalog-version#WhiskeySearch-local"}
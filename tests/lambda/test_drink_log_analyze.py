@@ -1,5 +1,7 @@
 import io
 import json
+import threading
+import time
 import uuid
 from decimal import Decimal
 from pathlib import Path
@@ -87,6 +89,7 @@ class MemoryS3:
         self.body = body
         self.etag = etag
         self.get_calls = []
+        self.put_calls = []
 
     def head_object(self, *, Bucket, Key):
         assert Bucket == "images-test"
@@ -107,6 +110,10 @@ class MemoryS3:
         assert kwargs["IfMatch"] == self.etag
         return {"Body": io.BytesIO(self.body)}
 
+    def put_object(self, **kwargs):
+        self.put_calls.append(kwargs)
+        return {"ETag": '"normalized-etag"'}
+
 
 class Context:
     aws_request_id = "request-1"
@@ -146,6 +153,40 @@ class Bedrock:
         return {"output": {"message": {"content": [{"text": text}]}}}
 
 
+class EventStream:
+    def __init__(self, events):
+        self.events = list(events)
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for event in self.events:
+            self.consumed += 1
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingBedrock:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.calls = []
+        self.streams = []
+
+    def converse(self, **kwargs):
+        raise AssertionError("streaming was enabled")
+
+    def converse_stream(self, **kwargs):
+        self.calls.append(kwargs)
+        events = [{"messageStart": {"role": "assistant"}}]
+        events += [{"contentBlockDelta": {"delta": {"text": chunk}}} for chunk in self.chunks]
+        events += [{"contentBlockStop": {}}, {"messageStop": {"stopReason": "end_turn"}}]
+        stream = EventStream(events)
+        self.streams.append(stream)
+        return {"stream": stream}
+
+
 @pytest.fixture(autouse=True)
 def environment(monkeypatch):
     analyze._reset_master_cache()
@@ -168,6 +209,8 @@ def environment(monkeypatch):
         "ANALYZE_GLOBAL_MONTHLY_LIMIT": "1000",
         "IMAGE_MAX_BYTES": "1572864",
         "UPLOAD_MAX_BYTES": "3670016",
+        # Sequential-scan tests opt out; segmented tests set their own count.
+        "MASTER_SNAPSHOT_SEGMENTS": "1",
     }
     for name, value in values.items():
         monkeypatch.setenv(name, value)
@@ -176,16 +219,24 @@ def environment(monkeypatch):
 
 
 def _snapshot(items, *, complete=True):
+    catalog = analyze.CatalogIndex()
+    for item in items:
+        catalog.add(item)
     return {
         "table_name": "WhiskeySearch-test",
         "expires_at": analyze.time.monotonic() + 300,
-        "items": tuple(analyze._snapshot_record(item) for item in items),
+        "catalog": catalog,
         "complete": complete,
         "incomplete_reason": None if complete else "scan_error",
         "page_count": 1,
     }
 
 
+def _patch_brand_catalog(monkeypatch, brands):
+    monkeypatch.setattr(analyze, "BRAND_CATALOG", brands)
+    monkeypatch.setattr(analyze, "BRAND_NAME_INDEX", analyze._name_index(brands, "brand_key"))
+
+
 def _analysis(whiskeys, serving_style="NEAT", glass_type="tumbler"):
     return {
         "whiskeys": whiskeys,
@@ -738,9 +789,8 @@ def test_unmatched_brand_omits_catalog_brand_keys():
 def test_brand_without_distillery_keeps_brand_key_and_omits_distillery(monkeypatch):
     # Synthetic rather than a real catalog row: whether any given brand has a
     # known distillery is data that changes, but the guard must not.
-    monkeypatch.setattr(
-        analyze,
-        "BRAND_CATALOG",
+    _patch_brand_catalog(
+        monkeypatch,
         (
             {
                 "brand_key": "unverified_brand",
@@ -794,6 +844,20 @@ def test_real_brand_catalog_has_no_normalized_name_collisions():
     assert len(analyze.BRAND_CATALOG) == 60
 
 
+def test_catalog_match_is_an_index_lookup_over_a_large_snapshot():
+    items = [
+        {"id": f"w{number}", "name_ja": f"銘柄{number}", "name_en": f"Brand {number}"}
+        for number in range(20_000)
+    ]
+    snapshot = _snapshot(items + [CAOL_ILA_ITEM])
+
+    assert len(snapshot["catalog"]) == 20_001
+    assert analyze._catalog_match(snapshot, _whiskey("カリラ 12年")) == "caol-ila-12"
+    assert analyze._catalog_match(snapshot, _whiskey("銘柄19999")) == "w19999"
+    # Names that point at two different ids stay ambiguous.
+    assert analyze._catalog_match(snapshot, _whiskey("銘柄1", "Brand 2")) is None
+
+
 def test_duplicate_exact_catalog_names_do_not_attach_an_arbitrary_id():
     snapshot = _snapshot(
         [
@@ -813,9 +877,8 @@ def test_duplicate_exact_catalog_names_do_not_attach_an_arbitrary_id():
 
 def test_duplicate_normalized_brand_names_do_not_attach_arbitrary_keys(monkeypatch):
     normalized_name = analyze.normalize_text("Same Brand")
-    monkeypatch.setattr(
-        analyze,
-        "BRAND_CATALOG",
+    _patch_brand_catalog(
+        monkeypatch,
         (
             {
                 "brand_key": "duplicate_brand_1",
@@ -921,6 +984,83 @@ def test_handler_saves_exact_model_text_decimal_and_round_trips_to_create(monkey
     assert consume["Delete"]["ExpressionAttributeValues"][":candidate"] == saved["candidates"][0]
 
 
+def test_normalized_image_is_stored_for_create_and_bound_to_the_upload(monkeypatch):
+    upload_uuid = "12345678-1234-4234-8234-123456789abc"
+    key = f"tmp/user-1/{upload_uuid}.png"
+    s3 = MemoryS3(key, _png_bytes())
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([])])
+    _wire_handler(monkeypatch, dynamodb, s3, bedrock)
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 200
+    put, display, thumbnail = sorted(s3.put_calls, key=lambda call: len(call["Key"]))
+    assert put["Key"] == f"tmp/user-1/{upload_uuid}.analyzed.jpg"
+    assert display["Key"] == f"tmp/user-1/{upload_uuid}.analyzed.display.jpg"
+    assert thumbnail["Key"] == f"tmp/user-1/{upload_uuid}.analyzed.thumbnail.jpg"
+    assert put["Body"] == bedrock.calls[0]["messages"][0]["content"][0]["image"]["source"]["bytes"]
+    for stored in (put, display, thumbnail):
+        assert not analyze.UPLOAD_KEY_RE.fullmatch(stored["Key"])
+        assert stored["Metadata"] == {"source-etag": '"etag-1"', "source-format": "png"}
+    saved = dynamodb.app.items[f"ai-result:user-1:{upload_uuid}"]
+    assert saved["normalized_s3_key"] == put["Key"]
+
+
+def test_rendition_failure_keeps_the_stored_normalized_image(monkeypatch):
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+
+    class NoRenditionS3(MemoryS3):
+        def put_object(self, **kwargs):
+            if kwargs["Key"].endswith(".analyzed.display.jpg"):
+                raise ClientError({"Error": {"Code": "SlowDown"}}, "PutObject")
+            return super().put_object(**kwargs)
+
+    dynamodb = FakeDynamoDB()
+    s3 = NoRenditionS3(key, _png_bytes())
+    _wire_handler(monkeypatch, dynamodb, s3, Bedrock([_model_json([])]))
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 200
+    [put] = s3.put_calls
+    analysis_id = json.loads(response["body"])["analysis_id"]
+    assert dynamodb.app.items[analysis_id]["normalized_s3_key"] == put["Key"]
+
+
+def test_over_limit_request_stores_no_normalized_image(monkeypatch):
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    monkeypatch.setenv("ANALYZE_USER_DAILY_LIMIT", "0")
+    s3 = MemoryS3(key, _png_bytes())
+    bedrock = Bedrock([])
+    _wire_handler(monkeypatch, FakeDynamoDB(), s3, bedrock)
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 429
+    assert s3.put_calls == []
+    assert bedrock.calls == []
+
+
+def test_failed_normalized_image_store_does_not_fail_the_analysis(monkeypatch):
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+
+    class FailingPutS3(MemoryS3):
+        def put_object(self, **kwargs):
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "PutObject")
+
+    dynamodb = FakeDynamoDB()
+    _wire_handler(
+        monkeypatch, dynamodb, FailingPutS3(key, _png_bytes()), Bedrock([_model_json([])])
+    )
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 200
+    analysis_id = json.loads(response["body"])["analysis_id"]
+    assert "normalized_s3_key" not in dynamodb.app.items[analysis_id]
+
+
 def test_two_whiskeys_create_two_candidates_and_multiple_detected(monkeypatch):
     key = f"tmp/user-1/{uuid.uuid4()}.png"
     dynamodb = FakeDynamoDB(
@@ -981,7 +1121,7 @@ def test_empty_whiskeys_returns_zero_candidates_with_200(monkeypatch):
     assert response["statusCode"] == 200
     assert body["candidates"] == []
     assert body["multiple_detected"] is False
-    assert next(iter(dynamodb.app.items.values()))["candidates"] == []
+    assert dynamodb.app.items[body["analysis_id"]]["candidates"] == []
 
 
 def test_candidate_resolution_log_contains_counts_but_no_whiskey_names(monkeypatch, caplog):
@@ -1064,6 +1204,54 @@ def test_mock_ai_output_uses_valid_new_schema(monkeypatch):
     assert analyze._validate_model_output(result) == result
 
 
+def test_streamed_output_stops_reading_once_the_json_object_closes(monkeypatch, caplog):
+    monkeypatch.setenv("BEDROCK_STREAMING", "1")
+    bedrock = StreamingBedrock(
+        [
+            "```json\n{\"whiskeys\":[{\"name_ja\":\"響 {17}\",",
+            "\"name_en\":\"Hibiki \\\"}\\\"\",\"confidence\":0.8}],",
+            "\"serving_style\":\"NEAT\",\"glass_type\":\"tumbler\"}",
+            "\n```\nThe label is partly hidden.",
+        ]
+    )
+    monkeypatch.setattr(analyze, "_bedrock_client", lambda timeout: bedrock)
+    logger = analyze.get_logger("drink-log-analyze")
+
+    with caplog.at_level("INFO", logger="drink-log-analyze"):
+        result = analyze._invoke_model(
+            SONNET_MODEL_ID, b"jpeg", Context(), analyze.time.monotonic(), logger
+        )
+
+    assert result["whiskeys"][0]["name_ja"] == "響 {17}"
+    assert result["whiskeys"][0]["name_en"] == 'Hibiki "}"'
+    assert bedrock.calls[0]["inferenceConfig"] == {"maxTokens": 512, "temperature": 0}
+    stream = bedrock.streams[0]
+    assert stream.closed is True
+    assert stream.consumed == 4
+    assert "Model stream finished" in caplog.text
+    assert '"time_to_first_token_ms"' in caplog.text
+    assert '"closed_early": true' in caplog.text
+
+
+def test_streamed_output_is_validated_and_retried_like_converse(monkeypatch):
+    monkeypatch.setenv("BEDROCK_STREAMING", "1")
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    dynamodb = FakeDynamoDB(whiskeys=WhiskeyTable(items=[]))
+    invalid = StreamingBedrock(['{"brand_candidates":[],"serving_style":"NEAT",', '"glass_type":""}'])
+    truncated = StreamingBedrock(['{"whiskeys":[],"serving_style":"NEAT"'])
+    clients = iter([invalid, truncated])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), None)
+    monkeypatch.setattr(analyze, "_bedrock_client", lambda timeout: next(clients))
+
+    response = analyze.lambda_handler(_event(key), Context())
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert body["candidates"] == []
+    assert invalid.streams[0].closed and truncated.streams[0].closed
+    assert truncated.streams[0].consumed == len(truncated.streams[0].events)
+
+
 def test_master_snapshot_reads_every_page_and_uses_required_projection():
     pages = [
         {"Items": [{"id": "one", "name": "One"}], "LastEvaluatedKey": {"id": "one"}},
@@ -1076,7 +1264,7 @@ def test_master_snapshot_reads_every_page_and_uses_required_projection():
 
     assert snapshot["complete"] is True
     assert snapshot["page_count"] == 3
-    assert len(snapshot["items"]) == 3
+    assert len(snapshot["catalog"]) == 3
     assert len(table.scan_calls) == 3
     assert table.scan_calls[1]["ExclusiveStartKey"] == {"id": "one"}
     assert table.scan_calls[2]["ExclusiveStartKey"] == {"id": "two"}
@@ -1085,6 +1273,92 @@ def test_master_snapshot_reads_every_page_and_uses_required_projection():
     )
 
 
+class SegmentedWhiskeyTable:
+    """Parallel-scan fake: rows are dealt to segments, two rows per page."""
+
+    def __init__(self, rows, page_delay=0.0):
+        self.rows = rows
+        self.page_delay = page_delay
+        self.scan_calls = []
+        self.lock = threading.Lock()
+
+    def scan(self, **kwargs):
+        with self.lock:
+            self.scan_calls.append(kwargs)
+        time.sleep(self.page_delay)
+        segment_rows = self.rows[kwargs["Segment"] :: kwargs["TotalSegments"]]
+        start = (kwargs.get("ExclusiveStartKey") or {}).get("offset", 0)
+        response = {"Items": [dict(row) for row in segment_rows[start : start + 2]]}
+        if start + 2 < len(segment_rows):
+            response["LastEvaluatedKey"] = {"offset": start + 2}
+        return response
+
+
+def _catalog_rows(count):
+    return [{"id": f"w{number}", "name_ja": f"銘柄{number}"} for number in range(count)]
+
+
+def test_segmented_snapshot_scans_every_segment_in_parallel(monkeypatch, caplog):
+    monkeypatch.setenv("MASTER_SNAPSHOT_SEGMENTS", "4")
+    table = SegmentedWhiskeyTable(_catalog_rows(16), page_delay=0.05)
+    logger = analyze.get_logger("drink-log-analyze")
+
+    started = time.monotonic()
+    with caplog.at_level("INFO", logger="drink-log-analyze"):
+        snapshot = analyze._get_master_snapshot(table, "WhiskeySearch-test", logger)
+    elapsed = time.monotonic() - started
+
+    assert snapshot["complete"] is True
+    assert snapshot["incomplete_reason"] is None
+    assert snapshot["page_count"] == 8
+    assert len(snapshot["catalog"]) == 16
+    assert analyze._catalog_match(snapshot, _whiskey("銘柄13")) == "w13"
+    assert {(call["Segment"], call["TotalSegments"]) for call in table.scan_calls} == {
+        (segment, 4) for segment in range(4)
+    }
+    # Eight 50 ms pages: sequential would take 400 ms, four segments about 100 ms.
+    assert elapsed < 0.3
+    assert '"segment_timings_ms"' in caplog.text
+    assert '"segment_page_counts": [2, 2, 2, 2]' in caplog.text
+
+
+@pytest.mark.parametrize(
+    "limit_name, limit, reason",
+    [
+        ("MASTER_SNAPSHOT_MAX_PAGES", 5, "max_pages"),
+        ("MASTER_SNAPSHOT_MAX_ITEMS", 9, "max_items"),
+    ],
+)
+def test_segmented_snapshot_shares_caps_across_segments(monkeypatch, limit_name, limit, reason):
+    monkeypatch.setenv("MASTER_SNAPSHOT_SEGMENTS", "4")
+    monkeypatch.setattr(analyze, limit_name, limit)
+    table = SegmentedWhiskeyTable(_catalog_rows(16))
+
+    snapshot = analyze._build_master_snapshot(table, "WhiskeySearch-test")
+
+    assert snapshot["complete"] is False
+    assert snapshot["incomplete_reason"] == reason
+    assert snapshot["page_count"] <= analyze.MASTER_SNAPSHOT_MAX_PAGES
+    assert len(snapshot["catalog"]) <= analyze.MASTER_SNAPSHOT_MAX_ITEMS
+
+
+def test_segment_scan_error_marks_snapshot_uncacheable(monkeypatch):
+    monkeypatch.setenv("MASTER_SNAPSHOT_SEGMENTS", "2")
+
+    class FailingSegmentTable(SegmentedWhiskeyTable):
+        def scan(self, **kwargs):
+            if kwargs["Segment"] == 1:
+                raise ClientError({"Error": {"Code": "ThrottlingException"}}, "Scan")
+            return super().scan(**kwargs)
+
+    snapshot = analyze._get_master_snapshot(
+        FailingSegmentTable(_catalog_rows(4)), "WhiskeySearch-test"
+    )
+
+    assert snapshot["incomplete_reason"] == "scan_error"
+    assert analyze._MASTER_CACHE is None
+
+
 def test_master_snapshot_cache_is_reused(monkeypatch):
     key = f"tmp/user-1/{uuid.uuid4()}.png"
     whiskey_table = WhiskeyTable()
@@ -1099,6 +1373,66 @@ def test_master_snapshot_cache_is_reused(monkeypatch):
     assert len(whiskey_table.scan_calls) == 1
 
 
+class VersionedAppStateTable(AppStateTable):
+    def __init__(self, version=None):
+        super().__init__()
+        self.version = version
+        self.get_calls = []
+
+    def get_item(self, *, Key, **kwargs):
+        self.get_calls.append(Key)
+        if Key["pk"] == "catalog-version#WhiskeySearch-test" and self.version is not None:
+            return {"Item": {"pk": Key["pk"], "version": Decimal(self.version)}}
+        return super().get_item(Key=Key, **kwargs)
+
+
+def _expire_master_cache():
+    analyze._MASTER_CACHE = {**analyze._MASTER_CACHE, "expires_at": 0.0}
+
+
+def test_expired_snapshot_is_revalidated_with_one_get_item_when_version_is_unchanged():
+    whiskey_table = WhiskeyTable()
+    app_state = VersionedAppStateTable(version=3)
+
+    first = analyze._get_master_snapshot(whiskey_table, "WhiskeySearch-test", None, app_state)
+    _expire_master_cache()
+    second = analyze._get_master_snapshot(whiskey_table, "WhiskeySearch-test", None, app_state)
+
+    assert len(whiskey_table.scan_calls) == 1
+    assert first["catalog_version"] == second["catalog_version"] == 3
+    assert second["catalog"] is first["catalog"]
+    assert second["expires_at"] > analyze.time.monotonic()
+    assert app_state.get_calls == [{"pk": "catalog-version#WhiskeySearch-test"}] * 2
+
+
+def test_expired_snapshot_is_rebuilt_when_the_catalog_version_changes():
+    whiskey_table = WhiskeyTable()
+    app_state = VersionedAppStateTable(version=3)
+    analyze._get_master_snapshot(whiskey_table, "WhiskeySearch-test", None, app_state)
+    _expire_master_cache()
+    app_state.version = 4
+
+    snapshot = analyze._get_master_snapshot(whiskey_table, "WhiskeySearch-test", None, app_state)
+
+    assert len(whiskey_table.scan_calls) == 2
+    assert snapshot["catalog_version"] == 4
+
+
+def test_missing_or_unreadable_catalog_version_falls_back_to_a_rescan():
+    class FailingAppStateTable(AppStateTable):
+        def get_item(self, *, Key, **kwargs):
+            raise ClientError({"Error": {"Code": "AccessDeniedException"}}, "GetItem")
+
+    whiskey_table = WhiskeyTable()
+    for app_state in (VersionedAppStateTable(), FailingAppStateTable()):
+        analyze._get_master_snapshot(whiskey_table, "WhiskeySearch-test", None, app_state)
+        _expire_master_cache()
+
+    analyze._get_master_snapshot(whiskey_table, "WhiskeySearch-test", None, VersionedAppStateTable())
+
+    assert len(whiskey_table.scan_calls) == 3
+
+
 def test_scan_failure_degrades_to_ai_without_500_and_is_not_cached(monkeypatch, caplog):
     key = f"tmp/user-1/{uuid.uuid4()}.png"
 
@@ -1354,29 +1688,149 @@ def test_analysis_budget_retries_a_transaction_conflict(monkeypatch):
 
 
 def test_low_budget_skips_the_catalog_scan_and_still_returns_200(monkeypatch):
-    """The post-invoke scan must not be able to push the handler past timeout.
-
-    _get_master_snapshot can cost up to MASTER_SNAPSHOT_MAX_PAGES sequential
-    round trips on a cold container, and it runs after the model call. Without
-    a budget check it can exceed the Lambda timeout, which the client sees as a
-    502 rather than a record saved with no catalog id.
-    """
+    """A request without budget for the scan must not start one."""
     upload_uuid = "12345678-1234-4234-8234-123456789abc"
     key = f"tmp/user-1/{upload_uuid}.png"
     dynamodb = FakeDynamoDB()
     bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])])
     _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
 
-    # Enough budget for the model call, not enough for the scan afterwards.
-    response = analyze.lambda_handler(_event(key), SequencedContext([28_000, 28_000, 1_000]))
+    # Too little budget when the scan would start, enough for the model call.
+    response = analyze.lambda_handler(_event(key), SequencedContext([1_000, 28_000, 28_000]))
 
     assert response["statusCode"] == 200
+    assert len(bedrock.calls) == 1
     assert dynamodb.whiskeys.scan_calls == []
     body = json.loads(response["body"])
     assert [candidate["match_source"] for candidate in body["candidates"]] == ["ai"]
     assert "whiskey_id" not in body["candidates"][0]
 
 
+class BlockingWhiskeyTable(WhiskeyTable):
+    def __init__(self, items=None, delay=None):
+        super().__init__(items)
+        self.release = threading.Event()
+        self.delay = delay
+
+    def scan(self, **kwargs):
+        if self.delay is None:
+            self.release.wait(5)
+        else:
+            time.sleep(self.delay)
+        return super().scan(**kwargs)
+
+
+class SlowBedrock(Bedrock):
+    def __init__(self, texts, delay):
+        super().__init__(texts)
+        self.delay = delay
+
+    def converse(self, **kwargs):
+        time.sleep(self.delay)
+        return super().converse(**kwargs)
+
+
+def test_catalog_scan_overlaps_the_model_call(monkeypatch):
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    dynamodb = FakeDynamoDB(whiskeys=BlockingWhiskeyTable([CAOL_ILA_ITEM], delay=0.2))
+    bedrock = SlowBedrock([_model_json([_whiskey("カリラ 12年")])], delay=0.2)
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    started = time.monotonic()
+    response = analyze.lambda_handler(_event(key), Context())
+    elapsed = time.monotonic() - started
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["candidates"][0]["whiskey_id"] == "caol-ila-12"
+    # Sequential would take at least 0.4 s: the scan runs during the model call.
+    assert elapsed < 0.35
+
+
+def test_normalized_image_store_overlaps_the_model_call(monkeypatch):
+    class SlowPutS3(MemoryS3):
+        def put_object(self, **kwargs):
+            if kwargs["Key"].endswith(".analyzed.jpg"):
+                time.sleep(0.2)
+            return super().put_object(**kwargs)
+
+    upload_uuid = "12345678-1234-4234-8234-123456789abc"
+    key = f"tmp/user-1/{upload_uuid}.png"
+    dynamodb = FakeDynamoDB()
+    s3 = SlowPutS3(key, _png_bytes())
+    bedrock = SlowBedrock([_model_json([_whiskey("カリラ 12年")])], delay=0.2)
+    _wire_handler(monkeypatch, dynamodb, s3, bedrock)
+
+    started = time.monotonic()
+    response = analyze.lambda_handler(_event(key), Context())
+    elapsed = time.monotonic() - started
+
+    assert response["statusCode"] == 200
+    saved = dynamodb.app.items[f"ai-result:user-1:{upload_uuid}"]
+    assert saved["normalized_s3_key"] == f"tmp/user-1/{upload_uuid}.analyzed.jpg"
+    # Sequential would take at least 0.4 s: the store runs during the model call.
+    assert elapsed < 0.35
+
+
+def test_renditions_are_stored_while_the_model_call_runs(monkeypatch):
+    model_called = threading.Event()
+    overlapped = []
+
+    class WaitingS3(MemoryS3):
+        def put_object(self, **kwargs):
+            if kwargs["Key"].endswith(".display.jpg"):
+                overlapped.append(model_called.wait(1))
+            return super().put_object(**kwargs)
+
+    class SignallingBedrock(Bedrock):
+        def converse(self, **kwargs):
+            model_called.set()
+            return super().converse(**kwargs)
+
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    s3 = WaitingS3(key, _png_bytes())
+    _wire_handler(
+        monkeypatch, FakeDynamoDB(), s3, SignallingBedrock([_model_json([_whiskey("カリラ 12年")])])
+    )
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 200
+    assert overlapped == [True]
+    assert len(s3.put_calls) == 3
+
+
+def test_unfinished_scan_is_not_awaited_past_the_budget_and_still_fills_the_cache(
+    monkeypatch, caplog
+):
+    """The scan must not be able to push the handler past the Lambda timeout.
+
+    A cold scan can cost up to MASTER_SNAPSHOT_MAX_PAGES round trips. Waiting
+    on it past the budget would surface as a 502 rather than a record saved
+    with no catalog id; the scan instead finishes into the cache.
+    """
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    whiskey_table = BlockingWhiskeyTable([CAOL_ILA_ITEM])
+    dynamodb = FakeDynamoDB(whiskeys=whiskey_table)
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    try:
+        # Budget for the scan start and the model call, none left to wait.
+        with caplog.at_level("INFO", logger="drink-log-analyze"):
+            response = analyze.lambda_handler(
+                _event(key), SequencedContext([28_000, 28_000, 28_000, 1_000])
+            )
+    finally:
+        whiskey_table.release.set()
+        analyze._MASTER_SNAPSHOT_EXECUTOR.submit(lambda: None).result()
+
+    assert response["statusCode"] == 200
+    candidate = json.loads(response["body"])["candidates"][0]
+    assert candidate["match_source"] == "ai"
+    assert "Master snapshot not ready" in caplog.text
+    assert analyze._cached_master_snapshot("WhiskeySearch-test")["complete"] is True
+
+
 def test_warm_cache_is_used_even_when_the_budget_is_low(monkeypatch):
     """A cached snapshot costs nothing, so a tight budget must not discard it."""
     upload_uuid = "12345678-1234-4234-8234-123456789abc"
@@ -1397,3 +1851,450 @@ def test_warm_cache_is_used_even_when_the_budget_is_low(monkeypatch):
     assert dynamodb.whiskeys.scan_calls == []
     body = json.loads(response["body"])
     assert body["candidates"][0]["match_source"] == "catalog"
+
+
+class BatchS3(MemoryS3):
+    """Serves several uploads; keys without a body are missing."""
+
+    def __init__(self, bodies):
+        super().__init__(None, b"")
+        self.bodies = bodies
+
+    def _body(self, key):
+        body = self.bodies.get(key)
+        if body is None:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return body
+
+    def head_object(self, *, Bucket, Key):
+        assert Bucket == "images-test"
+        body = self._body(Key)
+        return {"ContentLength": len(body), "ContentType": "image/png", "ETag": self.etag}
+
+    def get_object(self, **kwargs):
+        self.get_calls.append(kwargs)
+        body = self._body(kwargs["Key"])
+        if "Range" in kwargs:
+            return {"Body": io.BytesIO(body[:16])}
+        assert kwargs["IfMatch"] == self.etag
+        return {"Body": io.BytesIO(body)}
+
+
+def _batch_event(keys):
+    event = _event(keys[0])
+    event["body"] = json.dumps({"s3_keys": keys})
+    return event
+
+
+UUID = "12345678-1234-4234-8234-123456789abc"
+
+
+def _batch_keys(count):
+    return [f"tmp/user-1/{uuid.uuid4()}.png" for _ in range(count)]
+
+
+def test_batch_reserves_budget_once_and_returns_results_in_order(monkeypatch):
+    keys = _batch_keys(3)
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])] * 3)
+    _wire_handler(monkeypatch, dynamodb, BatchS3({key: _png_bytes() for key in keys}), bedrock)
+
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+
+    assert response["statusCode"] == 200
+    results = json.loads(response["body"])["results"]
+    assert [result["s3_key"] for result in results] == keys
+    assert all(result["status"] == 200 for result in results)
+    assert [result["candidates"][0]["match_source"] for result in results] == ["catalog"] * 3
+    assert {result["analysis_id"] for result in results} == {
+        pk for pk in dynamodb.app.items if pk.startswith("ai-result:")
+    }
+    assert len(bedrock.calls) == 3
+    requests, *model_calls = dynamodb.meta.client.transactions
+    [user] = requests
+    assert user["Update"]["Key"]["pk"].split("#")[2] == "user"
+    assert user["Update"]["ExpressionAttributeValues"][":amount"] == 3
+    # user daily limit 20: at most 17 before reserving 3.
+    assert user["Update"]["ExpressionAttributeValues"][":ceiling"] == 18
+    # Global units are reserved one model call at a time.
+    assert len(model_calls) == 3
+    for transaction in model_calls:
+        assert [write["Update"]["Key"]["pk"].split("#")[2] for write in transaction] == [
+            "global",
+            "global-month",
+        ]
+        assert {write["Update"]["ExpressionAttributeValues"][":amount"] for write in transaction} == {1}
+
+
+def test_batch_reports_failed_uploads_per_image_and_reserves_only_the_rest(monkeypatch):
+    keys = _batch_keys(3)
+    bodies = {keys[0]: _png_bytes(), keys[2]: b"not an image at all"}
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])])
+    _wire_handler(monkeypatch, dynamodb, BatchS3(bodies), bedrock)
+
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+
+    assert response["statusCode"] == 200
+    results = json.loads(response["body"])["results"]
+    assert [result["status"] for result in results] == [200, 400, 400]
+    assert results[1]["error"] == "Uploaded image is missing or changed"
+    assert results[2]["fields"] == {"s3_key": "Uploaded file is not a supported image"}
+    requests, model_call = dynamodb.meta.client.transactions
+    assert requests[0]["Update"]["ExpressionAttributeValues"][":amount"] == 1
+    assert len(model_call) == 2
+    assert len(bedrock.calls) == 1
+
+
+def test_batch_model_calls_run_concurrently(monkeypatch):
+    keys = _batch_keys(4)
+    dynamodb = FakeDynamoDB()
+    bedrock = SlowBedrock([_model_json([_whiskey("カリラ 12年")])] * 4, delay=0.3)
+    _wire_handler(monkeypatch, dynamodb, BatchS3({key: _png_bytes() for key in keys}), bedrock)
+
+    started = time.monotonic()
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+    elapsed = time.monotonic() - started
+
+    assert response["statusCode"] == 200
+    assert len(bedrock.calls) == 4
+    assert elapsed < 0.9
+
+
+def test_batch_budget_rejection_fails_the_whole_request(monkeypatch):
+    keys = _batch_keys(2)
+    monkeypatch.setenv("ANALYZE_USER_DAILY_LIMIT", "1")
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([])
+    s3 = BatchS3({key: _png_bytes() for key in keys})
+    _wire_handler(monkeypatch, dynamodb, s3, bedrock)
+
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+
+    assert response["statusCode"] == 429
+    assert dynamodb.meta.client.transactions == []
+    assert bedrock.calls == []
+    assert dynamodb.app.items == {}
+    assert s3.put_calls == []
+
+
+def test_batch_image_skipped_at_the_deadline_spends_no_global_budget(monkeypatch):
+    keys = _batch_keys(2)
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([])
+    _wire_handler(monkeypatch, dynamodb, BatchS3({key: _png_bytes() for key in keys}), bedrock)
+    # Enough budget to prepare and reserve, too little to start any model call.
+    monkeypatch.setattr(analyze, "MIN_INVOKE_BUDGET_MS", 60_000)
+
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+
+    assert [result["status"] for result in json.loads(response["body"])["results"]] == [200, 200]
+    assert bedrock.calls == []
+    [requests] = dynamodb.meta.client.transactions
+    assert [write["Update"]["Key"]["pk"].split("#")[2] for write in requests] == ["user"]
+
+
+@pytest.mark.parametrize(
+    ("body", "fields"),
+    [
+        ({"s3_keys": []}, {"s3_keys": "Must list 1 to 5 temporary upload keys"}),
+        ({"s3_keys": _batch_keys(6)}, {"s3_keys": "Must list 1 to 5 temporary upload keys"}),
+        ({"s3_keys": ["photos/user-1/a.png"]}, {"s3_keys": "Must be supported temporary upload keys"}),
+        (
+            {"s3_keys": [f"tmp/user-1/{UUID}.png", f"tmp/user-1/{UUID}.jpg"]},
+            {"s3_keys": "Each upload may be listed only once"},
+        ),
+        ({"s3_keys": _batch_keys(1), "s3_key": "x"}, {"s3_key": "Field is not accepted"}),
+    ],
+)
+def test_batch_input_is_validated(monkeypatch, body, fields):
+    dynamodb = FakeDynamoDB()
+    _wire_handler(monkeypatch, dynamodb, BatchS3({}), Bedrock([]))
+    event = _event(_batch_keys(1)[0])
+    event["body"] = json.dumps(body)
+
+    response = analyze.lambda_handler(event, Context())
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["fields"] == fields
+
+
+def test_batch_rejects_a_foreign_upload_before_any_work(monkeypatch):
+    keys = _batch_keys(1) + [f"tmp/user-2/{uuid.uuid4()}.png"]
+    dynamodb = FakeDynamoDB()
+    s3 = BatchS3({key: _png_bytes() for key in keys})
+    _wire_handler(monkeypatch, dynamodb, s3, Bedrock([]))
+
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+
+    assert response["statusCode"] == 403
+    assert s3.get_calls == []
+
+
+def _cache_entries(dynamodb):
+    return {
+        pk: item for pk, item in dynamodb.app.items.items() if pk.startswith("analysis-cache#")
+    }
+
+
+def test_identical_image_is_answered_from_the_analysis_cache(monkeypatch, caplog):
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])])
+    first_key, second_key = _batch_keys(2)
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(first_key, _png_bytes()), bedrock)
+    first = analyze.lambda_handler(_event(first_key), Context())
+    [entry] = _cache_entries(dynamodb).values()
+    assert entry["prompt_version"] == analyze.PROMPT_VERSION
+    assert entry["ttl"] == entry["expires_at"]
+
+    monkeypatch.setattr(analyze, "get_s3_client", lambda: MemoryS3(second_key, _png_bytes()))
+    dynamodb.meta.client.transactions.clear()
+    with caplog.at_level("INFO"):
+        second = analyze.lambda_handler(_event(second_key), Context())
+
+    assert second["statusCode"] == 200
+    assert len(bedrock.calls) == 1
+    assert json.loads(second["body"])["candidates"] == json.loads(first["body"])["candidates"]
+    assert json.loads(second["body"])["analysis_id"] != json.loads(first["body"])["analysis_id"]
+    # Only the user's request counter; a hit spends no global model budget.
+    [transaction] = dynamodb.meta.client.transactions
+    assert [write["Update"]["Key"]["pk"].split("#")[2] for write in transaction] == ["user"]
+    assert '"cache_hits": 1' in caplog.text
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda monkeypatch: monkeypatch.setattr(analyze, "PROMPT_VERSION", "other-prompt"),
+        lambda monkeypatch: monkeypatch.setattr(
+            analyze, "_utc_now", lambda: analyze.datetime.now(analyze.timezone.utc) + analyze.timedelta(days=8)
+        ),
+    ],
+)
+def test_analysis_cache_misses_after_a_prompt_change_or_expiry(monkeypatch, change):
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])] * 2)
+    first_key, second_key = _batch_keys(2)
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(first_key, _png_bytes()), bedrock)
+    analyze.lambda_handler(_event(first_key), Context())
+
+    change(monkeypatch)
+    monkeypatch.setattr(analyze, "get_s3_client", lambda: MemoryS3(second_key, _png_bytes()))
+    analyze.lambda_handler(_event(second_key), Context())
+
+    assert len(bedrock.calls) == 2
+
+
+def test_unusable_model_output_is_not_cached(monkeypatch):
+    key = _batch_keys(1)[0]
+    dynamodb = FakeDynamoDB()
+    _wire_handler(
+        monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), Bedrock(["not json", "still not json"])
+    )
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 200
+    assert _cache_entries(dynamodb) == {}
+
+
+def test_analysis_cache_read_failure_falls_back_to_the_model(monkeypatch):
+    class UnreadableCacheTable(AppStateTable):
+        def get_item(self, *, Key, **kwargs):
+            if Key["pk"].startswith("analysis-cache#"):
+                raise ClientError({"Error": {"Code": "AccessDenied"}}, "GetItem")
+            return super().get_item(Key=Key, **kwargs)
+
+    key = _batch_keys(1)[0]
+    dynamodb = FakeDynamoDB(app=UnreadableCacheTable())
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    response = analyze.lambda_handler(_event(key), Context())
+
+    assert response["statusCode"] == 200
+    assert len(bedrock.calls) == 1
+
+
+def test_batch_cache_hits_skip_the_model_and_its_budget(monkeypatch):
+    warm_key, *keys = _batch_keys(3)
+    other = Image.new("RGB", (30, 30), "blue")
+    output = io.BytesIO()
+    other.save(output, format="PNG")
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])] * 2)
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(warm_key, _png_bytes()), bedrock)
+    analyze.lambda_handler(_event(warm_key), Context())
+    dynamodb.meta.client.transactions.clear()
+
+    monkeypatch.setattr(
+        analyze,
+        "get_s3_client",
+        lambda: BatchS3({keys[0]: _png_bytes(), keys[1]: output.getvalue()}),
+    )
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+
+    assert [result["status"] for result in json.loads(response["body"])["results"]] == [200, 200]
+    assert len(bedrock.calls) == 2
+    assert [
+        [
+            (write["Update"]["Key"]["pk"].split("#")[2], write["Update"]["ExpressionAttributeValues"][":amount"])
+            for write in transaction
+        ]
+        for transaction in dynamodb.meta.client.transactions
+    ] == [[("user", 2)], [("global", 1), ("global-month", 1)]]
+
+
+def test_batch_cache_lookups_run_concurrently(monkeypatch):
+    class SlowCacheTable(AppStateTable):
+        def get_item(self, *, Key, **kwargs):
+            if Key["pk"].startswith("analysis-cache#"):
+                time.sleep(0.3)
+            return super().get_item(Key=Key, **kwargs)
+
+    keys = _batch_keys(4)
+    dynamodb = FakeDynamoDB(app=SlowCacheTable())
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年")])] * 4)
+    _wire_handler(monkeypatch, dynamodb, BatchS3({key: _png_bytes() for key in keys}), bedrock)
+
+    started = time.monotonic()
+    response = analyze.lambda_handler(_batch_event(keys), Context())
+    elapsed = time.monotonic() - started
+
+    assert response["statusCode"] == 200
+    assert len(bedrock.calls) == 4
+    assert elapsed < 0.9
+
+
+NOVA_MODEL_ID = "jp.amazon.nova-2-lite-v1:0"
+HAIKU_MODEL_ID = "jp.anthropic.claude-haiku-4-5-20251001-v1:0"
+
+
+def _enable_cascade(monkeypatch, confidence="0.6"):
+    monkeypatch.setenv("BEDROCK_MODEL_ID", NOVA_MODEL_ID)
+    monkeypatch.setenv("BEDROCK_ESCALATION_MODEL_ID", HAIKU_MODEL_ID)
+    monkeypatch.setenv("BEDROCK_ESCALATION_CONFIDENCE", confidence)
+
+
+@pytest.mark.parametrize(
+    ("first", "reason"),
+    [
+        (_model_json([_whiskey("カリラ 12年", confidence=0.4)]), "low_confidence"),
+        (_model_json([]), "no_whiskeys"),
+        ('{"brand_candidates":[],"serving_style":"NEAT","glass_type":""}', "invalid_output"),
+    ],
+)
+def test_weak_first_answer_escalates_to_the_stronger_model(monkeypatch, caplog, first, reason):
+    _enable_cascade(monkeypatch)
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([first, _model_json([_whiskey("カリラ 12年", confidence=0.9)])])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    with caplog.at_level("INFO", logger="drink-log-analyze"):
+        response = analyze.lambda_handler(_event(key), Context())
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert [call["modelId"] for call in bedrock.calls] == [NOVA_MODEL_ID, HAIKU_MODEL_ID]
+    assert body["model_id"] == HAIKU_MODEL_ID
+    assert body["confidence"] == 0.9
+    assert dynamodb.app.items[body["analysis_id"]]["model_id"] == HAIKU_MODEL_ID
+    assert [len(transaction) for transaction in dynamodb.meta.client.transactions] == [1, 2, 2]
+    assert caplog.text.count("Model stage finished") == 2
+    assert f'"outcome": "{reason}"' in caplog.text
+    assert '"escalated": true' in caplog.text
+    assert f'"escalation_reason": "{reason}"' in caplog.text
+
+
+def test_confident_first_answer_is_not_escalated(monkeypatch, caplog):
+    _enable_cascade(monkeypatch)
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年", confidence=0.6)])])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    with caplog.at_level("INFO", logger="drink-log-analyze"):
+        response = analyze.lambda_handler(_event(key), Context())
+    body = json.loads(response["body"])
+
+    assert [call["modelId"] for call in bedrock.calls] == [NOVA_MODEL_ID]
+    assert body["model_id"] == NOVA_MODEL_ID
+    assert '"escalated": false' in caplog.text
+    assert '"stages": 1' in caplog.text
+
+
+def test_escalation_that_finds_nothing_keeps_the_first_candidates(monkeypatch):
+    _enable_cascade(monkeypatch)
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年", confidence=0.3)]), _model_json([])])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    body = json.loads(analyze.lambda_handler(_event(key), Context())["body"])
+
+    assert len(bedrock.calls) == 2
+    assert body["model_id"] == NOVA_MODEL_ID
+    assert body["candidates"][0]["brand_text"] == "カリラ 12年"
+    [entry] = _cache_entries(dynamodb).values()
+    assert entry["model_id"] == NOVA_MODEL_ID
+
+
+def test_escalation_is_skipped_when_the_budget_is_spent(monkeypatch):
+    _enable_cascade(monkeypatch)
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    context = Context()
+
+    class SlowFirstAnswer(Bedrock):
+        def converse(self, **kwargs):
+            context.remaining = analyze.INVOKE_SAFETY_MS + analyze.MIN_INVOKE_BUDGET_MS - 1
+            return super().converse(**kwargs)
+
+    dynamodb = FakeDynamoDB()
+    bedrock = SlowFirstAnswer([_model_json([])])
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+
+    response = analyze.lambda_handler(_event(key), context)
+
+    assert response["statusCode"] == 200
+    assert [call["modelId"] for call in bedrock.calls] == [NOVA_MODEL_ID]
+    assert [len(transaction) for transaction in dynamodb.meta.client.transactions] == [1, 2]
+
+
+def test_cascade_results_are_cached_apart_from_the_single_model(monkeypatch):
+    key = f"tmp/user-1/{uuid.uuid4()}.png"
+    dynamodb = FakeDynamoDB()
+    bedrock = Bedrock([_model_json([_whiskey("カリラ 12年", confidence=0.3)])] * 2)
+    monkeypatch.setenv("BEDROCK_MODEL_ID", NOVA_MODEL_ID)
+    _wire_handler(monkeypatch, dynamodb, MemoryS3(key, _png_bytes()), bedrock)
+    analyze.lambda_handler(_event(key), Context())
+
+    _enable_cascade(monkeypatch)
+    bedrock.texts.append(_model_json([_whiskey("カリラ 12年", confidence=0.9)]))
+    body = json.loads(analyze.lambda_handler(_event(key), Context())["body"])
+
+    assert [call["modelId"] for call in bedrock.calls] == [
+        NOVA_MODEL_ID,
+        NOVA_MODEL_ID,
+        HAIKU_MODEL_ID,
+    ]
+    assert body["model_id"] == HAIKU_MODEL_ID
+    assert len(_cache_entries(dynamodb)) == 2
+
+
+@pytest.mark.parametrize(
+    ("escalation", "confidence"),
+    [
+        ("jp.anthropic.claude-opus-unlisted", "0.6"),
+        (NOVA_MODEL_ID, "0.6"),
+        (HAIKU_MODEL_ID, "1.5"),
+        (HAIKU_MODEL_ID, "high"),
+    ],
+)
+def test_invalid_cascade_configuration_is_rejected(monkeypatch, escalation, confidence):
+    monkeypatch.setenv("BEDROCK_MODEL_ID", NOVA_MODEL_ID)
+    monkeypatch.setenv("BEDROCK_ESCALATION_MODEL_ID", escalation)
+    monkeypatch.setenv("BEDROCK_ESCALATION_CONFIDENCE", confidence)
+
+    with pytest.raises(RuntimeError):
+        analyze.lambda_handler(_event(f"tmp/user-1/{uuid.uuid4()}.png"), Context())
@@ -0,0 +1,79 @@
+"""Memory/size benchmark for the analyze master snapshot representation.
+
+Run with ``pytest -s`` to print the measured sizes.
+"""
+
+import gc
+import tracemalloc
+
+from tests.lambda_module_loader import load_lambda_module
+
+
+analyze = load_lambda_module(
+    "drink_log_analyze_snapshot_memory_tests",
+    "lambda/drink-log-analyze/index.py",
+)
+
+CATALOG_SIZE = 10_000
+
+
+def _scanned_items():
+    # Fresh strings per row, as boto3 deserializes each scan page.
+    return [
+        {
+            "id": f"{number:016x}",
+            "name": f"銘柄 {number} 12年",
+            "name_ja": f"銘柄 {number} 12年",
+            "name_en": f"Brand {number} 12 Year Old",
+            "normalized_name": f"銘柄{number}12年|brand{number}12yearold",
+        }
+        for number in range(CATALOG_SIZE)
+    ]
+
+
+def _legacy_snapshot(items):
+    """The previous layout: dict copies, name tuples and a name -> records index."""
+    records = []
+    for item in items:
+        record = dict(item)
+        record["_normalized_names"] = analyze._catalog_names(item)
+        records.append(record)
+    index = {}
+    for record in records:
+        for name in record["_normalized_names"]:
+            index.setdefault(name, {})[record["id"]] = record
+    return tuple(records), index
+
+
+def _compact_snapshot(items):
+    catalog = analyze.CatalogIndex()
+    for item in items:
+        catalog.add(item)
+    return catalog
+
+
+def _retained_bytes(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        items = _scanned_items()
+        snapshot = build(items)
+        del items
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert snapshot
+    return retained
+
+
+def test_compact_snapshot_holds_catalog_scale_in_a_fraction_of_the_memory():
+    legacy = _retained_bytes(_legacy_snapshot)
+    compact = _retained_bytes(_compact_snapshot)
+
+    print(
+        f"\nmaster snapshot, {CATALOG_SIZE} rows: legacy {legacy / 1e6:.1f} MB, "
+        f"compact {compact / 1e6:.1f} MB ({compact / legacy:.0%})"
+    )
+    assert compact < legacy * 0.45
+    assert CATALOG_SIZE <= analyze.MASTER_SNAPSHOT_MAX_ITEMS
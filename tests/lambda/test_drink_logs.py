@@ -168,18 +168,31 @@ class StateTable:
             item.update(completion)
             item.update(
                 status="complete",
+                reconcile_state=values[":tmp_reference"],
                 s3_image_key=values[":final_key"],
                 updated_at=values[":updated_at"],
             )
+            for field in (
+                "s3_display_key",
+                "s3_thumbnail_key",
+                "brand_key",
+                "user_brand_key",
+                "user_place_key",
+            ):
+                if f":{field}" in values:
+                    item[field] = values[f":{field}"]
             for key in ("_completion", "content_type", "tmp_etag"):
                 item.pop(key, None)
-        elif expression == "REMOVE tmp_s3_key":
+        elif expression == "REMOVE tmp_s3_key, reconcile_state":
             item.pop("tmp_s3_key", None)
+            item.pop("reconcile_state", None)
         elif ":deleting" in expression:
             if item["user_id"] != values[":caller"] or item["status"] not in {"complete", "deleting"}:
                 raise ConditionalFailed
-            item["status"] = "deleting"
+            item["status"] = item["reconcile_state"] = "deleting"
             item.setdefault("delete_started_at", values[":started_at"])
+            for key in ("user_brand_key", "user_place_key"):
+                item.pop(key, None)
         else:
             raise AssertionError(expression)
         return {"Attributes": dict(item)}
@@ -187,6 +200,7 @@ class StateTable:
 
 @pytest.fixture(autouse=True)
 def environment(monkeypatch):
+    drink_logs._reset_presigned_url_cache()
     values = {
         "DRINKLOGS_TABLE": "DrinkLogs-test",
         "APP_STATE_TABLE": "AppState-test",
@@ -260,6 +274,26 @@ def test_normalize_flattens_transparent_png_and_accepts_webp():
     assert images.normalize_image(webp, max_bytes=1_572_864).startswith(b"\xff\xd8\xff")
 
 
+def test_normalize_decodes_large_jpegs_at_a_reduced_scale(monkeypatch):
+    exif = Image.Exif()
+    exif[274] = 6
+    raw = _image_bytes("JPEG", size=(3400, 200), exif=exif)
+    resized_from = []
+    resize = images._resize_long_side
+
+    def recording(image, long_side):
+        resized_from.append(image.size)
+        return resize(image, long_side)
+
+    monkeypatch.setattr(images, "_resize_long_side", recording)
+    normalized = images.normalize_image(raw, max_bytes=1_572_864)
+
+    # 1/2 is the smallest DCT scale that still covers the 1600 px target.
+    assert resized_from == [(100, 1700)]
+    with Image.open(io.BytesIO(normalized)) as result:
+        assert result.size == (94, 1600)
+
+
 @pytest.mark.parametrize("size", [(5000, 4001), (8001, 1)])
 def test_normalize_rejects_oversized_headers_before_decode(size):
     with pytest.raises(images.ImageTooLargeError):
@@ -271,6 +305,61 @@ def test_normalize_reports_unreachable_byte_budget():
         images.normalize_image(_image_bytes("PNG"), max_bytes=1)
 
 
+def _count_encodes(monkeypatch):
+    calls = []
+    encode = images._encode_jpeg
+
+    def counting(image, quality, *, final=True):
+        calls.append((image.size, quality, final))
+        return encode(image, quality, final=final)
+
+    monkeypatch.setattr(images, "_encode_jpeg", counting)
+    return calls
+
+
+def _noise_photo(size=(400, 300)):
+    return Image.effect_noise(size, 60).convert("RGB")
+
+
+def test_encode_within_budget_uses_one_final_encode_when_the_top_quality_fits(monkeypatch):
+    calls = _count_encodes(monkeypatch)
+    encoded = images.normalize_image_with_stats(_image_bytes("JPEG"), max_bytes=1_572_864)
+    assert encoded.quality == images.JPEG_QUALITIES[0]
+    assert encoded.encode_attempts == 1
+    assert calls == [((80, 40), images.JPEG_QUALITIES[0], True)]
+
+
+def test_encode_within_budget_finds_the_highest_fitting_quality_with_few_final_encodes(monkeypatch):
+    photo = _noise_photo()
+    final_sizes = {
+        quality: len(images._encode_jpeg(photo, quality)) for quality in images.JPEG_QUALITIES
+    }
+    max_bytes = (final_sizes[60] + final_sizes[55]) // 2
+    calls = _count_encodes(monkeypatch)
+
+    encoded = images.encode_within_budget(photo, max_bytes=max_bytes)
+
+    assert encoded.quality == 55
+    assert encoded.size == photo.size
+    assert len(encoded.data) <= max_bytes
+    assert encoded.encode_attempts == len(calls)
+    # The old sweep spent one optimized encode per step from 90 down to 55.
+    assert sum(final for _size, _quality, final in calls) < images.JPEG_QUALITIES.index(55) + 1
+    assert photo.size == (400, 300)
+
+
+def test_encode_within_budget_shrinks_when_no_quality_fits():
+    photo = _noise_photo()
+    max_bytes = len(images._encode_jpeg(photo, images.JPEG_QUALITIES[-1])) // 2
+
+    encoded = images.encode_within_budget(photo, max_bytes=max_bytes)
+
+    assert len(encoded.data) <= max_bytes
+    assert max(encoded.size) < max(photo.size)
+    with Image.open(io.BytesIO(encoded.data)) as result:
+        assert result.size == encoded.size
+
+
 def test_upload_url_consumes_atomic_limits_and_pins_form(monkeypatch):
     monkeypatch.setattr(drink_logs.uuid, "uuid4", lambda: uuid.UUID("11111111-1111-4111-8111-111111111111"))
     client = RecordingClient()
@@ -555,6 +644,125 @@ def test_empty_candidates_can_create_complete_manual_brand():
         assert drinklogs.get_item(Key={"id": record["id"]})["Item"]["status"] == "complete"
 
 
+def _put_analyzed_image(s3, analysis, upload_uuid, *, source_etag=None, renditions=()):
+    key = f"tmp/user-1/{upload_uuid}.analyzed.jpg"
+    body = _image_bytes("JPEG", color="blue")
+    metadata = {"source-etag": source_etag or analysis["ETag"], "source-format": "png"}
+    s3.put_object(
+        Bucket="images-test", Key=key, Body=body, ContentType="image/jpeg", Metadata=metadata
+    )
+    for name in renditions:
+        s3.put_object(
+            Bucket="images-test",
+            Key=f"tmp/user-1/{upload_uuid}.analyzed.{name}.jpg",
+            Body=f"{name}-bytes".encode(),
+            ContentType="image/jpeg",
+            Metadata=metadata,
+        )
+    analysis["normalized_s3_key"] = key
+    return key, body
+
+
+def _create_from_analysis(dynamodb, s3, analysis):
+    data = drink_logs.validate_create_input({"analysis_id": analysis["pk"], "candidate_index": 0})
+    return drink_logs.create_drink_log(
+        dynamodb,
+        s3,
+        "DrinkLogs-test",
+        "AppState-test",
+        "images-test",
+        "user-1",
+        data,
+    )
+
+
+def test_create_copies_the_analyzed_image_without_normalizing_again(monkeypatch):
+    for name in ("normalize_image", "render_renditions"):
+        monkeypatch.setattr(
+            drink_logs,
+            name,
+            lambda *_args, **_kwargs: pytest.fail("must reuse the analyzed images"),
+        )
+    with mock_aws():
+        dynamodb, s3, drinklogs, app_state, analysis, upload_uuid = _moto_create_dependencies()
+        analyzed_key, analyzed_body = _put_analyzed_image(
+            s3, analysis, upload_uuid, renditions=("display", "thumbnail")
+        )
+        app_state.put_item(Item=analysis)
+
+        record, created = _create_from_analysis(dynamodb, s3, analysis)
+
+        assert created is True
+        assert record["status"] == "complete"
+        final = s3.get_object(Bucket="images-test", Key=record["s3_image_key"])
+        assert final["Body"].read() == analyzed_body
+        assert final["ContentType"] == "image/jpeg"
+        assert final["CacheControl"] == "private, no-store"
+        assert final["Metadata"] == {}
+        for name, field in drink_logs.RENDITION_KEY_FIELDS.items():
+            copied = s3.get_object(Bucket="images-test", Key=record[field])
+            assert copied["Body"].read() == f"{name}-bytes".encode()
+            assert copied["Metadata"] == {}
+        keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket="images-test")["Contents"]}
+        assert keys == {
+            record["s3_image_key"],
+            record["s3_display_key"],
+            record["s3_thumbnail_key"],
+        }
+        stored = drinklogs.get_item(Key={"id": record["id"]})["Item"]
+        assert "tmp_normalized_key" not in stored
+
+
+def test_analyzed_image_without_renditions_completes_with_the_full_image_only():
+    with mock_aws():
+        dynamodb, s3, _drinklogs, app_state, analysis, upload_uuid = _moto_create_dependencies()
+        _put_analyzed_image(s3, analysis, upload_uuid, renditions=("display",))
+        app_state.put_item(Item=analysis)
+
+        record, _created = _create_from_analysis(dynamodb, s3, analysis)
+
+        assert record["s3_display_key"].endswith(".display.jpg")
+        assert "s3_thumbnail_key" not in record
+        keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket="images-test")["Contents"]}
+        assert not any(key.startswith("tmp/") for key in keys)
+
+
+def test_analyzed_image_from_another_upload_version_is_not_reused():
+    with mock_aws():
+        dynamodb, s3, _drinklogs, app_state, analysis, upload_uuid = _moto_create_dependencies()
+        _key, analyzed_body = _put_analyzed_image(
+            s3, analysis, upload_uuid, source_etag='"other-etag"'
+        )
+        app_state.put_item(Item=analysis)
+
+        record, _created = _create_from_analysis(dynamodb, s3, analysis)
+
+        final = s3.get_object(Bucket="images-test", Key=record["s3_image_key"])["Body"].read()
+        assert final.startswith(b"\xff\xd8\xff")
+        assert final != analyzed_body
+
+
+def test_foreign_normalized_key_in_analysis_is_ignored():
+    with mock_aws():
+        dynamodb, s3, _drinklogs, app_state, analysis, upload_uuid = _moto_create_dependencies()
+        _put_analyzed_image(s3, analysis, upload_uuid)
+        analysis["normalized_s3_key"] = f"tmp/user-2/{upload_uuid}.analyzed.jpg"
+        app_state.put_item(Item=analysis)
+
+        pending, _consume = drink_logs._prepare_initial_record(
+            dynamodb,
+            s3,
+            "AppState-test",
+            "images-test",
+            "user-1",
+            analysis["pk"],
+            upload_uuid,
+            0,
+        )
+
+        assert "tmp_normalized_key" not in pending
+
+
 def test_candidate_brand_override_is_manual_and_analysis_is_consumed_once():
     with mock_aws():
         dynamodb, s3, _drinklogs, app_state, analysis, _upload_uuid = (
@@ -653,6 +861,37 @@ def test_candidate_with_brand_metadata_can_be_consumed():
         assert created is True
         assert record["brand_text"] == "厚岸 立春"
         assert record["brand_source"] == "ai"
+        stored = _drinklogs.get_item(Key={"id": record["id"]})["Item"]
+        assert stored["brand_key"] == "akkeshi"
+        assert stored["user_brand_key"] == "user-1#akkeshi"
+        assert "brand#akkeshi" in stored["stats_keys"]
+
+
+def test_typed_brand_drops_the_candidate_catalog_brand_key():
+    candidate = {"brand_text": "厚岸 立春", "brand_key": "akkeshi", "confidence": Decimal("0.91")}
+    with mock_aws():
+        dynamodb, s3, drinklogs, _app_state, analysis, _upload_uuid = (
+            _moto_create_dependencies(candidates=[candidate])
+        )
+
+        record, created = drink_logs.create_drink_log(
+            dynamodb,
+            s3,
+            "DrinkLogs-test",
+            "AppState-test",
+            "images-test",
+            "user-1",
+            drink_logs.validate_create_input(
+                {"analysis_id": analysis["pk"], "candidate_index": 0, "brand_text": "厚岸 雨水"}
+            ),
+        )
+
+        assert created is True
+        stored = drinklogs.get_item(Key={"id": record["id"]})["Item"]
+        assert stored["brand_source"] == "manual"
+        assert "brand_key" not in stored
+        assert "user_brand_key" not in stored
+        assert "brand_text#厚岸雨水" in stored["stats_keys"]
 
 
 def test_legacy_candidate_without_brand_metadata_can_still_be_consumed():
@@ -860,7 +1099,7 @@ def test_initial_transaction_binds_ai_etag_candidate_and_all_counters():
         dynamodb, "DrinkLogs-test", "AppState-test", pending, consume
     )
     transaction = client.transactions[0]
-    assert len(transaction) == 6
+    assert len(transaction) == 6 + len(pending["stats_keys"])
     assert transaction[0]["Put"]["ConditionExpression"] == "attribute_not_exists(id)"
     assert [transaction[index]["Update"]["Key"]["pk"].split("#")[1] for index in range(1, 5)] == [
         "create",
@@ -872,6 +1111,14 @@ def test_initial_transaction_binds_ai_etag_candidate_and_all_counters():
     assert "#candidates[1] = :candidate" in delete["ConditionExpression"]
     assert "#etag = :etag" in delete["ConditionExpression"]
     assert delete["ExpressionAttributeValues"][":candidate"] == result["candidates"][1]
+    stats = transaction[6:]
+    assert all("ConditionExpression" not in step["Update"] for step in stats)
+    assert _stats_counter_deltas(stats) == dict.fromkeys(pending["stats_keys"], 1)
+    assert {step["Update"]["ExpressionAttributeValues"][":owner"] for step in stats} == {
+        "drinklog-stats#user#user-1"
+    }
+    assert pending["stats_keys"][0] == "total"
+    assert pending["stats_keys"][-1] == f"month#{pending['datetime'][:7]}"
     assert pending["quota_allocated"] is True
     assert "ttl" not in pending
 
@@ -1100,6 +1347,30 @@ def test_upload_limit_stays_429_without_retry(monkeypatch):
     assert len(client.transactions) == 1
 
 
+def test_export_limit_is_429_and_writes_nothing(monkeypatch):
+    def conditional_failure(_transaction):
+        raise TransactionCanceled([{"Code": "ConditionalCheckFailed"}])
+
+    client = RecordingClient(conditional_failure)
+    table = StaticTable(client=client)
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": table}, client)
+    s3 = MultipartS3()
+    monkeypatch.setattr(drink_logs, "get_dynamodb_resource", lambda: dynamodb)
+    monkeypatch.setattr(drink_logs, "get_s3_client", lambda: s3)
+
+    response = drink_logs.lambda_handler(
+        _post_event("/api/drink-logs/export", {}),
+        SimpleNamespace(aws_request_id="aws-1"),
+    )
+
+    assert response["statusCode"] == 429
+    assert json.loads(response["body"]) == {"error": "Daily export limit exceeded"}
+    assert client.transactions[0][0]["Update"]["Key"]["pk"].startswith(
+        "drinklog-counter#export#user#user-1#"
+    )
+    assert table.query_calls == [] and s3.calls == []
+
+
 def test_create_limit_stays_429_without_retry(monkeypatch):
     upload_uuid = "12345678-1234-4234-8234-123456789abc"
 
@@ -1219,8 +1490,9 @@ def test_png_and_webp_finish_get_delete_flow(fmt, content_type, extension):
             "content_type": content_type,
             "quota_allocated": True,
             "_completion": {
-                "brand_text": "Ardbeg",
+                "brand_text": "アードベッグ 10年",
                 "brand_source": "ai",
+                "brand_key": "ardbeg",
                 "serving_style": "NEAT",
                 "store": {"name": ""},
                 "ai": {"model_id": "model-1", "confidence": Decimal("0.8")},
@@ -1252,12 +1524,31 @@ def test_png_and_webp_finish_get_delete_flow(fmt, content_type, extension):
     assert completed["s3_image_key"].startswith(f"logs/user-1/{upload_uuid}-")
     assert tmp_key not in s3.objects
     assert s3.objects[completed["s3_image_key"]]["body"].startswith(b"\xff\xd8\xff")
+    base_key = completed["s3_image_key"].removesuffix(".jpg")
+    assert completed["s3_display_key"] == f"{base_key}.display.jpg"
+    assert completed["s3_thumbnail_key"] == f"{base_key}.thumbnail.jpg"
+    assert completed["brand_key"] == "ardbeg"
+    assert completed["user_brand_key"] == "user-1#ardbeg"
+    assert "user_place_key" not in completed
+    with Image.open(io.BytesIO(s3.objects[completed["s3_thumbnail_key"]]["body"])) as thumbnail:
+        assert max(thumbnail.size) <= images.IMAGE_RENDITIONS["thumbnail"]
 
     detail = drink_logs.get_owned_drink_log(table, s3, "images-test", "user-1", record_id)
     assert detail["image_url"].startswith("https://image.example/logs/user-1/")
+    assert detail["display_url"] == f"https://image.example/{completed['s3_display_key']}"
+    assert detail["thumbnail_url"] == f"https://image.example/{completed['s3_thumbnail_key']}"
     # Internal bucket-key structure and reconciliation bookkeeping must not leak
-    # into API responses; clients only ever see the presigned image_url.
-    for internal in ("s3_image_key", "tmp_s3_key", "quota_allocated", "delete_started_at"):
+    # into API responses; clients only ever see the presigned image URLs.
+    for internal in (
+        "s3_image_key",
+        "s3_display_key",
+        "s3_thumbnail_key",
+        "tmp_s3_key",
+        "quota_allocated",
+        "delete_started_at",
+        "user_brand_key",
+        "user_place_key",
+    ):
         assert internal not in detail
     assert drink_logs.delete_drink_log(
         dynamodb,
@@ -1269,7 +1560,54 @@ def test_png_and_webp_finish_get_delete_flow(fmt, content_type, extension):
         record_id,
     )
     assert record_id not in state
-    assert completed["s3_image_key"] not in s3.objects
+    assert s3.objects == {}
+
+
+def test_rendition_store_failure_still_completes_with_the_full_image():
+    class NoRenditionS3(MemoryS3):
+        def put_object(self, **kwargs):
+            if kwargs["Key"].endswith((".display.jpg", ".thumbnail.jpg")):
+                raise _client_error("SlowDown", "PutObject")
+            return super().put_object(**kwargs)
+
+    upload_uuid = "12345678-1234-4234-8234-123456789abc"
+    tmp_key = f"tmp/user-1/{upload_uuid}.png"
+    record_id = drink_logs.derive_drink_log_id("user-1", upload_uuid)
+    state = {
+        record_id: {
+            "id": record_id,
+            "user_id": "user-1",
+            "status": "pending",
+            "tmp_s3_key": tmp_key,
+            "tmp_etag": '"etag-1"',
+            "content_type": "image/png",
+            "_completion": {
+                "brand_text": "Ardbeg",
+                "brand_source": "manual",
+                "serving_style": "NEAT",
+                "store": {"name": ""},
+            },
+        }
+    }
+    client = RecordingClient()
+    table = StateTable(state, client)
+    s3 = NoRenditionS3(
+        {tmp_key: {"body": _image_bytes("PNG"), "content_type": "image/png", "etag": '"etag-1"'}}
+    )
+
+    completed = drink_logs._finish_pending_create(
+        FakeDynamoDB({"DrinkLogs-test": table}, client),
+        s3,
+        "DrinkLogs-test",
+        "AppState-test",
+        "images-test",
+        dict(state[record_id]),
+    )
+
+    assert completed["status"] == "complete"
+    assert completed["s3_image_key"] in s3.objects
+    assert "s3_display_key" not in completed
+    assert "s3_thumbnail_key" not in completed
 
 
 def test_timeline_fills_across_filtered_empty_pages_and_never_signs_pending():
@@ -1312,6 +1650,532 @@ def test_timeline_fills_across_filtered_empty_pages_and_never_signs_pending():
     assert len(s3.url_calls) == 1
 
 
+@pytest.mark.parametrize(
+    ("filters", "index_name", "key_condition", "partition", "filter_clause"),
+    [
+        ({}, "UserDatetimeIndex", "user_id = :partition", "user-1", None),
+        (
+            {"place_id": "place-1"},
+            "UserPlaceDatetimeIndex",
+            "user_place_key = :partition",
+            "user-1#place-1",
+            None,
+        ),
+        (
+            {"brand_key": "ardbeg"},
+            "UserBrandDatetimeIndex",
+            "user_brand_key = :partition",
+            "user-1#ardbeg",
+            None,
+        ),
+        (
+            {"place_id": "place-1", "brand_key": "ardbeg"},
+            "UserPlaceDatetimeIndex",
+            "user_place_key = :partition",
+            "user-1#place-1",
+            "brand_key = :brand_key",
+        ),
+    ],
+)
+def test_timeline_routes_exact_filters_to_sparse_indexes(
+    filters, index_name, key_condition, partition, filter_clause
+):
+    table = StaticTable(query_responses=[{"Items": [_complete_log("a")]}])
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": table})
+
+    drink_logs.get_timeline(
+        dynamodb, PresignS3(), "DrinkLogs-test", "images-test", "user-1", 20, None, filters
+    )
+
+    query = table.query_calls[0]
+    assert query["IndexName"] == index_name
+    assert query["KeyConditionExpression"] == key_condition
+    assert query["ExpressionAttributeValues"][":partition"] == partition
+    assert "#store.#place_id" not in query["FilterExpression"]
+    if filter_clause:
+        assert filter_clause in query["FilterExpression"]
+
+
+def test_timeline_query_matches_the_catalog_brand_key_and_binds_tokens_to_the_index():
+    _limit, _start, filters = drink_logs.parse_timeline_query({"brand_key": "caol_ila"})
+    assert filters == {"brand_key": "caol_ila"}
+    _limit, _start, filters = drink_logs.parse_timeline_query({"brand_key": ""})
+    assert filters == {}
+
+    place_token = drink_logs.encode_next_token(
+        {"id": "log-1", "datetime": "2026-07-20T00:00:00Z", "user_place_key": "user-1#place-1"}
+    )
+    _limit, start_key, _filters = drink_logs.parse_timeline_query(
+        {"place_id": "place-1", "next_token": place_token}
+    )
+    assert start_key["user_place_key"] == "user-1#place-1"
+    with pytest.raises(drink_logs.ValidationError) as excinfo:
+        drink_logs.parse_timeline_query({"next_token": place_token})
+    assert excinfo.value.fields == {"next_token": "Invalid continuation token"}
+
+
+def test_timeline_query_normalizes_the_datetime_range_and_order():
+    _limit, _start, filters = drink_logs.parse_timeline_query(
+        {"from": "2026-07-01T00:00:00+09:00", "to": "2026-08-01T00:00:00+09:00", "order": "asc"}
+    )
+    assert filters == {
+        "from": "2026-06-30T15:00:00.000Z",
+        "to": "2026-07-31T15:00:00.000Z",
+        "order": "asc",
+    }
+    assert drink_logs.parse_timeline_query({"order": "desc"})[2] == {}
+
+    with pytest.raises(drink_logs.ValidationError) as excinfo:
+        drink_logs.parse_timeline_query(
+            {"from": "2026-07-01T00:00:00", "to": "2026-07-01", "order": "newest"}
+        )
+    assert set(excinfo.value.fields) == {"from", "to", "order"}
+    with pytest.raises(drink_logs.ValidationError) as excinfo:
+        drink_logs.parse_timeline_query(
+            {"from": "2026-07-02T00:00:00Z", "to": "2026-07-02T00:00:00Z"}
+        )
+    assert excinfo.value.fields == {"to": "Must be later than from"}
+
+
+@pytest.mark.parametrize(
+    ("token_datetime", "valid"),
+    [
+        ("2026-07-01T00:00:00.000Z", True),
+        ("2026-07-31T23:59:59.999Z", True),
+        ("2026-06-30T23:59:59.999Z", False),
+        ("2026-08-01T00:00:00.000Z", False),
+    ],
+)
+def test_timeline_tokens_must_lie_inside_the_requested_range(token_datetime, valid):
+    query = {
+        "from": "2026-07-01T00:00:00Z",
+        "to": "2026-08-01T00:00:00Z",
+        "next_token": drink_logs.encode_next_token(
+            {"id": "log-1", "datetime": token_datetime, "user_id": "user-1"}
+        ),
+    }
+    if valid:
+        assert drink_logs.parse_timeline_query(query)[1]["datetime"] == token_datetime
+    else:
+        with pytest.raises(drink_logs.ValidationError):
+            drink_logs.parse_timeline_query(query)
+
+
+@pytest.mark.parametrize(
+    ("bounds", "key_condition", "values"),
+    [
+        (
+            {"from": "2026-07-01T00:00:00.000Z", "to": "2026-08-01T00:00:00.000Z"},
+            "user_id = :partition AND #datetime BETWEEN :from AND :before_to",
+            {":from": "2026-07-01T00:00:00.000Z", ":before_to": "2026-07-31T23:59:59.999Z"},
+        ),
+        (
+            {"from": "2026-07-01T00:00:00.000Z"},
+            "user_id = :partition AND #datetime >= :from",
+            {":from": "2026-07-01T00:00:00.000Z"},
+        ),
+        (
+            {"to": "2026-08-01T00:00:00.000Z"},
+            "user_id = :partition AND #datetime < :to",
+            {":to": "2026-08-01T00:00:00.000Z"},
+        ),
+    ],
+)
+def test_timeline_range_becomes_a_sort_key_condition(bounds, key_condition, values):
+    table = StaticTable(query_responses=[{"Items": []}])
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": table})
+
+    drink_logs.get_timeline(
+        dynamodb,
+        PresignS3(),
+        "DrinkLogs-test",
+        "images-test",
+        "user-1",
+        20,
+        None,
+        {**bounds, "order": "asc"},
+    )
+
+    query = table.query_calls[0]
+    assert query["KeyConditionExpression"] == key_condition
+    assert query["ExpressionAttributeNames"]["#datetime"] == "datetime"
+    assert values.items() <= query["ExpressionAttributeValues"].items()
+    assert query["ScanIndexForward"] is True
+    assert "datetime" not in query["FilterExpression"]
+
+
+def test_edits_keep_sparse_timeline_keys_in_step():
+    calls = []
+
+    class UpdateTable:
+        meta = SimpleNamespace(client=RecordingClient())
+
+        def get_item(self, **kwargs):
+            return {"Item": {"id": "log-1", "user_id": "user-1", "status": "complete"}}
+
+        def update_item(self, **kwargs):
+            calls.append(kwargs)
+            return {"Attributes": {"id": "log-1", "status": "complete"}}
+
+    drink_logs.update_drink_log(
+        FakeDynamoDB({"DrinkLogs-test": UpdateTable()}),
+        "DrinkLogs-test",
+        "AppState-test",
+        "user-1",
+        "log-1",
+        drink_logs.validate_update_input(
+            {"brand_text": "Ardbeg", "store": {"name": "Bar", "place_id": "place-1"}}
+        ),
+    )
+    drink_logs.update_drink_log(
+        FakeDynamoDB({"DrinkLogs-test": UpdateTable()}),
+        "DrinkLogs-test",
+        "AppState-test",
+        "user-1",
+        "log-1",
+        drink_logs.validate_update_input({"store": {"name": "Bar", "place_id": None}}),
+    )
+
+    set_values = calls[0]["ExpressionAttributeValues"]
+    assert set_values[":user_place_key"] == "user-1#place-1"
+    # A hand-typed brand no longer names a catalog brand.
+    removed = calls[0]["UpdateExpression"].split("REMOVE", 1)[1]
+    assert "brand_key" in removed and "user_brand_key" in removed
+    assert ":user_brand_key" not in set_values
+    assert "user_place_key" in calls[1]["UpdateExpression"].split("REMOVE", 1)[1]
+    assert "user_brand_key" not in calls[1]["UpdateExpression"]
+
+
+def _stats_counter_deltas(steps):
+    """Map each counter a transaction touches, named by its pk suffix, to its delta."""
+    deltas = {}
+    for step in steps:
+        update = step["Update"]
+        owner = update["ExpressionAttributeValues"][":owner"]
+        assert update["Key"]["pk"].startswith(f"{owner}#")
+        assert update["ExpressionAttributeNames"] == {"#count": "count"}
+        [delta] = [
+            value
+            for name, value in update["ExpressionAttributeValues"].items()
+            if name not in {":owner", ":updated_at"}
+        ]
+        deltas[update["Key"]["pk"].removeprefix(f"{owner}#")] = delta
+    return deltas
+
+
+def test_stats_are_listed_from_per_counter_items_across_pages():
+    def counter(name, count):
+        return {
+            "pk": f"drinklog-stats#user#user-1#{name}",
+            "stats_owner": "drinklog-stats#user#user-1",
+            "count": Decimal(count),
+        }
+
+    table = StaticTable(
+        query_responses=[
+            {
+                "Items": [
+                    counter("brand#ardbeg", 1),
+                    counter("brand#talisker", 2),
+                    counter("brand_text#たりすかー", 1),
+                    counter("month#2026-07", 2),
+                ],
+                "LastEvaluatedKey": {"pk": "drinklog-stats#user#user-1#month#2026-07"},
+            },
+            {
+                "Items": [
+                    counter("month#2026-06", 1),
+                    counter("place#place-1", 2),
+                    counter("style#NEAT", 3),
+                    counter("total", 3),
+                ]
+            },
+        ]
+    )
+
+    stats = drink_logs.get_drink_log_stats(
+        FakeDynamoDB({"AppState-test": table}), "AppState-test", "user-1"
+    )
+
+    first, second = table.query_calls
+    assert first["IndexName"] == "StatsOwnerIndex"
+    assert first["KeyConditionExpression"] == "stats_owner = :owner"
+    assert first["FilterExpression"] == "#count > :zero"
+    assert first["ExpressionAttributeValues"][":owner"] == "drinklog-stats#user#user-1"
+    assert second["ExclusiveStartKey"] == {"pk": "drinklog-stats#user#user-1#month#2026-07"}
+    assert stats == {
+        "total": 3,
+        "brand_keys": {"talisker": 2, "ardbeg": 1},
+        "brand_text_keys": {"たりすかー": 1},
+        "place_ids": {"place-1": 2},
+        "serving_styles": {"NEAT": 3},
+        "months": {"2026-06": 1, "2026-07": 2},
+    }
+    assert list(stats["brand_keys"]) == ["talisker", "ardbeg"]
+    assert list(stats["months"]) == ["2026-06", "2026-07"]
+    empty = drink_logs.get_drink_log_stats(
+        FakeDynamoDB({"AppState-test": StaticTable(query_responses=[{"Items": []}])}),
+        "AppState-test",
+        "user-2",
+    )
+    assert empty["total"] == 0 and empty["brand_keys"] == empty["brand_text_keys"] == {}
+
+
+@pytest.mark.parametrize(
+    ("fields", "brand_counter"),
+    [
+        ({"brand_text": "タリスカー 10年", "brand_key": "talisker"}, "brand#talisker"),
+        ({"brand_text": "タリスカー 18年", "brand_key": "talisker"}, "brand#talisker"),
+        ({"brand_text": "タリスカー 10年"}, "brand_text#たりすかー10年"),
+        ({"brand_text": ""}, None),
+    ],
+)
+def test_stats_count_brands_on_the_catalog_key_before_the_typed_text(fields, brand_counter):
+    keys = drink_logs._stats_keys({**fields, "datetime": "2026-07-20T00:00:00Z"})
+
+    assert [key for key in keys if key.startswith("brand")] == ([brand_counter] if brand_counter else [])
+
+
+def test_brand_edit_moves_stats_counters_in_the_record_transaction():
+    counted = ["total", "brand#ardbeg", "style#NEAT", "month#2026-07"]
+    record = {
+        "id": "log-1",
+        "user_id": "user-1",
+        "status": "complete",
+        "datetime": "2026-07-20T00:00:00Z",
+        "brand_text": "アードベッグ",
+        "brand_source": "ai",
+        "brand_key": "ardbeg",
+        "serving_style": "NEAT",
+        "store": {"name": ""},
+        "stats_keys": counted,
+    }
+    conflict = {"Code": "ConditionalCheckFailed"}
+    outcomes = [TransactionCanceled([conflict, {"Code": "None"}]), None]
+
+    def transact(transaction):
+        outcome = outcomes.pop(0)
+        if outcome:
+            raise outcome
+
+    client = RecordingClient(transact)
+    table = StaticTable(item=record, client=client)
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": table}, client)
+
+    drink_logs.update_drink_log(
+        dynamodb,
+        "DrinkLogs-test",
+        "AppState-test",
+        "user-1",
+        "log-1",
+        drink_logs.validate_update_input({"brand_text": "Talisker", "serving_style": "NEAT"}),
+    )
+
+    assert len(client.transactions) == 2
+    update, *stats = client.transactions[1]
+    assert update["Update"]["ConditionExpression"].endswith("stats_keys = :previous_stats_keys")
+    values = update["Update"]["ExpressionAttributeValues"]
+    assert values[":previous_stats_keys"] == counted
+    # A typed brand is not a catalog brand, so it counts under its text.
+    assert values[":stats_keys"] == ["total", "brand_text#talisker", "style#NEAT", "month#2026-07"]
+    assert _stats_counter_deltas(stats) == {"brand#ardbeg": -1, "brand_text#talisker": 1}
+    assert len(table.get_calls) == 3
+
+
+@pytest.mark.parametrize("module", [drink_logs, reconciler], ids=["delete", "reconciler"])
+def test_finalizing_a_counted_record_releases_its_stats(module):
+    item = {
+        "id": "log-1",
+        "user_id": "user-1",
+        "status": "deleting",
+        "quota_allocated": True,
+        "stats_keys": ["total", "brand#ardbeg", "month#2026-07"],
+    }
+    client = RecordingClient()
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": StaticTable()}, client)
+    finalize = getattr(module, "_finalize_delete", None) or module._finalize_deleting
+
+    assert finalize(dynamodb, "DrinkLogs-test", "AppState-test", item)
+
+    stats = [
+        step
+        for step in client.transactions[0]
+        if step.get("Update", {}).get("Key", {}).get("pk", "").startswith("drinklog-stats#")
+    ]
+    assert _stats_counter_deltas(stats) == dict.fromkeys(item["stats_keys"], -1)
+
+
+class MultipartS3(PresignS3):
+    def __init__(self, fail_on_part=None):
+        super().__init__()
+        self.fail_on_part = fail_on_part
+        self.calls = []
+        self.parts = []
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs))
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs))
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        self.calls.append(("upload_part", kwargs))
+        if kwargs["PartNumber"] == self.fail_on_part:
+            raise _client_error("InternalError", "UploadPart")
+        self.parts.append(kwargs["Body"])
+        return {"ETag": f'"part-{kwargs["PartNumber"]}"'}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.calls.append(("complete_multipart_upload", kwargs))
+
+    def abort_multipart_upload(self, **kwargs):
+        self.calls.append(("abort_multipart_upload", kwargs))
+
+
+def test_export_streams_projected_pages_into_multipart_parts(monkeypatch):
+    monkeypatch.setattr(drink_logs, "EXPORT_PART_BYTES", 200)
+    logs = [
+        {"id": f"log-{index}", "datetime": "2026-07-20T00:00:00.000Z", "rating": Decimal("4.5")}
+        for index in range(8)
+    ]
+    table = StaticTable(
+        query_responses=[
+            {"Items": logs[:5], "LastEvaluatedKey": {"id": "log-4"}},
+            {"Items": logs[5:]},
+        ]
+    )
+    client = RecordingClient()
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": table}, client)
+    s3 = MultipartS3()
+
+    result = drink_logs.export_drink_logs(
+        dynamodb, s3, "DrinkLogs-test", "AppState-test", "images-test", "user-1"
+    )
+
+    assert result["count"] == 8
+    assert result["expires_in"] == drink_logs.PRESIGNED_GET_SECONDS
+    body = b"".join(s3.parts)
+    assert result["bytes"] == len(body)
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {"id": f"log-{index}", "datetime": "2026-07-20T00:00:00.000Z", "rating": 4.5}
+        for index in range(8)
+    ]
+    assert all(len(part) >= 200 for part in s3.parts[:-1])
+    operations = [operation for operation, _kwargs in s3.calls]
+    assert operations[0] == "create_multipart_upload"
+    assert operations[-1] == "complete_multipart_upload"
+    complete = s3.calls[-1][1]
+    assert complete["Key"].startswith("exports/user-1/")
+    assert [part["PartNumber"] for part in complete["MultipartUpload"]["Parts"]] == list(
+        range(1, len(s3.parts) + 1)
+    )
+    query = table.query_calls[0]
+    assert query["IndexName"] == "UserDatetimeIndex"
+    assert query["ScanIndexForward"] is True
+    assert "Limit" not in query
+    projected = {
+        query["ExpressionAttributeNames"][name.strip()]
+        for name in query["ProjectionExpression"].split(",")
+    }
+    assert projected == set(drink_logs.EXPORT_FIELDS)
+    assert table.query_calls[1]["ExclusiveStartKey"] == {"id": "log-4"}
+    _operation, presign = s3.url_calls[0]
+    assert presign["Params"]["Key"] == complete["Key"]
+
+
+def test_export_aborts_the_multipart_upload_on_failure(monkeypatch):
+    monkeypatch.setattr(drink_logs, "EXPORT_PART_BYTES", 10)
+    s3 = MultipartS3(fail_on_part=2)
+    chunks = [b"0123456789\n"] * 3
+
+    with pytest.raises(ClientError):
+        drink_logs._upload_stream(s3, "images-test", "exports/user-1/x.ndjson", chunks, "application/x-ndjson")
+
+    assert [operation for operation, _kwargs in s3.calls] == [
+        "create_multipart_upload",
+        "upload_part",
+        "upload_part",
+        "abort_multipart_upload",
+    ]
+
+
+def test_small_export_is_a_single_put():
+    s3 = MultipartS3()
+
+    assert drink_logs._upload_stream(
+        s3, "images-test", "exports/user-1/x.ndjson", [b"{}\n", b"{}\n"], "application/x-ndjson"
+    ) == (2, 6)
+    assert [operation for operation, _kwargs in s3.calls] == ["put_object"]
+    assert s3.calls[0][1]["CacheControl"] == "private, no-store"
+
+
+def _complete_log(record_id, *, renditions=True):
+    item = {
+        "id": record_id,
+        "user_id": "user-1",
+        "status": "complete",
+        "datetime": "2026-07-20T00:00:00Z",
+        "s3_image_key": f"logs/user-1/{record_id}.jpg",
+    }
+    if renditions:
+        item["s3_display_key"] = f"logs/user-1/{record_id}.display.jpg"
+        item["s3_thumbnail_key"] = f"logs/user-1/{record_id}.thumb.jpg"
+    return item
+
+
+def test_timeline_refetch_reuses_presigned_urls_within_the_window(monkeypatch):
+    now = [datetime(2026, 7, 20, 12, 0, 0, tzinfo=timezone.utc)]
+    monkeypatch.setattr(drink_logs, "_utc_now", lambda: now[0])
+    page = [_complete_log("a"), _complete_log("b", renditions=False)]
+    table = StaticTable(query_responses=[{"Items": page}] * 3)
+    dynamodb = FakeDynamoDB({"DrinkLogs-test": table})
+    s3 = PresignS3()
+
+    def timeline():
+        results, _token = drink_logs.get_timeline(
+            dynamodb, s3, "DrinkLogs-test", "images-test", "user-1", 20, None, {}
+        )
+        return results
+
+    first = timeline()
+    assert len(s3.url_calls) == 4
+    assert all(kwargs["ExpiresIn"] == drink_logs.PRESIGNED_GET_SECONDS for _op, kwargs in s3.url_calls)
+
+    now[0] += timedelta(seconds=30)
+    assert timeline() == first
+    assert len(s3.url_calls) == 4
+    assert drink_logs._public_record(page[1], s3, "images-test", "user-1") == first[1]
+    assert len(s3.url_calls) == 4
+
+    window = drink_logs.PRESIGNED_GET_SECONDS - drink_logs.PRESIGNED_URL_REUSE_MARGIN_SECONDS
+    now[0] += timedelta(seconds=window)
+    timeline()
+    assert len(s3.url_calls) == 8
+    assert set(key for _bucket, key, _window in drink_logs._PRESIGNED_URL_CACHE) == {
+        "logs/user-1/a.jpg",
+        "logs/user-1/a.display.jpg",
+        "logs/user-1/a.thumb.jpg",
+        "logs/user-1/b.jpg",
+    }
+
+
+def test_presigned_url_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(drink_logs, "PRESIGNED_URL_CACHE_MAX_ENTRIES", 3)
+    s3 = PresignS3()
+
+    urls = drink_logs._presigned_image_urls(
+        s3, "images-test", [f"logs/user-1/{index}.jpg" for index in range(5)]
+    )
+
+    assert len(urls) == 5
+    assert [key for _bucket, key, _window in drink_logs._PRESIGNED_URL_CACHE] == [
+        "logs/user-1/2.jpg",
+        "logs/user-1/3.jpg",
+        "logs/user-1/4.jpg",
+    ]
+
+
 def test_update_is_whitelisted_and_owner_status_are_atomic():
     with pytest.raises(drink_logs.ValidationError) as exc:
         drink_logs.validate_update_input({"id": "replacement", "s3_image_key": "evil"})
@@ -1322,12 +2186,17 @@ def test_update_is_whitelisted_and_owner_status_are_atomic():
     class UpdateTable:
         meta = SimpleNamespace(client=RecordingClient())
 
+        def get_item(self, **kwargs):
+            return {"Item": {"id": "log-1", "user_id": "user-1", "status": "complete"}}
+
         def update_item(self, **kwargs):
             calls.append(kwargs)
             return {"Attributes": {"id": "log-1", "status": "complete"}}
 
     result = drink_logs.update_drink_log(
-        UpdateTable(),
+        FakeDynamoDB({"DrinkLogs-test": UpdateTable()}),
+        "DrinkLogs-test",
+        "AppState-test",
         "user-1",
         "log-1",
         drink_logs.validate_update_input({"store": {"name": "Edited"}}),
@@ -1386,6 +2255,123 @@ def test_batch_get_retries_unprocessed_keys_and_fails_closed():
         reconciler._batch_get_records(BatchDynamo(always=True), "DrinkLogs-test", ["log-1"])
 
 
+def test_backlog_pages_the_reconcile_index_and_rechecks_with_consistent_reads():
+    cutoff = datetime(2026, 7, 20, 0, 0, 0, 500000, tzinfo=timezone.utc)
+    old = "2026-07-18T00:00:00.000Z"
+    records = {
+        "stale-index": {"id": "stale-index", "status": "complete", "updated_at": old},
+        "pending": {"id": "pending", "status": "pending", "updated_at": old},
+        "fresh": {"id": "fresh", "status": "pending", "updated_at": "2026-07-20T00:00:00.900Z"},
+    }
+
+    class IndexTable:
+        def __init__(self):
+            self.requests = []
+
+        def query(self, **kwargs):
+            self.requests.append(kwargs)
+            if "ExclusiveStartKey" not in kwargs:
+                return {
+                    "Items": [{"id": "stale-index"}, {"id": "gone"}],
+                    "LastEvaluatedKey": {"id": "gone"},
+                }
+            return {"Items": [{"id": "pending"}, {"id": "fresh"}]}
+
+    class BacklogDynamo:
+        def __init__(self):
+            self.table = IndexTable()
+            self.batch_requests = []
+
+        def Table(self, name):
+            assert name == "DrinkLogs-test"
+            return self.table
+
+        def batch_get_item(self, **kwargs):
+            request = kwargs["RequestItems"]["DrinkLogs-test"]
+            self.batch_requests.append(request)
+            return {
+                "Responses": {
+                    "DrinkLogs-test": [
+                        dict(records[key["id"]]) for key in request["Keys"] if key["id"] in records
+                    ]
+                },
+                "UnprocessedKeys": {},
+            }
+
+    dynamodb = BacklogDynamo()
+    found = reconciler._backlog_records(dynamodb, "DrinkLogs-test", "pending", "pending", cutoff)
+
+    assert [item["id"] for item in found] == ["pending"]
+    first, second = dynamodb.table.requests
+    assert first["IndexName"] == "ReconcileStateIndex"
+    assert first["ExpressionAttributeValues"] == {
+        ":state": "pending",
+        ":cutoff": "2026-07-20T00:00:01Z",
+    }
+    assert second["ExclusiveStartKey"] == {"id": "gone"}
+    assert dynamodb.batch_requests[0]["ConsistentRead"] is True
+
+
+def test_tmp_reconciler_reads_only_the_records_derived_from_old_tmp_keys():
+    upload_uuid = "11111111-1111-4111-8111-111111111111"
+    referenced = f"tmp/user-1/{upload_uuid}.png"
+    stale = f"tmp/user-1/{upload_uuid}.analyzed.jpg"
+    foreign = "tmp/user-1/not-an-upload.txt"
+    old = datetime.now(timezone.utc) - timedelta(hours=72)
+    record_id = drink_logs.derive_drink_log_id("user-1", upload_uuid)
+
+    class ListS3(MemoryS3):
+        def get_paginator(self, operation):
+            assert operation == "list_objects_v2"
+            objects = self.objects
+            return SimpleNamespace(
+                paginate=lambda **kwargs: [
+                    {
+                        "Contents": [
+                            {"Key": key, "LastModified": old}
+                            for key in objects
+                            if key.startswith(kwargs["Prefix"])
+                        ]
+                    }
+                ]
+            )
+
+    class RecordDynamo:
+        def __init__(self):
+            self.requested = []
+
+        def Table(self, name):
+            raise AssertionError("tmp reconciliation must not scan or query DrinkLogs")
+
+        def batch_get_item(self, **kwargs):
+            keys = kwargs["RequestItems"]["DrinkLogs-test"]["Keys"]
+            self.requested.extend(key["id"] for key in keys)
+            return {
+                "Responses": {
+                    "DrinkLogs-test": [
+                        {"id": record_id, "status": "complete", "tmp_s3_key": referenced}
+                    ]
+                },
+                "UnprocessedKeys": {},
+            }
+
+    s3 = ListS3(
+        {
+            key: {"body": b"x", "content_type": "image/png", "etag": '"e"'}
+            for key in (referenced, stale, foreign)
+        }
+    )
+    dynamodb = RecordDynamo()
+
+    deleted = reconciler.reconcile_tmp_objects(
+        dynamodb, s3, "DrinkLogs-test", "images-test", datetime.now(timezone.utc)
+    )
+
+    assert deleted == 2
+    assert set(s3.objects) == {referenced}
+    assert dynamodb.requested == [record_id]
+
+
 def test_reconciler_never_treats_unconfirmed_s3_read_as_deleted():
     class FailingS3:
         def __init__(self):
@@ -1441,6 +2427,7 @@ def test_reconciler_all_phases_converge_and_second_run_is_idempotent():
             "id": deleting_id,
             "user_id": "user-1",
             "status": "deleting",
+            "reconcile_state": "deleting",
             "s3_image_key": deleting_key,
             "quota_allocated": True,
             "delete_started_at": old_text,
@@ -1450,6 +2437,7 @@ def test_reconciler_all_phases_converge_and_second_run_is_idempotent():
             "id": pending_id,
             "user_id": "user-1",
             "status": "pending",
+            "reconcile_state": "pending",
             "tmp_s3_key": pending_tmp,
             "quota_allocated": True,
             "updated_at": old_text,
@@ -1458,6 +2446,7 @@ def test_reconciler_all_phases_converge_and_second_run_is_idempotent():
             "id": residual_id,
             "user_id": "user-1",
             "status": "complete",
+            "reconcile_state": "tmp",
             "s3_image_key": f"logs/user-1/{residual_uuid}-winner.jpg",
             "tmp_s3_key": residual_tmp,
             "quota_allocated": True,
@@ -1465,6 +2454,7 @@ def test_reconciler_all_phases_converge_and_second_run_is_idempotent():
         },
     }
     decremented = []
+    queries = []
 
     class ReconcileClient(RecordingClient):
         def transact_write_items(self, **kwargs):
@@ -1491,32 +2481,31 @@ def test_reconciler_all_phases_converge_and_second_run_is_idempotent():
             item = state.get(Key["id"])
             return {"Item": dict(item)} if item else {}
 
-        def scan(self, **kwargs):
-            values = kwargs.get("ExpressionAttributeValues", {})
-            items = list(state.values())
-            if ":deleting" in values:
-                items = [item for item in items if item.get("status") == "deleting"]
-            elif ":pending" in values:
-                items = [item for item in items if item.get("status") == "pending"]
-            elif ":complete" in values:
-                items = [
-                    item
-                    for item in items
-                    if item.get("status") == "complete" and item.get("tmp_s3_key")
+        def query(self, **kwargs):
+            assert kwargs["IndexName"] == "ReconcileStateIndex"
+            values = kwargs["ExpressionAttributeValues"]
+            queries.append(values[":state"])
+            return {
+                "Items": [
+                    {"id": item["id"], "reconcile_state": item["reconcile_state"]}
+                    for item in state.values()
+                    if item.get("reconcile_state") == values[":state"]
+                    and item["updated_at"] < values[":cutoff"]
                 ]
-            return {"Items": [dict(item) for item in items]}
+            }
 
         def update_item(self, **kwargs):
             item = state.get(kwargs["Key"]["id"])
             if not item:
                 raise ConditionalFailed
-            if kwargs["UpdateExpression"] == "SET #status = :deleting":
+            if kwargs["UpdateExpression"] == "SET #status = :deleting, reconcile_state = :deleting":
                 if item.get("status") != "pending":
                     raise ConditionalFailed
-                item["status"] = "deleting"
+                item["status"] = item["reconcile_state"] = "deleting"
                 return {"Attributes": dict(item)}
-            if kwargs["UpdateExpression"] == "REMOVE tmp_s3_key":
+            if kwargs["UpdateExpression"] == "REMOVE tmp_s3_key, reconcile_state":
                 item.pop("tmp_s3_key", None)
+                item.pop("reconcile_state", None)
                 return {}
             raise AssertionError(kwargs["UpdateExpression"])
 
@@ -1611,7 +2600,10 @@ def test_reconciler_all_phases_converge_and_second_run_is_idempotent():
         "complete_tmp_cleaned": 1,
     }
     assert set(state) == {winner_id, residual_id}
-    assert residual_tmp not in state[residual_id]
+    assert residual_tmp not in state[residual_id].values()
+    assert "reconcile_state" not in state[residual_id]
+    # The orphan's tombstone is indexed as deleting, so the deleting pass finds it.
+    assert queries == ["deleting", "pending", "tmp"]
     assert set(s3.objects) == {winner_key}
     assert decremented.count("drinklog-quota#global") == 2
 
@@ -1668,12 +2660,17 @@ def test_manual_brand_edit_clears_the_matched_whiskey_id():
     class UpdateTable:
         meta = SimpleNamespace(client=RecordingClient())
 
+        def get_item(self, **kwargs):
+            return {"Item": {"id": "log-1", "user_id": "user-1", "status": "complete"}}
+
         def update_item(self, **kwargs):
             calls.append(kwargs)
             return {"Attributes": {"id": "log-1", "status": "complete"}}
 
     drink_logs.update_drink_log(
-        UpdateTable(),
+        FakeDynamoDB({"DrinkLogs-test": UpdateTable()}),
+        "DrinkLogs-test",
+        "AppState-test",
         "user-1",
         "log-1",
         drink_logs.validate_update_input({"brand_text": "アラン 10年"}),
@@ -1693,12 +2690,17 @@ def test_non_brand_edit_leaves_the_whiskey_id_alone():
     class UpdateTable:
         meta = SimpleNamespace(client=RecordingClient())
 
+        def get_item(self, **kwargs):
+            return {"Item": {"id": "log-1", "user_id": "user-1", "status": "complete"}}
+
         def update_item(self, **kwargs):
             calls.append(kwargs)
             return {"Attributes": {"id": "log-1", "status": "complete"}}
 
     drink_logs.update_drink_log(
-        UpdateTable(),
+        FakeDynamoDB({"DrinkLogs-test": UpdateTable()}),
+        "DrinkLogs-test",
+        "AppState-test",
         "user-1",
         "log-1",
         drink_logs.validate_update_input({"notes": "うまい"}),
@@ -1757,3 +2759,76 @@ def test_selecting_a_matched_bottle_still_attaches_its_own_id():
 
     assert completion["whiskey_id"] == "caol-ila-12"
     assert completion["brand_source"] == "matched"
+
+
+def test_tmp_reconciler_keeps_the_analyzed_image_of_a_pending_record():
+    with mock_aws():
+        dynamodb, s3, drinklogs, _app_state, analysis, upload_uuid = _moto_create_dependencies()
+        analyzed_key, _body = _put_analyzed_image(
+            s3, analysis, upload_uuid, renditions=("display", "thumbnail")
+        )
+        orphan = uuid.uuid4()
+        for suffix in ("analyzed.jpg", "analyzed.thumbnail.jpg"):
+            s3.put_object(Bucket="images-test", Key=f"tmp/user-1/{orphan}.{suffix}", Body=b"orphan")
+        drinklogs.put_item(
+            Item={
+                "id": drink_logs.derive_drink_log_id("user-1", upload_uuid),
+                "user_id": "user-1",
+                "status": "pending",
+                "tmp_s3_key": analysis["s3_key"],
+                "tmp_normalized_key": analyzed_key,
+            }
+        )
+
+        deleted = reconciler.reconcile_tmp_objects(
+            dynamodb,
+            s3,
+            "DrinkLogs-test",
+            "images-test",
+            datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+
+        keys = {obj["Key"] for obj in s3.list_objects_v2(Bucket="images-test")["Contents"]}
+        assert deleted == 2
+        assert keys == {
+            analysis["s3_key"],
+            analyzed_key,
+            f"tmp/user-1/{upload_uuid}.analyzed.display.jpg",
+            f"tmp/user-1/{upload_uuid}.analyzed.thumbnail.jpg",
+        }
+
+
+def test_log_reconciler_keeps_current_renditions_and_deletes_superseded_ones():
+    with mock_aws():
+        dynamodb, s3, drinklogs, _app_state, _analysis, upload_uuid = _moto_create_dependencies()
+        current = f"logs/user-1/{upload_uuid}-aa"
+        stale = f"logs/user-1/{upload_uuid}-bb"
+        drinklogs.put_item(
+            Item={
+                "id": drink_logs.derive_drink_log_id("user-1", upload_uuid),
+                "user_id": "user-1",
+                "status": "complete",
+                "s3_image_key": f"{current}.jpg",
+                "s3_display_key": f"{current}.display.jpg",
+                "s3_thumbnail_key": f"{current}.thumbnail.jpg",
+            }
+        )
+        for base in (current, stale):
+            for suffix in (".jpg", ".display.jpg", ".thumbnail.jpg"):
+                s3.put_object(Bucket="images-test", Key=f"{base}{suffix}", Body=b"image")
+
+        deleted = reconciler.reconcile_log_objects(
+            dynamodb,
+            s3,
+            "DrinkLogs-test",
+            "images-test",
+            datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+
+        listed = s3.list_objects_v2(Bucket="images-test", Prefix="logs/")["Contents"]
+        assert deleted == 3
+        assert {obj["Key"] for obj in listed} == {
+            f"{current}.jpg",
+            f"{current}.display.jpg",
+            f"{current}.thumbnail.jpg",
+        }
@@ -80,3 +80,21 @@ def test_report_duplicates_checks_catalog_key_and_normalized_name():
     assert [[record["id"] for record in group] for group in report["normalized_name"]] == [
         ["b", "c"]
     ]
+
+
+def test_insert_bumps_the_catalog_version_after_writing(monkeypatch):
+    monkeypatch.delenv("WHISKEY_SEARCH_TABLE", raising=False)
+    monkeypatch.delenv("APP_STATE_TABLE", raising=False)
+    tables = {"WhiskeySearch-local": Mock(), "AppState-local": Mock()}
+    tables["WhiskeySearch-local"].name = "WhiskeySearch-local"
+    tables["AppState-local"].update_item.return_value = {"Attributes": {"version": 7}}
+    dynamodb = Mock()
+    dynamodb.Table.side_effect = tables.__getitem__
+    monkeypatch.setattr(script, "bulk_write_whiskeys", lambda table, items: len(items))
+    inserter = script.WhiskeyDatabaseInserter("local", dynamodb=dynamodb)
+
+    assert inserter.insert_to_dynamodb([{"name": "Yamazaki 12", "brand_key": "yamazaki"}])
+
+    update = tables["AppState-local"].update_item.call_args.kwargs
+    assert update["Key"] == {"pk": "catalog-version#WhiskeySearch-local"}
+    assert update["UpdateExpression"].startswith("ADD #version :one")
@@ -69,6 +69,31 @@ def test_clients_use_service_specific_endpoints_and_bounded_config(monkeypatch):
     assert s3_kwargs["config"].s3["addressing_style"] == "path"
 
 
+def test_bedrock_clients_are_reused_per_coarse_timeout_bucket(monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "ap-northeast-1")
+    monkeypatch.setattr(clients, "_BEDROCK_CLIENTS", {})
+    client = Mock(side_effect=lambda *args, **kwargs: object())
+    monkeypatch.setattr(clients.boto3, "client", client)
+
+    first = clients.get_bedrock_runtime_client(19.8)
+    assert clients.get_bedrock_runtime_client(15.0) is first
+    assert clients.get_bedrock_runtime_client(14.9) is not first
+    assert clients.get_bedrock_runtime_client(0.4) is clients.get_bedrock_runtime_client(1.5)
+    assert clients.get_bedrock_runtime_client(600) is clients.get_bedrock_runtime_client(60)
+
+    assert client.call_count == 4
+    assert [call.kwargs["config"].read_timeout for call in client.call_args_list] == [15, 10, 1, 60]
+    # A whole analyze request's worth of shrinking deadlines needs few clients.
+    for tenths in range(10, 300):
+        clients.get_bedrock_runtime_client(tenths / 10)
+    assert client.call_count == len(clients.BEDROCK_READ_TIMEOUT_BUCKETS) - 1
+    kwargs = client.call_args_list[0].kwargs
+    assert client.call_args_list[0].args == ("bedrock-runtime",)
+    assert kwargs["region_name"] == "ap-northeast-1"
+    assert kwargs["config"].connect_timeout == 2
+    assert kwargs["config"].retries == {"mode": "standard", "total_max_attempts": 1}
+
+
 def test_scan_all_pages_and_continuation_token():
     table = Mock()
     table.scan.side_effect = [
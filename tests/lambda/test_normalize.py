@@ -0,0 +1,34 @@
+from tests.lambda_module_loader import load_lambda_module
+
+
+benchmark = load_lambda_module(
+    "benchmark_normalize_script_tests",
+    "scripts/benchmark_normalize.py",
+)
+# The script puts whiskey_common on sys.path and re-exports the functions under test.
+normalize_text = benchmark.normalize_text
+cached_normalize_text = benchmark.cached_normalize_text
+
+
+def test_fast_paths_match_the_original_on_catalog_and_seed_data():
+    samples = benchmark.collect_samples()
+
+    assert len(samples) > len(benchmark.EXTRA_SAMPLES)
+    assert benchmark.find_mismatches(samples) == []
+
+
+def test_normalization_examples():
+    assert normalize_text("ＹＡＭＡＺＡＫＩ　１２") == "yamazaki12"
+    assert normalize_text("ｻﾝﾄﾘｰ ｳｲｽｷｰ") == "さんとりーういすきー"
+    assert normalize_text("Glen\tMoray") == "glenmoray"
+    assert normalize_text("") == ""
+
+
+def test_cached_variant_memoizes_repeated_inputs():
+    cached_normalize_text.cache_clear()
+
+    assert cached_normalize_text("タリスカー 10") == "たりすかー10"
+    assert cached_normalize_text("タリスカー 10") == "たりすかー10"
+
+    info = cached_normalize_text.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
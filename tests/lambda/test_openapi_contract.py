@@ -23,6 +23,8 @@ def test_openapi_keeps_search_and_drink_log_routes():
         "/api/drink-logs/analyze",
         "/api/drink-logs/places",
         "/api/drink-logs/places/resolve",
+        "/api/drink-logs/stats",
+        "/api/drink-logs/export",
         "/api/drink-logs/{id}",
     }
     assert expected <= set(document["paths"])
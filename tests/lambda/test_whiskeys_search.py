@@ -1,4 +1,6 @@
 import json
+import sys
+import time
 from types import SimpleNamespace
 from unittest.mock import Mock
 
@@ -14,9 +16,22 @@ service_module = load_lambda_module(
     "whiskey_search_service_tests",
     "lambda/whiskeys-search/python/whiskey_search_service.py",
 )
+# The handler imports the service by its plain module name; reset both copies.
+handler_service_module = sys.modules[search.WhiskeySearchService.__module__]
 from whiskey_common import scan_utils
+from whiskey_common.search_index import (
+    ARTIFACT_FORMAT_VERSION,
+    SearchIndex,
+    dump_artifact,
+    load_artifact,
+)
+
+
 @pytest.fixture(autouse=True)
 def environment(monkeypatch):
+    for module in (service_module, handler_service_module):
+        module._reset_search_index()
+        monkeypatch.setattr(module, "_SEARCH_INDEX_ARTIFACT", None)
     monkeypatch.setenv("ALLOWED_ORIGINS", "https://app.example")
     monkeypatch.setenv("WHISKEY_SEARCH_TABLE", "WhiskeySearch-test")
     monkeypatch.setenv("WHISKEYS_TABLE", "WhiskeySearch-test")
@@ -24,6 +39,8 @@ def environment(monkeypatch):
     monkeypatch.setenv("ENVIRONMENT", "test")
     monkeypatch.setenv("PUBLIC_SCAN_MAX_PAGES", "1")
     monkeypatch.setenv("PUBLIC_SCAN_PAGE_SIZE", "250")
+    # Scan-path tests opt out; index tests enable it explicitly.
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "0")
 
 
 def event(path="/api/whiskeys/search", query=None):
@@ -81,10 +98,18 @@ def test_search_uses_bounded_scan_and_returns_next_token(monkeypatch):
     assert attribute_names == {"name", "normalized_name"}
 
 
-def search_service(table):
+def catalog_dynamodb(table, version=None):
+    """DynamoDB double whose AppState table holds the catalog version marker."""
+    app_state = Mock()
+    app_state.get_item.return_value = {"Item": {"version": version}} if version is not None else {}
     dynamodb = Mock()
-    dynamodb.Table.return_value = table
-    return service_module.WhiskeySearchService(dynamodb)
+    dynamodb.Table.side_effect = lambda name: app_state if name == "AppState-test" else table
+    dynamodb.app_state = app_state
+    return dynamodb
+
+
+def search_service(table, version=None):
+    return service_module.WhiskeySearchService(catalog_dynamodb(table, version))
 
 
 def test_search_fills_result_from_a_later_scan_page():
@@ -240,4 +265,431 @@ def test_list_500_does_not_expose_exception(monkeypatch):
 
 
 def test_service_uses_shared_japanese_normalization():
-    assert service_module.normalize_text(" ボウモア ") == "ぼうもあ"
+    assert service_module.cached_normalize_text(" ボウモア ") == "ぼうもあ"
+
+
+INDEX_ITEMS = [
+    {"id": "w3", "name": "響 17年", "name_en": "Hibiki 17", "normalized_name": "響17年|hibiki17"},
+    {"id": "w1", "name": "山崎 12年", "name_en": "Yamazaki 12", "normalized_name": "山崎12年|yamazaki12"},
+    {"id": "w2", "name": "山崎 18年", "name_en": "Yamazaki 18", "normalized_name": "山崎18年|yamazaki18"},
+    {"id": "w4", "name": "ボウモア 12年", "name_en": "Bowmore 12", "normalized_name": "ぼうもあ12年|bowmore12"},
+]
+
+
+def test_index_matches_bigram_trigram_and_short_queries():
+    index = SearchIndex.build(INDEX_ITEMS)
+
+    def ids(query):
+        return [index.documents[position]["id"] for position in index.matches(query)]
+
+    assert ids("山崎") == ["w1", "w2"]
+    assert ids("YAMAZAKI 18") == ["w2"]
+    assert ids("ボウモア") == ["w4"]
+    assert ids("ぼうもあ") == ["w4"]
+    assert ids("響") == ["w3"]
+    assert ids("12") == ["w4", "w1"]
+    assert ids("missing") == []
+    assert len(ids("")) == 4
+
+
+def test_index_search_pages_are_complete_and_stable():
+    index = SearchIndex.build(INDEX_ITEMS)
+
+    first, after = index.search("12", limit=1)
+    second, final = index.search("12", limit=1, after=after)
+
+    # Ordered by display name, then id: ボウモア sorts before 山崎.
+    assert [item["id"] for item in first + second] == ["w4", "w1"]
+    assert final is None
+
+
+def index_table(items, pages=None):
+    table = Mock()
+    if pages is not None:
+        table.scan.side_effect = pages
+    else:
+        table.scan.return_value = {"Items": items}
+    return table
+
+
+def test_search_index_is_built_once_per_container_and_answers_in_memory(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    table = index_table(
+        None,
+        pages=[
+            {"Items": INDEX_ITEMS[:2], "LastEvaluatedKey": {"id": "w1"}},
+            {"Items": INDEX_ITEMS[2:]},
+        ],
+    )
+    before_page = Mock()
+    service = search_service(table)
+
+    first, token = service.search_whiskeys("山崎", limit=1, before_page=before_page)
+    second, final_token = search_service(table).search_whiskeys(
+        "山崎", limit=1, next_token=token, before_page=before_page
+    )
+
+    assert [item["id"] for item in first + second] == ["w1", "w2"]
+    assert final_token is None
+    assert table.scan.call_count == 2
+    assert before_page.call_count == 2
+    assert "FilterExpression" not in table.scan.call_args_list[0].kwargs
+    assert table.scan.call_args_list[1].kwargs["ExclusiveStartKey"] == {"id": "w1"}
+
+
+def test_search_index_is_rebuilt_after_ttl(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    monkeypatch.setenv("SEARCH_INDEX_TTL_SECONDS", "0")
+    table = index_table(INDEX_ITEMS)
+    service = search_service(table)
+
+    service.search_whiskeys("山崎")
+    service.search_whiskeys("山崎")
+
+    assert table.scan.call_count == 2
+
+
+def test_oversized_catalog_falls_back_to_bounded_scan(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    monkeypatch.setattr(service_module, "SEARCH_INDEX_MAX_ITEMS", 2)
+    table = index_table(INDEX_ITEMS)
+    service = search_service(table)
+
+    items, token = service.search_whiskeys("山崎", limit=20)
+    service.search_whiskeys("山崎", limit=20)
+
+    assert token is None
+    assert len(items) == 4
+    # One index build attempt, then only filtered scans while the skip is cached.
+    assert "FilterExpression" not in table.scan.call_args_list[0].kwargs
+    assert [
+        "FilterExpression" in call.kwargs for call in table.scan.call_args_list[1:]
+    ] == [True, True]
+
+
+def test_handler_serves_index_results_without_consuming_budget_when_warm(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    table = index_table(INDEX_ITEMS)
+    dynamodb = catalog_dynamodb(table)
+    consume_scan_budget = Mock()
+    monkeypatch.setattr(search, "get_dynamodb_resource", lambda: dynamodb)
+    monkeypatch.setattr(search, "consume_scan_budget", consume_scan_budget)
+
+    for _ in range(3):
+        response = search.lambda_handler(
+            event(query={"q": "yamazaki"}),
+            SimpleNamespace(aws_request_id="aws-index"),
+        )
+        assert response["statusCode"] == 200
+        body = json.loads(response["body"])
+        assert [item["id"] for item in body["whiskeys"]] == ["w1", "w2"]
+        assert body["next_token"] is None
+
+    assert table.scan.call_count == 1
+    assert consume_scan_budget.call_count == 1
+
+
+def test_malformed_index_cursor_is_rejected(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    service = search_service(index_table(INDEX_ITEMS))
+    token = scan_utils.encode_next_token({"after": ["山崎 12年", "w1"]})
+
+    with pytest.raises(ValueError, match="next_token"):
+        service.search_whiskeys("山崎", next_token=token)
+
+
+def write_artifact(tmp_path, items=INDEX_ITEMS, **metadata):
+    header = {"table_name": "WhiskeySearch-test", "built_at": "2026-01-01T00:00:00Z"}
+    header.update(metadata)
+    path = tmp_path / "search-index.idx"
+    path.write_bytes(dump_artifact(SearchIndex.build(items), **header))
+    return path
+
+
+def test_artifact_round_trips_and_rejects_tampering_or_unknown_versions():
+    data = dump_artifact(SearchIndex.build(INDEX_ITEMS), table_name="WhiskeySearch-test")
+    index, header = load_artifact(data)
+
+    assert header["item_count"] == 4
+    assert header["table_name"] == "WhiskeySearch-test"
+    assert index.matches("yamazaki") == SearchIndex.build(INDEX_ITEMS).matches("yamazaki")
+    with pytest.raises(ValueError, match="content_hash"):
+        load_artifact(data.replace("山崎".encode(), "白州".encode()))
+    with pytest.raises(ValueError, match="format_version"):
+        load_artifact(
+            data.replace(
+                f'"format_version": {ARTIFACT_FORMAT_VERSION}'.encode(),
+                b'"format_version": 99',
+            )
+        )
+
+
+def test_bundled_artifact_answers_cold_start_without_scanning(monkeypatch, tmp_path):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    artifact = service_module._load_search_index_artifact(write_artifact(tmp_path))
+    monkeypatch.setattr(service_module, "_SEARCH_INDEX_ARTIFACT", artifact)
+    table = index_table([])
+    before_page = Mock()
+
+    items, token = search_service(table).search_whiskeys("山崎", before_page=before_page)
+
+    assert [item["id"] for item in items] == ["w1", "w2"]
+    assert token is None
+    table.scan.assert_not_called()
+    before_page.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "metadata, env, version",
+    [
+        ({"table_name": "WhiskeySearch-other"}, {}, None),
+        ({}, {"SEARCH_INDEX_ARTIFACT_MAX_AGE_SECONDS": "60"}, None),
+        ({"catalog_version": 3}, {}, 4),
+        ({}, {}, 1),
+    ],
+    ids=["table_name", "max_age", "catalog_bumped", "artifact_without_version"],
+)
+def test_stale_artifact_falls_back_to_scan_build(monkeypatch, tmp_path, metadata, env, version):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    artifact = service_module._load_search_index_artifact(
+        write_artifact(tmp_path, INDEX_ITEMS[:1], **metadata)
+    )
+    monkeypatch.setattr(service_module, "_SEARCH_INDEX_ARTIFACT", artifact)
+    table = index_table(INDEX_ITEMS)
+
+    items, _ = search_service(table, version).search_whiskeys("山崎")
+
+    assert [item["id"] for item in items] == ["w1", "w2"]
+    assert table.scan.call_count == 1
+
+
+def test_artifact_at_the_current_catalog_version_is_used(monkeypatch, tmp_path):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    artifact = service_module._load_search_index_artifact(
+        write_artifact(tmp_path, catalog_version=7)
+    )
+    monkeypatch.setattr(service_module, "_SEARCH_INDEX_ARTIFACT", artifact)
+    table = index_table([])
+
+    items, _ = search_service(table, 7).search_whiskeys("山崎")
+
+    assert [item["id"] for item in items] == ["w1", "w2"]
+    table.scan.assert_not_called()
+
+
+def test_expired_index_is_kept_until_the_catalog_version_moves(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    monkeypatch.setenv("SEARCH_INDEX_TTL_SECONDS", "0")
+    table = index_table(INDEX_ITEMS)
+    dynamodb = catalog_dynamodb(table, 5)
+    service = service_module.WhiskeySearchService(dynamodb)
+
+    service.search_whiskeys("山崎")
+    service.search_whiskeys("山崎")
+    assert table.scan.call_count == 1
+    assert dynamodb.app_state.get_item.call_count == 2
+
+    dynamodb.app_state.get_item.return_value = {"Item": {"version": 6}}
+    service.search_whiskeys("山崎")
+    assert table.scan.call_count == 2
+
+
+def test_missing_or_corrupt_artifact_is_ignored(tmp_path):
+    assert service_module._load_search_index_artifact(tmp_path / "missing.idx") is None
+    corrupt = tmp_path / "corrupt.idx"
+    corrupt.write_bytes(b"not an artifact")
+    assert service_module._load_search_index_artifact(corrupt) is None
+
+
+RANKED_ITEMS = [
+    {"id": "r1", "name": "Aardvark Talisker Finish", "brand_aliases": ["Aardvark"]},
+    {"id": "r2", "name": "Talisker 10", "brand_aliases": ["Talisker", "タリスカー"]},
+    {"id": "r3", "name": "Talisker", "brand_aliases": ["Talisker", "タリスカー"]},
+    {"id": "r4", "name": "Blend of Taliskers"},
+    {"id": "r5", "name": "Port Askaig", "brand_aliases": ["Talisker Neighbour"]},
+    {"id": "r6", "name": "Mytalisker"},
+    {"id": "r7", "name": "Talisker Storm"},
+]
+
+
+def test_ranking_orders_exact_prefix_alias_token_then_substring():
+    index = SearchIndex.build(RANKED_ITEMS)
+
+    items, after = index.search("talisker", limit=10)
+
+    # exact name, exact alias, name prefix, alias prefix, word prefix, substring
+    assert [item["id"] for item in items] == ["r3", "r2", "r7", "r5", "r1", "r4", "r6"]
+    assert after is None
+    # An alias match surfaces a record whose names never mention the query.
+    assert [item["id"] for item in index.search("タリスカー", limit=10)[0]] == ["r3", "r2"]
+
+
+def test_ranked_pages_resume_after_score_name_and_id():
+    index = SearchIndex.build(RANKED_ITEMS)
+
+    pages, after = [], None
+    while True:
+        page, after = index.search("talisker", limit=4 if not pages else 1, after=after)
+        pages.append([item["id"] for item in page])
+        if after is None:
+            break
+
+    assert pages == [["r3", "r2", "r7", "r5"], ["r1"], ["r4"], ["r6"]]
+
+
+def test_handler_returns_index_results_in_relevance_order(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    table = index_table(RANKED_ITEMS)
+    dynamodb = catalog_dynamodb(table)
+    monkeypatch.setattr(search, "get_dynamodb_resource", lambda: dynamodb)
+    monkeypatch.setattr(search, "consume_scan_budget", lambda *args, **kwargs: None)
+
+    response = search.lambda_handler(
+        event(query={"q": "Talisker", "limit": "2"}),
+        SimpleNamespace(aws_request_id="aws-rank"),
+    )
+    body = json.loads(response["body"])
+
+    assert [item["id"] for item in body["whiskeys"]] == ["r3", "r2"]
+    assert scan_utils.decode_next_token(body["next_token"]) == {
+        "after": [5, "Talisker 10", "r2"]
+    }
+
+
+def test_scan_fallback_ranks_the_returned_page():
+    table = index_table(RANKED_ITEMS)
+
+    items, _ = search_service(table).search_whiskeys("talisker", limit=10)
+
+    assert [item["id"] for item in items][:2] == ["r3", "r2"]
+
+
+def test_suggest_answers_prefixes_by_rank_then_fills_with_substrings():
+    index = SearchIndex.build(RANKED_ITEMS + INDEX_ITEMS)
+
+    def ids(query, limit=10):
+        return [item["id"] for item in index.suggest(query, limit=limit)]
+
+    assert ids("talis", limit=4) == ["r3", "r2", "r7", "r5"]
+    assert ids("talis", limit=2) == ["r3", "r2"]
+    # Substring hits follow the prefix tiers, in the same order search uses.
+    assert ids("talis") == ["r3", "r2", "r7", "r5", "r1", "r4", "r6"]
+    assert ids("talis") == [item["id"] for item in index.search("talis", limit=10)[0]]
+    assert ids("タリス") == ["r3", "r2"]
+    assert ids("YAMA") == ["w1", "w2"]
+    assert ids("askaig") == ["r5"]
+    assert ids("") == []
+
+
+def test_suggest_is_fast_on_a_warm_catalog_sized_index():
+    items = [
+        {
+            "id": f"s{number:05d}",
+            "name": f"Distillery {number % 500} {number} Year",
+            "brand_aliases": [f"brand{number % 500}"],
+        }
+        for number in range(20_000)
+    ]
+    index = SearchIndex.build(items)
+    index.suggest("distillery 1", limit=10)
+
+    started = time.perf_counter()
+    for _ in range(20):
+        index.suggest("distillery 1", limit=10)
+        index.suggest("brand4", limit=10)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / 40
+
+    assert elapsed_ms < 10
+
+
+def test_suggest_route_uses_warm_index_without_dynamodb_or_budget(monkeypatch, tmp_path):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    artifact = handler_service_module._load_search_index_artifact(
+        write_artifact(tmp_path, RANKED_ITEMS)
+    )
+    monkeypatch.setattr(handler_service_module, "_SEARCH_INDEX_ARTIFACT", artifact)
+    table = index_table([])
+    dynamodb = catalog_dynamodb(table)
+    consume_scan_budget = Mock()
+    monkeypatch.setattr(search, "get_dynamodb_resource", lambda: dynamodb)
+    monkeypatch.setattr(search, "consume_scan_budget", consume_scan_budget)
+
+    for path in ("/api/whiskeys/suggest", "/api/whiskeys/search/suggest/"):
+        response = search.lambda_handler(
+            event(path=path, query={"q": "talis", "limit": "2"}),
+            SimpleNamespace(aws_request_id="aws-suggest"),
+        )
+        body = json.loads(response["body"])
+        assert response["statusCode"] == 200
+        assert [item["id"] for item in body["whiskeys"]] == ["r3", "r2"]
+        assert body["count"] == 2
+
+    table.scan.assert_not_called()
+    table.get_item.assert_not_called()
+    consume_scan_budget.assert_not_called()
+
+
+def test_cold_suggest_without_artifact_builds_the_index_under_the_scan_budget(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    table = index_table(RANKED_ITEMS)
+    consume_scan_budget = Mock()
+    monkeypatch.setattr(search, "get_dynamodb_resource", lambda: catalog_dynamodb(table))
+    monkeypatch.setattr(search, "consume_scan_budget", consume_scan_budget)
+
+    for _ in range(2):
+        response = search.lambda_handler(
+            event(path="/api/whiskeys/suggest", query={"q": "askaig"}),
+            SimpleNamespace(aws_request_id="aws-cold-suggest"),
+        )
+        assert response["statusCode"] == 200
+        assert [item["id"] for item in json.loads(response["body"])["whiskeys"]] == ["r5"]
+
+    assert table.scan.call_count == 1
+    assert "FilterExpression" not in table.scan.call_args.kwargs
+    assert consume_scan_budget.call_count == 1
+
+
+def test_cold_suggest_returns_429_when_the_scan_budget_is_spent(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    table = index_table(RANKED_ITEMS)
+    monkeypatch.setattr(search, "get_dynamodb_resource", lambda: catalog_dynamodb(table))
+
+    def exhausted(*args, **kwargs):
+        raise search.ScanBudgetExceeded("spent")
+
+    monkeypatch.setattr(search, "consume_scan_budget", exhausted)
+
+    response = search.lambda_handler(
+        event(path="/api/whiskeys/suggest", query={"q": "talis"}),
+        SimpleNamespace(aws_request_id="aws-suggest-budget"),
+    )
+
+    assert response["statusCode"] == 429
+    table.scan.assert_not_called()
+
+
+def test_suggest_on_an_oversized_catalog_uses_the_substring_scan(monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_ENABLED", "1")
+    monkeypatch.setattr(service_module, "SEARCH_INDEX_MAX_ITEMS", 2)
+    table = index_table(RANKED_ITEMS)
+    before_page = Mock()
+
+    items = search_service(table).suggest_whiskeys("talis", limit=3, before_page=before_page)
+
+    # The mock table ignores the filter; the point is which scan answered.
+    assert len(items) == 3
+    assert "FilterExpression" in table.scan.call_args.kwargs
+    assert before_page.call_count == 2
+
+
+def test_suggest_rejects_out_of_range_limit(monkeypatch):
+    monkeypatch.setattr(search, "get_dynamodb_resource", Mock())
+
+    response = search.lambda_handler(
+        event(path="/api/whiskeys/suggest", query={"q": "talis", "limit": "50"}),
+        SimpleNamespace(aws_request_id="aws-suggest-limit"),
+    )
+
+    assert response["statusCode"] == 400
@@ -2,6 +2,7 @@
 
 import asyncio
 import io
+import json
 import os
 import sys
 from contextlib import contextmanager
@@ -60,23 +61,55 @@ def _create_tables(dynamodb):
             {"AttributeName": "id", "AttributeType": "S"},
             {"AttributeName": "user_id", "AttributeType": "S"},
             {"AttributeName": "datetime", "AttributeType": "S"},
+            {"AttributeName": "user_place_key", "AttributeType": "S"},
+            {"AttributeName": "user_brand_key", "AttributeType": "S"},
+            {"AttributeName": "reconcile_state", "AttributeType": "S"},
+            {"AttributeName": "updated_at", "AttributeType": "S"},
         ],
         GlobalSecondaryIndexes=[
             {
-                "IndexName": "UserDatetimeIndex",
+                "IndexName": index_name,
                 "KeySchema": [
-                    {"AttributeName": "user_id", "KeyType": "HASH"},
+                    {"AttributeName": partition_key, "KeyType": "HASH"},
                     {"AttributeName": "datetime", "KeyType": "RANGE"},
                 ],
                 "Projection": {"ProjectionType": "ALL"},
             }
+            for index_name, partition_key in (
+                ("UserDatetimeIndex", "user_id"),
+                ("UserPlaceDatetimeIndex", "user_place_key"),
+                ("UserBrandDatetimeIndex", "user_brand_key"),
+            )
+        ]
+        + [
+            {
+                "IndexName": "ReconcileStateIndex",
+                "KeySchema": [
+                    {"AttributeName": "reconcile_state", "KeyType": "HASH"},
+                    {"AttributeName": "updated_at", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "KEYS_ONLY"},
+            }
         ],
         BillingMode="PAY_PER_REQUEST",
     )
     dynamodb.create_table(
         TableName=APP_STATE_TABLE,
         KeySchema=[{"AttributeName": "pk", "KeyType": "HASH"}],
-        AttributeDefinitions=[{"AttributeName": "pk", "AttributeType": "S"}],
+        AttributeDefinitions=[
+            {"AttributeName": "pk", "AttributeType": "S"},
+            {"AttributeName": "stats_owner", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "StatsOwnerIndex",
+                "KeySchema": [
+                    {"AttributeName": "stats_owner", "KeyType": "HASH"},
+                    {"AttributeName": "pk", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["count"]},
+            }
+        ],
         BillingMode="PAY_PER_REQUEST",
     )
     dynamodb.create_table(
@@ -176,6 +209,12 @@ def test_drink_log_full_http_flow(monkeypatch):
         )["Item"]
         assert analysis_item["ETag"] == etag
         assert analysis_item["s3_key"] == upload["s3_key"]
+        # The mock model names no catalog brand; stand in for analyze matching one.
+        dynamodb.Table(APP_STATE_TABLE).update_item(
+            Key={"pk": analysis["analysis_id"]},
+            UpdateExpression="SET candidates[0].brand_key = :brand_key",
+            ExpressionAttributeValues={":brand_key": "talisker"},
+        )
 
         create_response = client.post(
             "/api/drink-logs",
@@ -203,8 +242,31 @@ def test_drink_log_full_http_flow(monkeypatch):
         item = timeline["results"][0]
         assert item["id"] == created["id"]
         assert item["image_url"]
-        for internal_field in ("s3_image_key", "tmp_s3_key", "quota_allocated"):
+        for internal_field in (
+            "s3_image_key",
+            "tmp_s3_key",
+            "quota_allocated",
+            "user_brand_key",
+            "user_place_key",
+            "reconcile_state",
+        ):
             assert internal_field not in item
+        # A cleanly finished create leaves nothing for the reconciler's sparse index.
+        backlog = dynamodb.Table(DRINKLOGS_TABLE).scan(IndexName="ReconcileStateIndex")
+        assert backlog["Items"] == []
+
+        assert item["brand_key"] == "talisker"
+        by_brand = client.get("/api/drink-logs", params={"brand_key": "talisker"})
+        assert [log["id"] for log in by_brand.json()["results"]] == [created["id"]]
+        by_place = client.get("/api/drink-logs", params={"place_id": "mock-place-1"})
+        assert by_place.json()["results"] == []
+        in_range = client.get(
+            "/api/drink-logs",
+            params={"from": created["datetime"], "to": "2100-01-01T00:00:00Z", "order": "asc"},
+        )
+        assert [log["id"] for log in in_range.json()["results"]] == [created["id"]]
+        before = client.get("/api/drink-logs", params={"to": created["datetime"]})
+        assert before.json()["results"] == []
 
         places_response = client.post(
             "/api/drink-logs/places",
@@ -220,8 +282,47 @@ def test_drink_log_full_http_flow(monkeypatch):
             }
         ]
 
+        export_response = client.post("/api/drink-logs/export")
+        assert export_response.status_code == 200
+        export = export_response.json()
+        assert export["count"] == 1
+        assert "drink-logs-" in export["download_url"]
+        export_key = export["download_url"].split(f"/{IMAGES_BUCKET}/", 1)[1].split("?", 1)[0]
+        assert export_key.startswith(f"exports/{LOCAL_USER_ID}/")
+        exported = s3.get_object(Bucket=IMAGES_BUCKET, Key=export_key)
+        assert exported["ContentType"] == "application/x-ndjson"
+        lines = exported["Body"].read().decode("utf-8").splitlines()
+        assert len(lines) == export["count"]
+        exported_log = json.loads(lines[0])
+        assert exported_log["id"] == created["id"]
+        assert exported_log["brand_text"] == created["brand_text"]
+        assert not {"user_id", "s3_image_key", "stats_keys", "image_url"} & set(exported_log)
+
+        stats = client.get("/api/drink-logs/stats").json()
+        assert stats["total"] == 1
+        assert stats["brand_keys"] == {"talisker": 1}
+        assert stats["brand_text_keys"] == {}
+        assert stats["months"] == {created["datetime"][:7]: 1}
+        assert stats["place_ids"] == {}
+
+        edit_response = client.put(
+            f"/api/drink-logs/{created['id']}",
+            json={"brand_text": "Talisker 10", "store": {"name": "モックバー", "place_id": "mock-place-1"}},
+        )
+        assert edit_response.status_code == 200
+        assert edit_response.json()["brand_text"] == "Talisker 10"
+        stats = client.get("/api/drink-logs/stats").json()
+        assert stats["total"] == 1
+        assert stats["brand_keys"] == {}
+        assert stats["brand_text_keys"] == {"talisker10": 1}
+        assert stats["place_ids"] == {"mock-place-1": 1}
+
         delete_response = client.delete(f"/api/drink-logs/{created['id']}")
         assert delete_response.status_code == 204
+        stats = client.get("/api/drink-logs/stats").json()
+        assert stats["total"] == 0
+        assert stats["brand_keys"] == stats["brand_text_keys"] == {}
+        assert stats["place_ids"] == stats["months"] == {}
 
         empty_timeline = client.get("/api/drink-logs")
         assert empty_timeline.status_code == 200